@@ -0,0 +1,256 @@
+"""
+Load generator for SynthCore: N simulated users, each looping think time ->
+turn, against a fake async LLM (benchmarks.fake_models) and temp-dir SQLite
+stores. Concurrency ramps through --users levels on one long-lived SynthCore,
+so state that grows with traffic carries over between levels.
+
+Per level: throughput, turn latency percentiles, event-loop lag (overshoot of
+a periodic timer), error rate, degraded turns (skipped post-checks or a
+non-success status), warnings logged, post-turn backlog, coherence
+snapshots held (all users) and RSS, plus TurnScheduler counters in the JSON. The first level whose p95 breaks --slo-ms, or
+whose throughput gains less than 10% over the previous level, is reported
+as the saturation point.
+
+    python -m benchmarks.bench_concurrent_users --users 1 8 32 128 --seconds 20
+    python -m benchmarks.bench_concurrent_users --target synthcore-request --sharded --think exp --think-ms 500 --json load.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from benchmarks.bench_turn_latency import build_synth_memory, percentile, profiles, user_texts
+from benchmarks.fake_models import make_fake_provider
+
+THINK_DISTRIBUTIONS = ("exp", "lognormal", "fixed", "none")
+
+class WarningCounter(logging.Handler):
+    """Counts WARNING+ records per logger while a level runs."""
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.counts: Counter = Counter()
+
+    def emit(self, record: logging.LogRecord):
+        self.counts[record.name] += 1
+
+@dataclass
+class LevelStats:
+    users: int
+    seconds: float
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    degraded: int = 0
+    timeouts: int = 0
+    loop_lag_ms: List[float] = field(default_factory=list)
+    max_backlog: int = 0
+
+    def report(self, warnings: Counter, state_history: int, llm_calls: int) -> Dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+        lag = sorted(self.loop_lag_ms)
+        completed = len(ordered)
+        attempted = completed + sum(self.errors.values())
+        return {
+            "users": self.users,
+            "turns": completed,
+            "throughput_tps": round(completed / self.seconds, 2),
+            "p50_ms": round(percentile(ordered, 50), 1),
+            "p95_ms": round(percentile(ordered, 95), 1),
+            "p99_ms": round(percentile(ordered, 99), 1),
+            "max_ms": round(ordered[-1], 1) if ordered else 0.0,
+            "error_rate": round(sum(self.errors.values()) / attempted, 4) if attempted else 0.0,
+            "errors": dict(self.errors),
+            "timeouts": self.timeouts,
+            "degraded_rate": round(self.degraded / completed, 4) if completed else 0.0,
+            "warnings": dict(warnings),
+            "loop_lag_p50_ms": round(percentile(lag, 50), 2),
+            "loop_lag_p99_ms": round(percentile(lag, 99), 2),
+            "loop_lag_max_ms": round(lag[-1], 2) if lag else 0.0,
+            "max_post_turn_backlog": self.max_backlog,
+            "state_history": state_history,
+            "llm_calls_per_turn": round(llm_calls / completed, 2) if completed else 0.0,
+            "rss_mb": current_rss_mb(),
+        }
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError):
+        return 0.0
+
+def think_time(rng: random.Random, kind: str, mean_ms: float) -> float:
+    """Seconds a user waits before the next turn."""
+    if kind == "none" or mean_ms <= 0:
+        return 0.0
+    if kind == "fixed":
+        return mean_ms / 1000
+    if kind == "exp":
+        return rng.expovariate(1000 / mean_ms)
+    # lognormal with sigma 1: mostly quick replies, a long tail of pauses
+    sigma = 1.0
+    return rng.lognormvariate(math.log(mean_ms / 1000) - sigma ** 2 / 2, sigma)
+
+async def monitor_loop_lag(stats: LevelStats, stop: float, interval: float = 0.01):
+    """A timer that should fire every `interval`; anything later is time the loop was blocked."""
+    loop = asyncio.get_running_loop()
+    while loop.time() < stop:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        stats.loop_lag_ms.append(max(0.0, (loop.time() - expected) * 1000))
+
+async def monitor_backlog(core, stats: LevelStats, stop: float):
+    loop = asyncio.get_running_loop()
+    while loop.time() < stop:
+        stats.max_backlog = max(stats.max_backlog, core.post_turn.pending())
+        await asyncio.sleep(0.05)
+
+async def simulated_user(core, target: str, index: int, stats: LevelStats, stop: float, args):
+    from nexus.synthcore.types import TurnRequest
+
+    rng = random.Random(args.seed * 1000 + index)
+    texts = user_texts(64, args.seed + index)
+    user_id, session_id = f"user-{index}", f"session-{index}"
+    loop = asyncio.get_running_loop()
+    # Stagger the first turns so a level does not start with every user in lockstep
+    await asyncio.sleep(rng.uniform(0, max(think_time(rng, args.think, args.think_ms), 0.01)))
+    turn = 0
+    while loop.time() < stop:
+        text = texts[turn % len(texts)]
+        turn += 1
+        start = time.perf_counter()
+        try:
+            if target == "synthcore":
+                result = await asyncio.wait_for(core.orchestrate_turn(user_id, session_id, text), args.turn_timeout)
+                degraded = bool(result.get("skipped_checks"))
+            else:
+                response = await asyncio.wait_for(
+                    core.orchestrate_turn(TurnRequest(user_input=text, user_id=user_id, session_id=session_id)),
+                    args.turn_timeout
+                )
+                degraded = response.status != "success" or bool(response.metadata.get("skipped_checks"))
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            stats.errors["TimeoutError"] += 1
+        except Exception as e:
+            stats.errors[type(e).__name__] += 1
+        else:
+            stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+            stats.degraded += degraded
+        await asyncio.sleep(think_time(rng, args.think, args.think_ms))
+
+def build_core(target: str, provider, memory, shards, args):
+    from nexus.synthcore.prompt_assembler import PromptAssembler
+    from nexus.synthcore.turn_scheduler import TurnScheduler
+
+    if target == "synthcore":
+        from nexus.synthcore.orchestrator import SynthCore
+    else:
+        from nexus.synthcore.synthcore import SynthCore
+    scheduler = TurnScheduler(max_concurrent=args.max_concurrent, idle_timeout_s=args.idle_timeout)
+    return SynthCore(provider, memory, PromptAssembler(), shards=shards, scheduler=scheduler)
+
+def saturation_point(levels: List[Dict[str, Any]], slo_ms: float) -> Optional[Dict[str, Any]]:
+    for previous, level in zip([None] + levels, levels):
+        if level["p95_ms"] > slo_ms or level["error_rate"] > 0:
+            return {"users": level["users"], "reason": f"p95 {level['p95_ms']:.0f}ms > SLO {slo_ms:.0f}ms" if level["p95_ms"] > slo_ms else f"error rate {level['error_rate']:.1%}"}
+        if previous and level["throughput_tps"] < previous["throughput_tps"] * 1.1:
+            return {"users": level["users"], "reason": f"throughput {level['throughput_tps']:.1f}/s vs {previous['throughput_tps']:.1f}/s at {previous['users']} users"}
+    return None
+
+async def run(args) -> Dict[str, Any]:
+    p = profiles(args)
+    provider = make_fake_provider(p["primary"], p["auxiliary"], seed=args.seed)
+    primary = provider.model_registry.get_client("fake-primary")
+    levels = []
+    with tempfile.TemporaryDirectory() as tmp:
+        memory, shards = None, None
+        if args.sharded:
+            from nexus.synthcore.synthmemory import SynthMemory
+            shards = SynthMemory.sharded(provider, os.path.join(tmp, "shards"), max_open=args.max_open)
+        else:
+            memory, seed = build_synth_memory(provider, tmp, args.seed_turns, args.seed_facts)
+            await seed()
+        core = build_core(args.target, provider, memory, shards, args)
+
+        counter = WarningCounter()
+        logging.getLogger().addHandler(counter)
+        try:
+            for users in args.users:
+                stats = LevelStats(users, args.seconds)
+                counter.counts.clear()
+                calls_before = primary.calls
+                stop = asyncio.get_running_loop().time() + args.seconds
+                await asyncio.gather(
+                    monitor_loop_lag(stats, stop),
+                    monitor_backlog(core, stats, stop),
+                    *(simulated_user(core, args.target, i, stats, stop, args) for i in range(users))
+                )
+                level = stats.report(counter.counts, core.state_tracker.snapshot_count(), primary.calls - calls_before)
+                level["scheduler"] = core.scheduler.report()
+                levels.append(level)
+                print(
+                    f"{users:>5} | {level['throughput_tps']:>7.1f} | {level['p50_ms']:>8.1f} | {level['p95_ms']:>8.1f} | "
+                    f"{level['p99_ms']:>8.1f} | {level['loop_lag_p99_ms']:>9.1f} | {level['error_rate']:>6.1%} | "
+                    f"{level['degraded_rate']:>8.1%} | {sum(level['warnings'].values()):>5} | {level['max_post_turn_backlog']:>7} | "
+                    f"{level['state_history']:>7} | {level['rss_mb']:>7.0f}",
+                    flush=True
+                )
+        finally:
+            logging.getLogger().removeHandler(counter)
+            await core.shutdown()
+            if memory is not None:
+                await memory.close()
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k != "json"},
+        "levels": levels,
+        "saturation": saturation_point(levels, args.slo_ms),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("synthcore", "synthcore-request"), default="synthcore")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 4, 16, 64], help="Concurrency levels, run in order")
+    parser.add_argument("--seconds", type=float, default=15.0, help="Duration of each level")
+    parser.add_argument("--think", choices=THINK_DISTRIBUTIONS, default="exp")
+    parser.add_argument("--think-ms", type=float, default=1000.0, help="Mean think time between a user's turns")
+    parser.add_argument("--turn-timeout", type=float, default=30.0)
+    parser.add_argument("--slo-ms", type=float, default=2000.0, help="p95 turn latency considered saturated")
+    parser.add_argument("--max-concurrent", type=int, default=16, help="Turns in flight across all users (TurnScheduler cap)")
+    parser.add_argument("--idle-timeout", type=float, default=60.0, help="Seconds before an idle user's actor is evicted")
+    parser.add_argument("--sharded", action="store_true", help="Per-user memory shards instead of one shared store")
+    parser.add_argument("--max-open", type=int, default=64, help="Open shards (--sharded)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--seed-turns", type=int, default=200, help="Prior episodes in the shared store")
+    parser.add_argument("--seed-facts", type=int, default=2000, help="Prior facts in the shared store")
+    parser.add_argument("--ttft-ms", type=float, default=300.0)
+    parser.add_argument("--tokens-per-s", type=float, default=80.0)
+    parser.add_argument("--output-tokens", type=int, default=60)
+    parser.add_argument("--aux-ttft-ms", type=float, default=150.0)
+    parser.add_argument("--aux-output-tokens", type=int, default=20)
+    parser.add_argument("--jitter", type=float, default=0.3)
+    parser.add_argument("--json", help="Write machine-readable results here")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    print(f"{args.target}, {'sharded' if args.sharded else 'shared'} memory, think {args.think} {args.think_ms:.0f}ms, {args.seconds:.0f}s per level")
+    print(f"{'users':>5} | {'turns/s':>7} | {'p50 (ms)':>8} | {'p95 (ms)':>8} | {'p99 (ms)':>8} | {'lag p99 ms':>9} | {'errors':>6} | {'degraded':>8} | {'warns':>5} | {'backlog':>7} | {'history':>7} | {'RSS MB':>7}")
+    print("-" * 122)
+    result = asyncio.run(run(args))
+    saturation = result["saturation"]
+    print(f"\nSaturation: {saturation['users']} users ({saturation['reason']})" if saturation else "\nNo saturation within the tested levels")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Import-time budget for Nexus startup. Each target is imported in a fresh
+interpreter under `python -X importtime`; the cumulative time of the target
+module (median of --runs) is compared with its budget, and heavy third-party
+packages the target must not pull in eagerly are checked. Exits non-zero on
+any regression, so it can gate CI.
+
+    python -m benchmarks.bench_import_time --runs 5 --top 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# module -> (budget in ms, packages that must not be imported as a side effect)
+TARGETS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "nexus.tokenizers": (30.0, ("tiktoken", "numpy")),
+    "nexus.synthmemory": (15.0, ("numpy",)),
+    "nexus.synthmemory.sharding": (80.0, ("numpy",)),
+    "nexus.synthcore.observability.prometheus_exporter": (20.0, ("prometheus_client",)),
+    "nexus.core.orchestrator": (250.0, ("sqlalchemy", "tiktoken", "prometheus_client")),
+    "nexus.synthcore.synthcore": (300.0, ("sqlalchemy", "tiktoken", "prometheus_client")),
+}
+HEAVY = ("numpy", "sqlalchemy", "tiktoken", "prometheus_client")
+
+def import_profile(module: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every import made by `import module` in a clean interpreter."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+def measure(module: str, runs: int) -> Tuple[float, List[Tuple[str, int, int]]]:
+    samples, rows = [], []
+    for _ in range(runs):
+        rows = import_profile(module)
+        samples.append(next(c for name, _, c in reversed(rows) if name == module) / 1000)
+    return statistics.median(samples), rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest imports (self time) per target")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, e.g. for slow CI hosts")
+    parser.add_argument("targets", nargs="*", default=list(TARGETS))
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<52} | {'median (ms)':>11} | {'budget (ms)':>11} | heavy deps loaded")
+    print("-" * 100)
+    for module in args.targets:
+        budget, forbidden = TARGETS.get(module, (float("inf"), ()))
+        budget *= args.scale
+        elapsed, rows = measure(module, args.runs)
+        loaded = {name for name, _, _ in rows}
+        heavy = [pkg for pkg in HEAVY if pkg in loaded]
+        leaked = [pkg for pkg in forbidden if pkg in loaded]
+        status = ""
+        if elapsed > budget:
+            failures.append(f"{module}: {elapsed:.1f}ms over its {budget:.0f}ms budget")
+            status = "  << over budget"
+        if leaked:
+            failures.append(f"{module}: eagerly imports {', '.join(leaked)}")
+            status += f"  << eager {', '.join(leaked)}"
+        print(f"{module:<52} | {elapsed:>11.1f} | {budget:>11.0f} | {', '.join(heavy) or '-'}{status}")
+        if args.top:
+            for name, self_us, _ in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+                print(f"    {self_us / 1000:>8.1f}ms  {name}")
+
+    if failures:
+        print("\nImport-time regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nAll import-time budgets met.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Stress test for the memory stores under concurrent turns: many async readers
+(semantic retrieval + recent history) racing writers (fact upserts + episodic
+turns) for a fixed duration. Compares a single reader connection, which is
+how every retrieval used to be serialised, with the reader pool.
+
+    python -m benchmarks.bench_memory_concurrency --readers 32 --writers 4 --pool 1 4 8
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from nexus.synthcore.types import TokenUsage
+from nexus.synthmemory.episodic_store import EpisodicStore, EpisodicMemory
+from nexus.synthmemory.semantic_store import SemanticStore
+from benchmarks.bench_semantic_upsert import make_facts
+
+WORDS = ["topic", "user", "likes", "owns", "works", "prefers", "mentioned", "project", "coffee", "music"]
+
+async def reader(semantic: SemanticStore, episodic: EpisodicStore, stop: float, latencies: list, seed: int):
+    rng = random.Random(seed)
+    while time.perf_counter() < stop:
+        # A couple of selective terms, like a real turn; a term matching every fact measures FTS, not concurrency
+        query = f"what about {rng.choice(WORDS[6:])} {rng.randrange(1000)} {rng.randrange(5000)}"
+        start = time.perf_counter()
+        await asyncio.gather(
+            semantic.retrieve_relevant_facts(query, limit=10),
+            episodic.retrieve_range(hours=24, limit=5)
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+
+async def writer(semantic: SemanticStore, episodic: EpisodicStore, stop: float, counter: list, seed: int):
+    rng = random.Random(seed)
+    i = 0
+    while time.perf_counter() < stop:
+        facts = make_facts(50, seed=rng.randrange(1 << 30))
+        await semantic.store_facts(facts)
+        await episodic.store(EpisodicMemory(
+            turn_id=f"w{seed}-{i}",
+            timestamp=datetime.now(timezone.utc),
+            user_input="tell me about " + " ".join(rng.sample(WORDS, 4)),
+            assistant_response="Here is what I remember. " * 20,
+            identity_state={},
+            mood_state={},
+            token_usage=TokenUsage()
+        ))
+        counter[0] += len(facts) + 1
+        i += 1
+
+async def run_once(tmp: str, pool: int, readers: int, writers: int, seconds: float, seed_facts: int):
+    semantic = SemanticStore(os.path.join(tmp, f"semantic_{pool}.db"), readers=pool)
+    episodic = EpisodicStore(os.path.join(tmp, f"episodic_{pool}.db"), readers=pool)
+    await semantic.store_facts(make_facts(seed_facts))
+
+    latencies, written = [], [0]
+    stop = time.perf_counter() + seconds
+    await asyncio.gather(
+        *(reader(semantic, episodic, stop, latencies, seed) for seed in range(readers)),
+        *(writer(semantic, episodic, stop, written, 1000 + seed) for seed in range(writers))
+    )
+    semantic.close()
+    episodic.close()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    return len(latencies) / seconds, statistics.median(latencies) if latencies else 0.0, p95, written[0] / seconds
+
+async def run(pools, readers: int, writers: int, seconds: float, seed_facts: int):
+    print(f"{readers} readers, {writers} writers, {seconds:.0f}s each, {seed_facts} seeded facts")
+    print(f"{'pool':>4} | {'reads/s':>8} | {'p50 (ms)':>8} | {'p95 (ms)':>8} | {'rows written/s':>14}")
+    print("-" * 56)
+    with tempfile.TemporaryDirectory() as tmp:
+        for pool in pools:
+            reads, p50, p95, writes = await run_once(tmp, pool, readers, writers, seconds, seed_facts)
+            print(f"{pool:>4} | {reads:>8.0f} | {p50:>8.1f} | {p95:>8.1f} | {writes:>14.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool", type=int, nargs="+", default=[1, 4, 8], help="Reader connections per store")
+    parser.add_argument("--readers", type=int, default=32, help="Concurrent async readers")
+    parser.add_argument("--writers", type=int, default=4, help="Concurrent async writers")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--seed-facts", type=int, default=50_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.pool, args.readers, args.writers, args.seconds, args.seed_facts))
+
+if __name__ == "__main__":
+    main()
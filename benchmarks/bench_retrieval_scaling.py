@@ -0,0 +1,405 @@
+"""
+Retrieval scaling across corpus sizes: MemoryService.retrieve_relevant
+(Phase 1, SQLAlchemy), SemanticStore.retrieve_relevant_facts and
+SynthMemory.retrieve_memory_for_turn (Stage 2, SQLite) over synthetic users
+with topic-clustered embeddings and session-shaped timestamps.
+
+Every corpus is built, and every case is queried, in a fresh subprocess, so
+peak RSS is per case. Reports query latency (p50/p95/p99), time to open the
+stores, peak and post-open RSS and on-disk size (database files plus the
+persisted vector index) as case x size tables. Corpora are cached in
+--data-dir between runs; --json writes the results and --against compares
+with an earlier --json file.
+
+    python -m benchmarks.bench_retrieval_scaling --sizes 1000 10000 100000
+    python -m benchmarks.bench_retrieval_scaling --sizes 1000000 --cases semantic/fts5 semantic/hybrid --data-dir /var/tmp/nexus-bench
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# case -> (corpus, backend call, index/query mode)
+CASES = {
+    "phase1/user": ("phase1-user", "phase1", "user_id index"),
+    "phase1/user_ts": ("phase1-user_ts", "phase1", "(user_id, timestamp) index"),
+    "semantic/like": ("stage2", "semantic", "LIKE scan"),
+    "semantic/fts5": ("stage2", "semantic", "FTS5 BM25"),
+    "semantic/hybrid": ("stage2", "semantic", "FTS5 + vector index"),
+    "synthmemory/lexical": ("stage2", "synthmemory", "recent + FTS5"),
+    "synthmemory/hybrid": ("stage2", "synthmemory", "recent + FTS5 + vector index"),
+}
+# Files each backend reads, for the on-disk size column
+STORAGE = {
+    "phase1": ("phase1.db*",),
+    "semantic": ("semantic.db*", "semantic.vector*"),
+    "synthmemory": ("episodic.db*", "semantic.db*", "semantic.vector*"),
+}
+
+WORDS = (
+    "coffee music garden python travel budget running piano novel recipe weather sister project "
+    "deadline camera bicycle mountain ocean chess painting guitar kitchen library movie podcast "
+    "doctor vacation holiday laptop server database puzzle poetry history physics dinner breakfast "
+    "meeting interview apartment neighbor concert festival museum airport train weekend birthday "
+    "garden soccer tennis yoga climbing sketch journal language spanish japanese startup invoice"
+).split()
+PREDICATES = ("likes", "owns", "works_on", "prefers", "mentioned", "plans", "dislikes", "visited")
+USER = "bench-user"
+CHUNK = 20_000
+
+class Corpus:
+    """Deterministic synthetic data: topics with word sets and embedding centroids."""
+    def __init__(self, dim: int, topics: int, seed: int):
+        self.dim = dim
+        self.rng = np.random.default_rng(seed)
+        self.prng = random.Random(seed)
+        self.centroids = self.rng.standard_normal((topics, dim)).astype(np.float32)
+        self.centroids /= np.linalg.norm(self.centroids, axis=1, keepdims=True)
+        self.topic_words = [self.prng.sample(WORDS, 4) for _ in range(topics)]
+        # Zipf-like topic popularity: a few topics dominate, as in real histories
+        weights = 1.0 / np.arange(1, topics + 1)
+        self.topic_p = weights / weights.sum()
+
+    def topics(self, n: int) -> np.ndarray:
+        return self.rng.choice(len(self.centroids), size=n, p=self.topic_p)
+
+    def embeddings(self, topics: np.ndarray, noise: float = 0.35) -> np.ndarray:
+        vectors = self.centroids[topics] + noise * self.rng.standard_normal((len(topics), self.dim)).astype(np.float32) / np.sqrt(self.dim) * 4
+        return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+    def timestamps(self, n: int, days: float) -> List[datetime]:
+        """Sessions of a few turns minutes apart, spread over `days`, newest ending now."""
+        now = datetime.now(timezone.utc)
+        out, remaining = [], n
+        while remaining > 0:
+            start = now - timedelta(days=self.prng.uniform(0, days))
+            turns = min(remaining, self.prng.randint(2, 12))
+            out.extend(start + timedelta(minutes=2 * i) for i in range(turns))
+            remaining -= turns
+        out.sort()
+        # The last session is recent so "last 24h" retrieval has something to return
+        shift = now - out[-1] - timedelta(minutes=1)
+        return [min(ts + shift, now) if i >= n - 6 else ts for i, ts in enumerate(out)]
+
+    def utterance(self, topic: int, i: int) -> str:
+        a, b, c, d = self.topic_words[topic]
+        return self.prng.choice((
+            f"I was thinking about {a} and {b} again, especially the {c} part ({i}).",
+            f"Can you help me plan the {a} thing? It is related to {d} ({i}).",
+            f"Yesterday the {b} went badly, maybe because of {c} ({i}).",
+        ))
+
+    def query(self) -> Tuple[str, np.ndarray]:
+        topic = int(self.topics(1)[0])
+        a, b, c, _ = self.topic_words[topic]
+        return f"What did I say about {a} and {c}?", self.embeddings(np.array([topic]), noise=0.5)[0]
+
+# --- corpus builders (run in a worker subprocess) ---
+
+def build_phase1(path: str, corpus: Corpus, n: int, other_users: int, index: str):
+    from sqlalchemy import Index
+    from nexus.memory.persistence import Base, DatabaseManager, EpisodicModel
+
+    db = DatabaseManager(f"sqlite:///{os.path.join(path, 'phase1.db')}")
+    # initialize_db also creates the pgvector extension, which SQLite does not have
+    Base.metadata.create_all(bind=db.engine)
+    table = EpisodicModel.__table__
+    owners = [(USER, n)] + [(f"other-{u}", max(1, n // 10)) for u in range(other_users)]
+    for user_id, count in owners:
+        stamps = corpus.timestamps(count, days=365)
+        for start in range(0, count, CHUNK):
+            stop = min(count, start + CHUNK)
+            topics = corpus.topics(stop - start)
+            vectors = np.round(corpus.embeddings(topics), 4)
+            rows = [{
+                "user_id": user_id,
+                "session_id": f"s{(start + j) // 8}",
+                "role": "user" if (start + j) % 2 == 0 else "assistant",
+                "text": corpus.utterance(int(t), start + j),
+                "embedding_json": vectors[j].tolist(),
+                "timestamp": stamps[start + j].replace(tzinfo=None),
+            } for j, t in enumerate(topics)]
+            with db.engine.begin() as conn:
+                conn.execute(table.insert(), rows)
+    if index == "user_ts":
+        Index("ix_episodic_memory_user_ts", table.c.user_id, table.c.timestamp.desc()).create(db.engine)
+    db.engine.dispose()
+
+def build_stage2(path: str, corpus: Corpus, n: int):
+    import sqlite3
+    from nexus.synthmemory.episodic_store import EpisodicStore, to_epoch_us
+    from nexus.synthmemory.semantic_store import SemanticFact, SemanticStore
+
+    semantic = SemanticStore(os.path.join(path, "semantic.db"))
+    stamps = corpus.timestamps(n, days=365)
+    for start in range(0, n, CHUNK):
+        stop = min(n, start + CHUNK)
+        topics = corpus.topics(stop - start)
+        vectors = corpus.embeddings(topics)
+        facts = []
+        for j, t in enumerate(topics):
+            a, b, c, d = corpus.topic_words[t]
+            facts.append(SemanticFact(
+                subject=corpus.prng.choice(("user", "user's " + a, "user's " + d)),
+                predicate=corpus.prng.choice(PREDICATES),
+                object=f"{b} {c} {start + j}",
+                confidence=round(corpus.prng.uniform(0.4, 1.0), 3),
+                timestamp=stamps[start + j],
+                embedding=vectors[j]
+            ))
+        semantic._store_facts_sync(facts, SemanticStore.UPSERT_BATCH_SIZE)
+    semantic.close()
+
+    # Episodes are bulk-inserted with the store's own row encoding; store() would
+    # push a million rows through the write-behind queue one at a time
+    episodic_path = os.path.join(path, "episodic.db")
+    episodic = EpisodicStore(episodic_path)
+    episodic.close()
+    identity_key, version, payload = episodic._identity_row({"version": 1, "name": "Nexus"})
+    conn = sqlite3.connect(episodic_path)
+    try:
+        conn.execute(EpisodicStore.IDENTITY_SQL, (identity_key, version, payload))
+        for start in range(0, n, CHUNK):
+            stop = min(n, start + CHUNK)
+            topics = corpus.topics(stop - start)
+            conn.executemany(EpisodicStore.INSERT_SQL, [
+                episodic._episode_row(
+                    f"turn-{start + j}", to_epoch_us(stamps[start + j]),
+                    corpus.utterance(int(t), start + j), "Noted. " + corpus.utterance(int(t), start + j) * 3,
+                    identity_key, {"valence": 0.1, "arousal": 0.4, "dominance": 0.5},
+                    {"prompt": 900, "completion": 150, "total": 1050},
+                    0.5, 0.0, ",".join(corpus.topic_words[t][:2]), ""
+                )
+                for j, t in enumerate(topics)
+            ])
+            conn.commit()
+    finally:
+        conn.close()
+
+# --- query runners (run in a worker subprocess) ---
+
+async def query_case(case: str, path: str, corpus: Corpus, queries: int, warmup: int) -> Dict[str, Any]:
+    _, backend, _ = CASES[case]
+    mode = case.split("/", 1)[1]
+    start = time.perf_counter()
+    if backend == "phase1":
+        from nexus.core.prompt_assembler import PromptAssembler
+        from nexus.core.token_budget import TokenBudget
+        from nexus.memory.manager import MemoryService
+        from nexus.memory.persistence import DatabaseManager
+
+        db = DatabaseManager(f"sqlite:///{os.path.join(path, 'phase1.db')}")
+        service = MemoryService(PromptAssembler(), db)
+
+        async def run_one(text, vector):
+            await service.retrieve_relevant(USER, "s0", text, vector.tolist(), TokenBudget(), [])
+        close = db.engine.dispose
+    elif backend == "semantic":
+        from nexus.synthmemory.semantic_store import SemanticStore
+
+        store = SemanticStore(os.path.join(path, "semantic.db"))
+        if mode == "like":
+            store.fts_enabled = False
+
+        async def run_one(text, vector):
+            await store.retrieve_relevant_facts(text, limit=10, query_embedding=vector if mode == "hybrid" else None)
+        close = store.readers.close
+    else:
+        from benchmarks.fake_models import make_fake_provider
+        from nexus.synthcore.synthmemory import SynthMemory
+        from nexus.synthmemory.episodic_store import EpisodicStore
+        from nexus.synthmemory.semantic_store import SemanticStore
+
+        memory = SynthMemory(
+            make_fake_provider(),
+            EpisodicStore(os.path.join(path, "episodic.db")),
+            SemanticStore(os.path.join(path, "semantic.db"))
+        )
+
+        async def run_one(text, vector):
+            await memory.retrieve_memory_for_turn(text, 2000, query_embedding=vector if mode == "hybrid" else None)
+
+        def close():
+            memory.episodic.close()
+            memory.semantic.readers.close()
+    open_ms = (time.perf_counter() - start) * 1000
+    rss_open = current_rss_mb()
+
+    latencies = []
+    for i in range(warmup + queries):
+        text, vector = corpus.query()
+        start = time.perf_counter()
+        await run_one(text, vector)
+        if i >= warmup:
+            latencies.append((time.perf_counter() - start) * 1000)
+    close()
+
+    from benchmarks.bench_turn_latency import percentile
+    latencies.sort()
+    return {
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "open_ms": round(open_ms, 1),
+        "rss_open_mb": rss_open,
+        "peak_rss_mb": peak_rss_mb(),
+        "storage_mb": storage_mb(path, backend),
+    }
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError):
+        return 0.0
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / 2**20 if sys.platform == "darwin" else peak / 2**10, 1)
+
+def storage_mb(path: str, backend: str) -> float:
+    files = [f for pattern in STORAGE[backend] for f in glob.glob(os.path.join(path, pattern))]
+    return round(sum(os.path.getsize(f) for f in files) / 2**20, 2)
+
+def worker(args):
+    corpus = Corpus(args.dim, args.topics, args.seed)
+    if args.worker == "build":
+        start = time.perf_counter()
+        if args.corpus == "stage2":
+            build_stage2(args.path, corpus, args.size)
+        else:
+            build_phase1(args.path, corpus, args.size, args.other_users, args.corpus.split("-", 1)[1])
+        result = {"build_s": round(time.perf_counter() - start, 2)}
+    else:
+        # Queries draw from a different stream than the corpus
+        corpus.rng = np.random.default_rng(args.seed + 1)
+        corpus.prng = random.Random(args.seed + 1)
+        result = asyncio.run(query_case(args.case, args.path, corpus, args.queries, args.warmup))
+    print(json.dumps(result))
+
+# --- driver ---
+
+def spawn(args, role: str, extra: List[str]) -> Dict[str, Any]:
+    command = [
+        sys.executable, "-m", "benchmarks.bench_retrieval_scaling", "--worker", role,
+        "--dim", str(args.dim), "--topics", str(args.topics), "--seed", str(args.seed),
+        "--other-users", str(args.other_users), "--queries", str(args.queries), "--warmup", str(args.warmup),
+    ] + extra
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{role} worker failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def ensure_corpus(args, data_dir: str, corpus: str, size: int) -> Tuple[str, float]:
+    """Builds the corpus unless a matching one is cached. Returns its path and build time (0 if cached)."""
+    path = os.path.join(data_dir, f"{corpus}-{size}")
+    spec = {"corpus": corpus, "size": size, "dim": args.dim, "topics": args.topics, "seed": args.seed, "other_users": args.other_users}
+    marker = os.path.join(path, "corpus.json")
+    if os.path.exists(marker):
+        with open(marker) as f:
+            if json.load(f) == spec:
+                return path, 0.0
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    print(f"  building {corpus} x {size} ...", flush=True)
+    built = spawn(args, "build", ["--corpus", corpus, "--size", str(size), "--path", path])
+    with open(marker, "w") as f:
+        json.dump(spec, f)
+    return path, built["build_s"]
+
+def size_label(n: int) -> str:
+    return f"{n // 1_000_000}M" if n >= 1_000_000 and n % 1_000_000 == 0 else f"{n // 1000}k" if n >= 1000 and n % 1000 == 0 else str(n)
+
+def print_tables(results: Dict[str, Dict[str, Dict[str, float]]], sizes: List[int], against: Dict[str, Any]):
+    metrics = (
+        ("p50_ms", "p50 latency (ms)"), ("p95_ms", "p95 latency (ms)"), ("p99_ms", "p99 latency (ms)"),
+        ("open_ms", "open (ms)"), ("peak_rss_mb", "peak RSS (MB)"), ("storage_mb", "on disk (MB)"),
+    )
+    width = max(len(c) for c in results) + 2
+    for key, title in metrics:
+        print(f"\n{title}" + (" -- ratio vs --against in brackets" if against else ""))
+        print(f"  {'case':<{width}}" + "".join(f" | {size_label(n):>16}" for n in sizes))
+        print("  " + "-" * (width + 19 * len(sizes)))
+        for case, by_size in results.items():
+            cells = []
+            for n in sizes:
+                row = by_size.get(str(n))
+                if row is None:
+                    cells.append(f"{'-':>16}")
+                    continue
+                old = against.get("results", {}).get(case, {}).get(str(n), {}).get(key)
+                ratio = f" (x{row[key] / old:.2f})" if old else ""
+                cells.append(f"{row[key]:>{16 - len(ratio)}.2f}{ratio}")
+            print(f"  {case:<{width}}" + "".join(f" | {c}" for c in cells))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000], help="Episodes and facts for the queried user")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--topics", type=int, default=64)
+    parser.add_argument("--other-users", type=int, default=4, help="Phase 1 users sharing the table, each with size/10 episodes")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--data-dir", help="Keep corpora here and reuse them across runs (default: temporary)")
+    parser.add_argument("--json", help="Write machine-readable results here")
+    parser.add_argument("--against", help="Earlier --json output to compare with")
+    # internal: one build or query in a fresh process
+    parser.add_argument("--worker", choices=("build", "query"), help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", help=argparse.SUPPRESS)
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    against = {}
+    if args.against:
+        with open(args.against) as f:
+            against = json.load(f)
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="nexus-retrieval-")
+    results: Dict[str, Dict[str, Dict[str, float]]] = {case: {} for case in args.cases}
+    builds: Dict[str, float] = {}
+    try:
+        for size in args.sizes:
+            for case in args.cases:
+                corpus = CASES[case][0]
+                path, build_s = ensure_corpus(args, data_dir, corpus, size)
+                if build_s:
+                    builds[f"{corpus}-{size}"] = build_s
+                results[case][str(size)] = spawn(args, "query", ["--case", case, "--path", path])
+                print(f"  {case} x {size_label(size)}: p95 {results[case][str(size)]['p95_ms']:.2f}ms", flush=True)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    print_tables(results, args.sizes, against)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "created": datetime.now(timezone.utc).isoformat(),
+                "config": {k: getattr(args, k) for k in ("sizes", "queries", "warmup", "dim", "topics", "other_users", "seed")},
+                "cases": {case: {"backend": CASES[case][1], "index": CASES[case][2]} for case in args.cases},
+                "build_s": builds,
+                "results": results,
+            }, f, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    main()
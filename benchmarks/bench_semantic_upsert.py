@@ -0,0 +1,68 @@
+"""
+Compares the per-fact execute() loop SemanticStore.store_facts used to run
+with the chunked executemany bulk path.
+
+    python -m benchmarks.bench_semantic_upsert --sizes 10000 100000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from nexus.synthmemory.semantic_store import SemanticStore, SemanticFact
+
+def make_facts(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        SemanticFact(
+            subject=f"user_{rng.randrange(n // 10 + 1)}",
+            predicate=rng.choice(["likes", "owns", "works_on", "prefers", "mentioned"]),
+            object=f"topic {i} {rng.randrange(1000)}",
+            confidence=round(rng.uniform(0.4, 1.0), 3),
+            timestamp=now
+        )
+        for i in range(n)
+    ]
+
+def legacy_loop(store: SemanticStore, facts: list):
+    """The pre-bulk implementation: one execute per fact, then commit."""
+    for fact in facts:
+        store.db.execute(store.UPSERT_SQL, (
+            fact.subject, fact.predicate, fact.object, fact.confidence,
+            fact.timestamp.isoformat(), fact.decay_age, None
+        ))
+    store.db.commit()
+
+async def run(sizes, batch_size: int):
+    print(f"{'facts':>8} | {'loop (s)':>9} | {'bulk (s)':>9} | {'speedup':>7} | {'batches':>7} | {'max batch (ms)':>14}")
+    print("-" * 70)
+    for n in sizes:
+        facts = make_facts(n)
+        with tempfile.TemporaryDirectory() as tmp:
+            loop_store = SemanticStore(os.path.join(tmp, "loop.db"))
+            start = time.perf_counter()
+            legacy_loop(loop_store, facts)
+            loop_s = time.perf_counter() - start
+            loop_store.close()
+
+            bulk_store = SemanticStore(os.path.join(tmp, "bulk.db"))
+            start = time.perf_counter()
+            report = await bulk_store.store_facts(facts, batch_size=batch_size)
+            bulk_s = time.perf_counter() - start
+            bulk_store.close()
+
+        print(f"{n:>8} | {loop_s:>9.3f} | {bulk_s:>9.3f} | {loop_s / bulk_s:>6.1f}x | {len(report.batch_ms):>7} | {max(report.batch_ms):>14.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--batch-size", type=int, default=SemanticStore.UPSERT_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.batch_size))
+
+if __name__ == "__main__":
+    main()
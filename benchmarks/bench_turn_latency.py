@@ -0,0 +1,296 @@
+"""
+End-to-end turn latency for SynthCore.orchestrate_turn (both Stage 2 entry
+points) and the Phase 1 SynthCoreOrchestrator.process_turn, against a fake
+NexusModelProvider with synthetic latency and streaming and temp-dir SQLite
+stores. Reports p50/p95/p99 per stage, writes JSON with --json, and
+compares against the committed baseline (benchmarks/baselines/turn_latency.json),
+exiting non-zero on regression.
+
+    python -m benchmarks.bench_turn_latency --turns 50 --json out.json
+    python -m benchmarks.bench_turn_latency --update-baseline
+"""
+import argparse
+import asyncio
+import functools
+import inspect
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from benchmarks.fake_models import LatencyProfile, make_fake_provider
+from benchmarks.bench_semantic_upsert import make_facts
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "turn_latency.json")
+TARGETS = ("synthcore", "synthcore-request", "core")
+
+class StageRecorder:
+    """Times calls to selected methods of live objects by wrapping them on the instance."""
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def record(self, stage: str, ms: float):
+        self.samples[stage].append(ms)
+
+    def wrap(self, obj: Any, attr: str, stage: str):
+        original = getattr(obj, attr)
+        if inspect.iscoroutinefunction(original):
+            @functools.wraps(original)
+            async def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    self.record(stage, (time.perf_counter() - start) * 1000)
+        else:
+            @functools.wraps(original)
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.record(stage, (time.perf_counter() - start) * 1000)
+        setattr(obj, attr, timed)
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def summarize(samples: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    summary = {}
+    for stage, values in sorted(samples.items()):
+        ordered = sorted(values)
+        summary[stage] = {
+            "n": len(ordered),
+            "mean": round(sum(ordered) / len(ordered), 3),
+            "p50": round(percentile(ordered, 50), 3),
+            "p95": round(percentile(ordered, 95), 3),
+            "p99": round(percentile(ordered, 99), 3),
+        }
+    return summary
+
+def user_texts(n: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    topics = ["coffee", "music", "the project", "my schedule", "python", "travel plans", "the garden", "work"]
+    return [f"Can you remind me what I said about {rng.choice(topics)} and {rng.choice(topics)} ({i})?" for i in range(n)]
+
+def profiles(args) -> Dict[str, LatencyProfile]:
+    return {
+        "primary": LatencyProfile(args.ttft_ms, args.tokens_per_s, args.output_tokens, args.jitter),
+        "auxiliary": LatencyProfile(args.aux_ttft_ms, args.tokens_per_s, args.aux_output_tokens, args.jitter),
+    }
+
+def build_synth_memory(provider, tmp: str, seed_turns: int, seed_facts: int):
+    from nexus.synthcore.synthmemory import SynthMemory
+    from nexus.synthcore.types import TokenUsage
+    from nexus.synthmemory.episodic_store import EpisodicStore, EpisodicMemory
+    from nexus.synthmemory.semantic_store import SemanticStore
+
+    episodic = EpisodicStore(os.path.join(tmp, "episodic.db"))
+    semantic = SemanticStore(os.path.join(tmp, "semantic.db"))
+    memory = SynthMemory(provider, episodic, semantic)
+    now = datetime.now(timezone.utc)
+
+    async def seed():
+        await semantic.store_facts(make_facts(seed_facts))
+        for i in range(seed_turns):
+            await episodic.store(EpisodicMemory(
+                turn_id=f"seed-{i}",
+                timestamp=now - timedelta(minutes=seed_turns - i),
+                user_input=f"Earlier question {i} about coffee and music",
+                assistant_response="An earlier answer. " * 10,
+                identity_state={},
+                mood_state={},
+                token_usage=TokenUsage()
+            ))
+        await memory.flush()
+    return memory, seed
+
+async def run_synthcore(target: str, args, tmp: str, recorder: StageRecorder, provider) -> None:
+    from nexus.synthcore.prompt_assembler import PromptAssembler
+    from nexus.synthcore.types import TurnRequest
+
+    memory, seed = build_synth_memory(provider, tmp, args.seed_turns, args.seed_facts)
+    await seed()
+    if target == "synthcore":
+        from nexus.synthcore.orchestrator import SynthCore
+        core = SynthCore(provider, memory, PromptAssembler())
+        recorder.wrap(core.post_checks, "run", "post_checks")
+        recorder.wrap(core, "_persist_turn", "post_turn_persist")
+    else:
+        from nexus.synthcore.synthcore import SynthCore
+        core = SynthCore(provider, memory, PromptAssembler())
+        recorder.wrap(core.post_checks, "run", "post_checks")
+        recorder.wrap(core, "_finalize_turn", "post_turn_persist")
+    recorder.wrap(core.post_turn, "wait_for_user", "wait_previous_turn")
+    recorder.wrap(core.budget_adjuster, "allocate_tokens", "budgeting")
+    recorder.wrap(memory, "retrieve_memory_for_turn", "memory_retrieval")
+    recorder.wrap(core.synth_mood, "modulate_response_prompt", "mood_modulation")
+    recorder.wrap(core.assembler, "assemble", "prompt_assembly")
+
+    texts = user_texts(args.warmup + args.turns, args.seed)
+    for i, text in enumerate(texts):
+        if i == args.warmup:
+            recorder.samples.clear()
+        start = time.perf_counter()
+        if target == "synthcore":
+            await core.orchestrate_turn("bench-user", "bench-session", text)
+        else:
+            await core.orchestrate_turn(TurnRequest(user_input=text, user_id="bench-user", session_id="bench-session"))
+        recorder.record("turn_total", (time.perf_counter() - start) * 1000)
+    await core.shutdown()
+    await memory.close()
+
+async def run_core(args, tmp: str, recorder: StageRecorder, provider) -> None:
+    from nexus.core.orchestrator import SynthCoreOrchestrator
+    from nexus.core.prompt_assembler import PromptAssembler
+    from nexus.memory.manager import MemoryService
+    from nexus.memory.persistence import Base, DatabaseManager, EpisodicModel
+
+    db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'phase1.db')}")
+    # initialize_db also creates the pgvector extension, which SQLite does not have
+    Base.metadata.create_all(bind=db.engine)
+    assembler = PromptAssembler()
+    memory = MemoryService(assembler, db)
+    orchestrator = SynthCoreOrchestrator(memory, assembler, provider)
+
+    session = db.get_session()
+    try:
+        now = datetime.now(timezone.utc)
+        vectors = await orchestrator.embeddings.embed_many([f"Earlier question {i} about coffee" for i in range(args.seed_turns)])
+        for i in range(args.seed_turns):
+            session.add(EpisodicModel(
+                user_id="bench-user", session_id="bench-session", role="user",
+                text=f"Earlier question {i} about coffee", embedding_json=vectors[i].tolist(),
+                timestamp=now - timedelta(minutes=args.seed_turns - i)
+            ))
+        session.commit()
+    finally:
+        session.close()
+
+    recorder.wrap(orchestrator.prefetcher, "take", "prefetch_lookup")
+    recorder.wrap(orchestrator.embeddings, "embed", "embedding")
+    recorder.wrap(memory, "retrieve_relevant", "memory_retrieval")
+    recorder.wrap(orchestrator.prefix_cache, "prefix_for", "prefix_cache")
+    recorder.wrap(assembler, "assemble", "prompt_assembly")
+
+    texts = user_texts(args.warmup + args.turns, args.seed)
+    for i, text in enumerate(texts):
+        if i == args.warmup:
+            recorder.samples.clear()
+        start = time.perf_counter()
+        result = await orchestrator.process_turn("bench-user", "bench-session", text)
+        recorder.record("turn_total", (time.perf_counter() - start) * 1000)
+        for event in result.get("metrics", {}).get("degradation_events", []):
+            recorder.record(f"degraded:{event}", 0.0)
+    db.engine.dispose()
+
+async def run_target(target: str, args) -> Dict[str, Any]:
+    recorder = StageRecorder()
+    p = profiles(args)
+    provider = make_fake_provider(p["primary"], p["auxiliary"], seed=args.seed)
+    primary = provider.model_registry.get_client("fake-primary")
+    with tempfile.TemporaryDirectory() as tmp:
+        if target == "core":
+            await run_core(args, tmp, recorder, provider)
+        else:
+            await run_synthcore(target, args, tmp, recorder, provider)
+    # Model time from the fake client itself: the last `turns` primary calls are the measured ones
+    recorder.samples["llm_ttft"] = primary.ttft_ms[-args.turns:]
+    recorder.samples["llm_total"] = primary.total_ms[-args.turns:]
+    return {"stages": summarize(recorder.samples)}
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, slack_ms: float) -> List[str]:
+    """A stage regresses when its p50 or p95 exceeds baseline * (1 + tolerance) + slack_ms."""
+    regressions = []
+    for target, result in results.items():
+        base_stages = baseline.get("targets", {}).get(target, {}).get("stages", {})
+        for stage, stats in result["stages"].items():
+            base = base_stages.get(stage)
+            if base is None or stage.startswith("degraded:"):
+                continue
+            for q in ("p50", "p95"):
+                limit = base[q] * (1 + tolerance) + slack_ms
+                if stats[q] > limit:
+                    regressions.append(f"{target}/{stage} {q} {stats[q]:.1f}ms > {limit:.1f}ms (baseline {base[q]:.1f}ms)")
+        new_degradations = set(s for s in result["stages"] if s.startswith("degraded:")) - set(base_stages)
+        for stage in sorted(new_degradations):
+            regressions.append(f"{target}: new degradation {stage.split(':', 1)[1]}")
+    return regressions
+
+def print_table(target: str, stages: Dict[str, Dict[str, float]]):
+    print(f"\n{target}")
+    print(f"  {'stage':<22} | {'n':>4} | {'p50 (ms)':>9} | {'p95 (ms)':>9} | {'p99 (ms)':>9}")
+    print("  " + "-" * 66)
+    for stage, s in stages.items():
+        print(f"  {stage:<22} | {s['n']:>4} | {s['p50']:>9.2f} | {s['p95']:>9.2f} | {s['p99']:>9.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--seed-turns", type=int, default=200, help="Prior episodes in the stores")
+    parser.add_argument("--seed-facts", type=int, default=2000, help="Prior semantic facts (Stage 2 stores)")
+    parser.add_argument("--ttft-ms", type=float, default=20.0)
+    parser.add_argument("--tokens-per-s", type=float, default=2000.0)
+    parser.add_argument("--output-tokens", type=int, default=200)
+    parser.add_argument("--aux-ttft-ms", type=float, default=10.0)
+    parser.add_argument("--aux-output-tokens", type=int, default=40)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--json", help="Write machine-readable results here ('-' for stdout)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--no-baseline", action="store_true", help="Report only, do not compare")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown per stage")
+    parser.add_argument("--slack-ms", type=float, default=2.0, help="Absolute allowance on top of the tolerance")
+    args = parser.parse_args()
+
+    results = {target: asyncio.run(run_target(target, args)) for target in args.targets}
+    from nexus.tokenizers import get_registry
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "host": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "config": {k: v for k, v in vars(args).items() if k not in ("json", "baseline", "update_baseline", "no_baseline")},
+        "tokenizer": type(get_registry().for_model("gpt-4-turbo")).__name__,
+        "targets": results,
+    }
+    for target, result in results.items():
+        print_table(target, result["stages"])
+
+    regressions = []
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+    elif not args.no_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.slack_ms)
+    report["regressions"] = regressions
+
+    if args.json:
+        payload = json.dumps(report, indent=2, sort_keys=True)
+        if args.json == "-":
+            print(payload)
+        else:
+            with open(args.json, "w") as f:
+                f.write(payload)
+
+    if regressions:
+        print("\nLatency regressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
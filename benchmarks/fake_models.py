@@ -0,0 +1,112 @@
+"""
+Synthetic LLM backend for benchmarks: a PyGPT-shaped config and model
+registry behind the real NexusModelProvider, with per-task latency profiles
+(time to first token, streaming rate, output length, jitter).
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from nexus.synthcore.model_provider import NexusModelProvider
+
+@dataclass
+class LatencyProfile:
+    ttft_ms: float = 20.0
+    tokens_per_s: float = 2000.0
+    output_tokens: int = 200
+    jitter: float = 0.1  # +/- fraction applied to ttft and rate
+    chunk_tokens: int = 16  # tokens per streamed chunk
+
+@dataclass
+class FakeResponse:
+    text: str
+    ttft_ms: float
+    total_ms: float
+    chunks: int
+
+@dataclass
+class FakeModelClient:
+    name: str
+    profile: LatencyProfile
+    seed: int = 0
+    calls: int = 0
+    ttft_ms: List[float] = field(default_factory=list)
+    total_ms: List[float] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def _scaled(self, value: float) -> float:
+        j = self.profile.jitter
+        return value * self._rng.uniform(1 - j, 1 + j) if j else value
+
+    async def stream(self, prompt: str):
+        """Yields chunks of the synthetic completion at the profile's pace."""
+        await asyncio.sleep(self._scaled(self.profile.ttft_ms) / 1000)
+        remaining = self.profile.output_tokens
+        first = True
+        while remaining > 0:
+            n = min(self.profile.chunk_tokens, remaining)
+            if not first:
+                await asyncio.sleep(n / self._scaled(self.profile.tokens_per_s))
+            first = False
+            remaining -= n
+            yield " tok" * n
+
+    async def call(self, prompt: str) -> FakeResponse:
+        self.calls += 1
+        start = time.perf_counter()
+        ttft = None
+        parts = []
+        async for chunk in self.stream(prompt):
+            if ttft is None:
+                ttft = (time.perf_counter() - start) * 1000
+            parts.append(chunk)
+        total = (time.perf_counter() - start) * 1000
+        self.ttft_ms.append(ttft or total)
+        self.total_ms.append(total)
+        return FakeResponse(f"[{self.name}]" + "".join(parts), ttft or total, total, len(parts))
+
+class FakeModelRegistry:
+    def __init__(self, clients: Dict[str, FakeModelClient]):
+        self.clients = clients
+
+    def get_client(self, model_name: str) -> FakeModelClient:
+        return self.clients[model_name]
+
+    def list_models(self) -> List[str]:
+        return list(self.clients)
+
+class FakeConfig:
+    """The subset of PyGPT's config NexusModelProvider uses."""
+    def __init__(self, registry: FakeModelRegistry, values: Dict[str, str]):
+        self.registry = registry
+        self.values = dict(values)
+        self.session: Dict[str, str] = {}
+
+    def get_model_registry(self) -> FakeModelRegistry:
+        return self.registry
+
+    def get(self, key: str, default=None):
+        return self.session.get(key, self.values.get(key, default))
+
+    def set_session(self, key: str, value: str):
+        self.session[key] = value
+
+def make_fake_provider(
+    primary: Optional[LatencyProfile] = None,
+    auxiliary: Optional[LatencyProfile] = None,
+    seed: int = 0
+) -> NexusModelProvider:
+    """Primary reasoning on 'fake-primary'; every other task falls back to the default 'fake-aux'."""
+    clients = {
+        "fake-primary": FakeModelClient("fake-primary", primary or LatencyProfile(), seed=seed),
+        "fake-aux": FakeModelClient("fake-aux", auxiliary or LatencyProfile(ttft_ms=10.0, output_tokens=40), seed=seed + 1),
+    }
+    config = FakeConfig(FakeModelRegistry(clients), {
+        "model.default": "fake-aux",
+        "nexus.model.primary_reasoning": "fake-primary",
+    })
+    return NexusModelProvider(config)
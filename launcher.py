@@ -1,8 +1,15 @@
+import atexit
 import os
 import sys
 import subprocess
+import tempfile
+import time
+import uuid
 from datetime import datetime
 
+from nexus import launch_timing
+from nexus.forkserver import ForkServer
+
 class NexusLauncher:
     def __init__(self):
         self.plugins = {
@@ -12,6 +19,15 @@ class NexusLauncher:
             "synthmood": {"name": "Synth Mood", "enabled": True},
         }
         self.version = "3.1.0"
+        self.main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+        # Fork-server mode keeps a warm parent with the heavy imports done; each launch forks from it
+        self.fork_server_enabled = os.getenv("NEXUS_FORK_SERVER", "") == "1" and ForkServer.available()
+        self.fork_server = None
+        # Cold launches hand off and exit at once; waiting for the ready mark is opt-in there
+        self.report_timing = os.getenv("NEXUS_LAUNCH_TIMING", "") == "1"
+        self.ready_timeout = float(os.getenv("NEXUS_LAUNCH_READY_TIMEOUT", "60"))
+        self.timing_report = os.path.join(tempfile.gettempdir(), f"nexus-launch-{os.getpid()}.jsonl")
+        atexit.register(self.remove_timing_report)
 
     def clear_screen(self):
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -21,7 +37,29 @@ class NexusLauncher:
         print(f"      NEXUS SYSTEM LAUNCHER v{self.version}")
         print("="*40)
 
+    def start_fork_server(self):
+        if self.fork_server is None:
+            self.fork_server = ForkServer(self.main_path)
+            self.fork_server.start()
+
+    def stop_fork_server(self):
+        if self.fork_server is not None:
+            self.fork_server.stop()
+            self.fork_server = None
+        self.remove_timing_report()
+
+    def remove_timing_report(self):
+        try:
+            os.remove(self.timing_report)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Could not remove {self.timing_report}: {e}")
+
     def run(self):
+        if self.fork_server_enabled:
+            # Preloading overlaps with the user reading the menu
+            self.start_fork_server()
         while True:
             self.clear_screen()
             self.show_header()
@@ -44,6 +82,7 @@ class NexusLauncher:
                 self.settings_menu()
             elif choice == "5":
                 print("Exiting.")
+                self.stop_fork_server()
                 sys.exit(0)
 
     def plugin_menu(self):
@@ -73,13 +112,28 @@ class NexusLauncher:
                     self.launch(custom=True)
 
     def settings_menu(self):
-        self.clear_screen()
-        self.show_header()
-        print("--- SETTINGS ---")
-        print("(Backend settings and environment configuration)")
-        input("\nPress Enter to return...")
+        while True:
+            self.clear_screen()
+            self.show_header()
+            print("--- SETTINGS ---")
+            print("(Backend settings and environment configuration)")
+            if ForkServer.available():
+                status = "[ON]" if self.fork_server_enabled else "[OFF]"
+                print(f"1. Fork-server launch mode {status}")
+            print("0. BACK to Main Menu")
+
+            choice = input("\nSelection: ").strip()
+            if choice == "1" and ForkServer.available():
+                self.fork_server_enabled = not self.fork_server_enabled
+                if self.fork_server_enabled:
+                    self.start_fork_server()
+                else:
+                    self.stop_fork_server()
+            else:
+                break
 
     def launch(self, all_plugins=True, custom=False):
+        selected_at = time.time()
         enabled = []
         if all_plugins and not custom:
             enabled = list(self.plugins.keys())
@@ -89,16 +143,40 @@ class NexusLauncher:
         env = os.environ.copy()
         env["NEXUS_MODS_ENABLED"] = ",".join(enabled) if enabled else "None"
         env["PYTHONPATH"] = os.path.dirname(os.path.abspath(__file__))
+        launch_id = uuid.uuid4().hex[:8]
+        timed = self.fork_server_enabled or self.report_timing
+        if timed:
+            env[launch_timing.ENV_T0] = repr(selected_at)
+            env[launch_timing.ENV_REPORT] = self.timing_report
+            env[launch_timing.ENV_LAUNCH_ID] = launch_id
 
         print(f"\nLaunching main instance with mods: {enabled}...")
         try:
-            main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
-            subprocess.Popen([sys.executable, main_path], env=env)
-            sys.exit(0)
+            if self.fork_server_enabled:
+                keys = ("NEXUS_MODS_ENABLED", launch_timing.ENV_T0, launch_timing.ENV_REPORT, launch_timing.ENV_LAUNCH_ID)
+                pid = self.fork_server.launch({k: env[k] for k in keys})
+                print(f"Forked instance {pid} from warm server (preload {self.fork_server.preload_ms:.0f}ms, paid once)")
+            else:
+                subprocess.Popen([sys.executable, self.main_path], env=env)
+            if timed:
+                self.report_launch(launch_id, "ready" if enabled else "handoff")
+            if not self.fork_server_enabled:
+                sys.exit(0)
+            # The warm server stays up for the next launch
+            input("Press Enter to return to the menu...")
         except Exception as e:
             print(f"Launch Error: {e}")
             input("Press Enter...")
 
+    def report_launch(self, launch_id: str, stage: str):
+        """Prints time from menu selection to each reported stage ('ready' is the first event-loop pass)."""
+        marks = launch_timing.wait_for(self.timing_report, launch_id, stage, timeout=self.ready_timeout)
+        mode = "fork-server" if self.fork_server_enabled else "cold"
+        if stage not in marks:
+            print(f"[{mode}] no '{stage}' within {self.ready_timeout:.0f}s ({launch_timing.format_marks(marks)})")
+        else:
+            print(f"[{mode}] selection -> {stage}: {marks[stage]:.0f}ms ({launch_timing.format_marks(marks)})")
+
 if __name__ == "__main__":
     launcher = NexusLauncher()
     launcher.run()
\ No newline at end of file
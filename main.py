@@ -2,15 +2,21 @@ import os
 import sys
 import logging
 from pygpt_net.app import run
-from nexus.bridge import NexusBridgePlugin
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
 logger = logging.getLogger("NexusKernel")
 
+def mark_launch(stage: str):
+    # Only timed launches (started by the launcher) report; vanilla runs skip the import
+    if os.getenv("NEXUS_LAUNCH_T0"):
+        from nexus.launch_timing import mark
+        mark(stage)
+
 def main():
+    mark_launch("main")
     mods_str = os.getenv("NEXUS_MODS_ENABLED", "")
-    enabled_mods = mods_str.split(",") if mods_str and mods_str != "None" else []
+    enabled_mods = [m.strip() for m in mods_str.split(",") if m.strip()] if mods_str and mods_str != "None" else []
 
     logger.info("--- NEXUS SYSTEM LOAD SEQUENCE ---")
     logger.info(f"Active mods identified: {enabled_mods if enabled_mods else 'VANILLA'}")
@@ -18,13 +24,21 @@ def main():
     # Instantiate custom plugins
     plugins = []
     if enabled_mods:
-        nexus_bridge = NexusBridgePlugin()
+        # Nexus is only imported when a mod is enabled; the vanilla launch never loads it
+        from nexus import tokenizers
+        from nexus.bridge import NexusBridgePlugin
+        from nexus.pipeline import build_pipeline
+
+        # Load BPE ranks off the startup path so the first turn does not pay for it
+        tokenizers.warmup()
+        nexus_bridge = NexusBridgePlugin(enabled_mods=enabled_mods, pipeline=build_pipeline(enabled_mods))
         plugins.append(nexus_bridge)
         logger.info("Nexus Bridge Plugin initialized.")
 
     logger.info("Launching PyGPT with active Nexus modules...")
     
     # This call starts the actual PyGPT GUI application
+    mark_launch("handoff")
     run(plugins=plugins)
 
 if __name__ == "__main__":
@@ -1,11 +1,65 @@
+import concurrent.futures
 import logging
-from PySide6.QtCore import QObject
+import os
+import threading
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+from PySide6.QtCore import QObject, QCoreApplication, QTimer, Signal
 from pygpt_net.plugin.base.plugin import BasePlugin
 from pygpt_net.core.events import Event
 
+from . import launch_timing
+from .loop_thread import LoopThread
+from .pipeline import NexusPipeline, baseline_prompt
+
+logger = logging.getLogger(__name__)
+
+def parse_enabled_mods(value: Optional[str]) -> List[str]:
+    if not value or value == "None":
+        return []
+    return [m.strip() for m in value.split(",") if m.strip()]
+
+# PyGPT fires this once a request/response pair is complete
+CTX_END = getattr(Event, "CTX_END", "ctx.end")
+
+class NexusBridgeSignals(QObject):
+    """Emitted from the loop thread; created on the GUI thread, so connected slots run there."""
+    prompt_ready = Signal(str, str)  # host prompt, modulated prompt
+    turn_persisted = Signal(object)
+    failed = Signal(str, str)  # operation, error
+
 class NexusBridgePlugin(BasePlugin):
-    def __init__(self, *args, **kwargs):
+    def __init__(
+        self,
+        *args,
+        enabled_mods: Optional[List[str]] = None,
+        pipeline: Optional[NexusPipeline] = None,
+        prompt_deadline_ms: float = 50.0,
+        shutdown_timeout_s: float = 5.0,
+        **kwargs
+    ):
         super(NexusBridgePlugin, self).__init__(*args, **kwargs)
+        if enabled_mods is None:
+            enabled_mods = parse_enabled_mods(os.getenv("NEXUS_MODS_ENABLED"))
+        self.enabled_mods = enabled_mods
+        self._ready_marked = False
+        self._input_attached = False
+        # The Nexus pipeline runs on its own asyncio thread; the Qt thread only
+        # waits up to prompt_deadline_ms for a modulated prompt, never for persistence.
+        self.pipeline = pipeline
+        self.prompt_deadline_ms = prompt_deadline_ms
+        self.shutdown_timeout_s = shutdown_timeout_s
+        # Persists still running; shutdown waits for them so closing the window does not drop turns
+        self._pending_persists: Set[concurrent.futures.Future] = set()
+        self._pending_lock = threading.Lock()
+        self.loop_thread = LoopThread("nexus-bridge")
+        self.signals = NexusBridgeSignals()
+        self.signals.prompt_ready.connect(self._on_prompt_ready)
+        self.signals.turn_persisted.connect(self._on_turn_persisted)
+        self.signals.failed.connect(self._on_failed)
+        self.prompt_fallbacks = 0
+        self.late_prompts_used = 0
+        # (host prompt, modulated prompt) of the last modulation, including ones that missed the deadline
+        self._last_prompt: Optional[Tuple[str, str]] = None
         self.id = "nexus_bridge"
         self.name = "Nexus System Bridge"
         self.description = "Integrates SynthCore, SynthMemory, and SynthMood into PyGPT."
@@ -16,13 +70,113 @@ class NexusBridgePlugin(BasePlugin):
 
     def setup(self):
         """Initialize and return configuration options"""
-        self.add_option("enabled_mods", "text", value="synthcore,synthmemory,synthidentity,synthmood", description="Comma-separated list of active Nexus mods.")
+        self.add_option("enabled_mods", "text", value=",".join(self.enabled_mods), description="Comma-separated list of active Nexus mods.")
+        if QCoreApplication.instance() is not None:
+            # Fires on the first event-loop pass, i.e. once the window is up
+            QTimer.singleShot(0, self._mark_ready)
+            QCoreApplication.instance().aboutToQuit.connect(self.shutdown)
         return self.options
 
+    def shutdown(self):
+        """Waits up to shutdown_timeout_s for queued turn persistence, then stops the loop thread."""
+        with self._pending_lock:
+            pending = list(self._pending_persists)
+        if pending:
+            _, not_done = concurrent.futures.wait(pending, timeout=self.shutdown_timeout_s)
+            if not_done:
+                logger.error(f"Nexus shutdown: {len(not_done)} turn(s) not persisted within {self.shutdown_timeout_s:.0f}s")
+        self.loop_thread.stop()
+
+    def _mark_ready(self):
+        if not self._ready_marked:
+            self._ready_marked = True
+            launch_timing.mark("ready")
+            # The window's widgets exist by the first event-loop pass
+            self._attach_input()
+
+    def _attach_input(self):
+        if self._input_attached or self.pipeline is None:
+            return
+        try:
+            widget = self.window.ui.nodes['input']
+        except (AttributeError, KeyError, TypeError):
+            logger.debug("PyGPT input widget not found; speculative prefetch disabled")
+            return
+        widget.textChanged.connect(lambda: self.on_draft_changed(widget.toPlainText()))
+        self._input_attached = True
+
+    def on_draft_changed(self, text: str):
+        """Forwards a draft to the pipeline on the loop thread; debouncing happens there."""
+        if self.pipeline is None:
+            return
+        self.loop_thread.start()
+        self.loop_thread.loop.call_soon_threadsafe(self.pipeline.draft_changed, text)
+
     def handle(self, event: Event, *args, **kwargs):
         """Handle PyGPT events"""
+        self._mark_ready()
         if event.name == Event.SYSTEM_PROMPT:
-            event.data['value'] = self.modulate_prompt(event.data['value'])
+            ctx = getattr(event, "ctx", None)
+            event.data['value'] = self.modulate_prompt(event.data['value'], getattr(ctx, "input", "") or "")
+        elif event.name == CTX_END and self.pipeline is not None:
+            ctx = getattr(event, "ctx", None)
+            if ctx is not None:
+                self.persist_turn(getattr(ctx, "input", "") or "", getattr(ctx, "output", "") or "")
+
+    def modulate_prompt(self, prompt: str, user_text: str = "") -> str:
+        """
+        The pipeline's prompt if it arrives within prompt_deadline_ms. Otherwise
+        the last modulated prompt for the same host prompt, which includes late
+        results delivered via prompt_ready, else the baseline.
+        """
+        if self.pipeline is None:
+            return baseline_prompt(prompt)
+        future = self._submit(
+            "modulate_prompt",
+            self.pipeline.modulate_system_prompt(prompt, user_text),
+            lambda result: self.signals.prompt_ready.emit(prompt, result)
+        )
+        try:
+            return future.result(timeout=self.prompt_deadline_ms / 1000)
+        except concurrent.futures.TimeoutError:
+            logger.warning(f"Nexus prompt modulation exceeded {self.prompt_deadline_ms:.0f}ms, using the last modulated prompt")
+        except Exception as e:
+            logger.error(f"Nexus prompt modulation failed, using the last modulated prompt: {e}")
+        self.prompt_fallbacks += 1
+        if self._last_prompt is not None and self._last_prompt[0] == prompt:
+            self.late_prompts_used += 1
+            return self._last_prompt[1]
+        return baseline_prompt(prompt)
+
+    def persist_turn(self, user_text: str, response_text: str) -> concurrent.futures.Future:
+        """Queues persistence on the loop thread and returns immediately."""
+        future = self._submit("persist_turn", self.pipeline.persist_turn(user_text, response_text), self.signals.turn_persisted.emit)
+        with self._pending_lock:
+            self._pending_persists.add(future)
+        future.add_done_callback(self._persist_done)
+        return future
+
+    def _persist_done(self, future: concurrent.futures.Future):
+        with self._pending_lock:
+            self._pending_persists.discard(future)
+
+    def _submit(self, operation: str, coro: Awaitable, emit: Callable[[Any], None]) -> concurrent.futures.Future:
+        async def deliver():
+            try:
+                result = await coro
+            except Exception as e:
+                self.signals.failed.emit(operation, str(e))
+                raise
+            emit(result)
+            return result
+        return self.loop_thread.submit(deliver())
+
+    def _on_prompt_ready(self, prompt: str, modulated: str):
+        """GUI thread. Remembered so a later SYSTEM_PROMPT that misses the deadline still gets Nexus context."""
+        self._last_prompt = (prompt, modulated)
+
+    def _on_turn_persisted(self, result: object):
+        logger.debug(f"Nexus turn persisted: {result}")
 
-    def modulate_prompt(self, prompt: str) -> str:
-        return f"[NEXUS ACTIVE]\n{prompt}\n\n[IDENTITY]: Defined by SynthIdentity\n[MOOD]: Stable/Baseline" 
+    def _on_failed(self, operation: str, error: str):
+        logger.error(f"Nexus {operation} failed: {error}") 
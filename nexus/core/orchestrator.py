@@ -2,18 +2,29 @@ import asyncio
 import logging
 import time
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Hashable
 
 from ..identity.snapshot import IdentitySnapshot, MINIMAL_SKELETON_IDENTITY
-from ..affect.mood import MoodState, MoodDecayEngine, MoodPromptGenerator
+from ..affect.mood import MoodState, MoodDecayEngine
 from ..memory.manager import MemoryService
+from ..embeddings import EmbeddingService
+from ..prefetch import SpeculativePrefetcher
 from .token_budget import TokenBudget
+from .prompt_cache import PrefixCache
 
 # Note: prompt_assembler should be imported carefully to avoid circular dependencies
 from .prompt_assembler import PromptAssembler
 
 logger = logging.getLogger(__name__)
 
+@dataclass
+class PrefetchedMemory:
+    """Steps 4-5 of a turn, computed speculatively for a draft."""
+    query_embedding: List[float]
+    memory_context: str
+    memory_tokens: int
+
 class SynthCoreOrchestrator:
     """
     Orchestrates the AI's cognitive loop: Identity, Mood, Memory, and LLM Execution.
@@ -23,14 +34,44 @@ class SynthCoreOrchestrator:
         self, 
         memory_service: MemoryService, 
         assembler: PromptAssembler,
-        llm_client: Any 
+        llm_client: Any,
+        embeddings: Optional[EmbeddingService] = None
     ):
         self.memory = memory_service
         self.assembler = assembler
+        # Rendered + tokenized SYSTEM/IDENTITY/MOOD prefix, reused while identity and mood are unchanged
+        self.prefix_cache = PrefixCache(assembler)
         self.llm = llm_client
+        # One service for query and stored embeddings, so both come from the same model and share its cache.
+        # Defaults to the deterministic local HashingEmbedder; pass a service wrapping a real model in production
+        self.embeddings = embeddings or memory_service.embeddings or EmbeddingService()
+        if memory_service.embeddings is not self.embeddings:
+            if memory_service.embeddings is not None:
+                logger.warning("MemoryService had its own EmbeddingService; replacing it with the orchestrator's")
+            memory_service.embeddings = self.embeddings
         # Initialize Mood engine with defaults for Phase 1
         self.mood_engine = MoodDecayEngine()
         self.baseline_mood = MoodDecayEngine.BASELINE
+        # Embedding + retrieval started while the user is still typing (see draft_changed)
+        self.prefetcher = SpeculativePrefetcher(self._prefetch_memory)
+
+    def draft_changed(self, user_id: str, session_id: str, draft: str):
+        """Input-change hook; call on the orchestrator's event loop. Debounced by the prefetcher."""
+        self.prefetcher.draft_changed((user_id, session_id), draft)
+
+    async def _prefetch_memory(self, scope: Hashable, draft: str) -> PrefetchedMemory:
+        user_id, session_id = scope
+        try:
+            identity = await asyncio.wait_for(self._load_identity(user_id), timeout=0.1)
+        except Exception:
+            identity = MINIMAL_SKELETON_IDENTITY
+        # Same window as a turn's budget; the turn books memory_tokens on its own budget on reuse
+        budget = TokenBudget(total_context=128000, reserved_output=8000)
+        query_embedding = (await self.embeddings.embed(draft)).tolist()
+        memory_context = await self.memory.retrieve_relevant(
+            user_id, session_id, draft, query_embedding, budget, identity.kernel.expertise_domains
+        )
+        return PrefetchedMemory(query_embedding, memory_context, budget.allocations.get("memory_fragment", 0))
 
     async def process_turn(
         self,
@@ -45,7 +86,78 @@ class SynthCoreOrchestrator:
         """
         start_time = time.time()
         metrics = {"degradation_events": [], "errors": []}
+        identity, mood = await self._load_state(user_id, identity_override, mood_current, metrics)
+
+        # 3. Initialize Budget
+        budget = TokenBudget(total_context=128000, reserved_output=8000)
+
+        # 4-5. Embed and retrieve, or reuse what was prefetched for the draft
+        query_embedding, memory_context = await self._memory_for_turn(user_id, session_id, user_text, identity, budget, metrics)
+
+        # 6. Assemble Prompt (Strict 5-Section Template)
+        # The stable prefix (SYSTEM, IDENTITY SNAPSHOT, MOOD STATE) comes first and is
+        # byte-identical across turns until identity or the rendered mood changes.
+        prefix = self.prefix_cache.prefix_for(identity, mood, "Act as the kernel defined in IDENTITY SNAPSHOT.")
+        sections = [
+            ("RELEVANT MEMORY", memory_context),
+            ("CURRENT REQUEST", user_text)
+        ]
+        
+        prompt = self.assembler.assemble(sections, budget, prefix=prefix)
+        metrics["prefix_tokens"] = prefix.token_count
+
+        # 7. LLM Call (Fatal path if fails)
+        try:
+            # Placeholder for actual LLM call logic
+            response_text = await self._call_llm(prompt)
+        except Exception as e:
+            logger.critical(f"Primary LLM failure: {e}")
+            metrics["errors"].append("llm_unreachable")
+            return {"error": "Service temporarily unavailable", "metrics": metrics}
+
+        # 8. Metrics and Output
+        metrics["latency_total"] = time.time() - start_time
+        metrics["tokens_used"] = budget.used
         
+        return {
+            "response": response_text,
+            "identity_version": identity.version,
+            "mood_state": mood,
+            "metrics": metrics
+        }
+
+    async def build_system_prompt(
+        self,
+        user_id: str,
+        session_id: str,
+        system_text: str,
+        user_text: str = "",
+        identity_override: Optional[IdentitySnapshot] = None,
+        mood_current: Optional[MoodState] = None,
+        with_memory: bool = True
+    ) -> str:
+        """
+        Steps 1-6 for a host application that runs the LLM call itself (the
+        PyGPT bridge): the cached SYSTEM / IDENTITY / MOOD prefix, followed by
+        memory relevant to `user_text` when there is one.
+        """
+        metrics = {"degradation_events": [], "errors": []}
+        identity, mood = await self._load_state(user_id, identity_override, mood_current, metrics)
+        budget = TokenBudget(total_context=128000, reserved_output=8000)
+        sections = []
+        if with_memory and user_text:
+            _, memory_context = await self._memory_for_turn(user_id, session_id, user_text, identity, budget, metrics)
+            sections.append(("RELEVANT MEMORY", memory_context))
+        prefix = self.prefix_cache.prefix_for(identity, mood, system_text)
+        return self.assembler.assemble(sections, budget, prefix=prefix)
+
+    async def _load_state(
+        self,
+        user_id: str,
+        identity_override: Optional[IdentitySnapshot],
+        mood_current: Optional[MoodState],
+        metrics: Dict[str, Any]
+    ):
         # 1. Load Identity with Fallback (100ms timeout)
         try:
             identity = identity_override or await asyncio.wait_for(self._load_identity(user_id), timeout=0.1)
@@ -63,17 +175,46 @@ class SynthCoreOrchestrator:
             logger.warning(f"Mood load failure: {e}")
             mood = self.baseline_mood
             metrics["degradation_events"].append("mood_fallback_baseline")
+        return identity, mood
 
-        # 3. Initialize Budget
-        budget = TokenBudget(total_context=128000, reserved_output=8000)
+    async def _memory_for_turn(
+        self,
+        user_id: str,
+        session_id: str,
+        user_text: str,
+        identity: IdentitySnapshot,
+        budget: TokenBudget,
+        metrics: Dict[str, Any]
+    ):
+        # Reuse memory prefetched for the draft when the final text matches closely enough
+        prefetched, match = await self.prefetcher.take((user_id, session_id), user_text)
+        if prefetched is not None and budget.allocate("memory_fragment", prefetched.memory_tokens):
+            metrics["memory_prefetch"] = match
+            return prefetched.query_embedding, prefetched.memory_context
+        return await self._embed_and_retrieve(user_id, session_id, user_text, identity, budget, metrics)
+
+    async def _embed_and_retrieve(
+        self,
+        user_id: str,
+        session_id: str,
+        user_text: str,
+        identity: IdentitySnapshot,
+        budget: TokenBudget,
+        metrics: Dict[str, Any]
+    ):
+        # 4. Embed the request (200ms timeout, micro-batched with concurrent turns)
+        try:
+            query_embedding = (await asyncio.wait_for(self.embeddings.embed(user_text), timeout=0.2)).tolist()
+        except Exception as e:
+            logger.warning(f"Query embedding failed, ranking without similarity: {e}")
+            query_embedding = []
+            metrics["degradation_events"].append("embedding_skipped")
 
-        # 4. Retrieve Memory (500ms timeout)
+        # 5. Retrieve Memory (500ms timeout)
         try:
-            # Note: query_embedding would be generated here in Phase 2
-            # We pass a dummy embedding for Phase 1 logic
             memory_context = await asyncio.wait_for(
                 self.memory.retrieve_relevant(
-                    user_id, session_id, user_text, [0.0]*1536, budget, identity.kernel.expertise_domains
+                    user_id, session_id, user_text, query_embedding, budget, identity.kernel.expertise_domains
                 ), 
                 timeout=0.5
             )
@@ -82,45 +223,7 @@ class SynthCoreOrchestrator:
             memory_context = "[No prior relevant context]"
             metrics["degradation_events"].append("memory_skipped")
 
-        # 5. Assemble Prompt (Strict 5-Section Template)
-        identity_content = (
-            f"Name: {identity.kernel.name}\n"
-            f"Role: {identity.kernel.role}\n"
-            f"Core Values: {', '.join(identity.kernel.core_values)}\n"
-            f"Communication: {identity.kernel.communication_style}\n"
-            f"Expertise: {', '.join(identity.kernel.expertise_domains)}\n"
-            f"Invariants: {identity.kernel.invariants}"
-        )
-
-        sections = [
-            ("SYSTEM", "Act as the kernel defined in IDENTITY SNAPSHOT."),
-            ("IDENTITY SNAPSHOT", identity_content),
-            ("MOOD STATE", MoodPromptGenerator.generate_injection_text(mood)),
-            ("RELEVANT MEMORY", memory_context),
-            ("CURRENT REQUEST", user_text)
-        ]
-        
-        prompt = self.assembler.assemble(sections, budget)
-
-        # 6. LLM Call (Fatal path if fails)
-        try:
-            # Placeholder for actual LLM call logic
-            response_text = await self._call_llm(prompt)
-        except Exception as e:
-            logger.critical(f"Primary LLM failure: {e}")
-            metrics["errors"].append("llm_unreachable")
-            return {"error": "Service temporarily unavailable", "metrics": metrics}
-
-        # 7. Metrics and Output
-        metrics["latency_total"] = time.time() - start_time
-        metrics["tokens_used"] = budget.used
-        
-        return {
-            "response": response_text,
-            "identity_version": identity.version,
-            "mood_state": mood,
-            "metrics": metrics
-        }
+        return query_embedding, memory_context
 
     async def _load_identity(self, user_id: str) -> IdentitySnapshot:
         # Placeholder for DB load
@@ -131,5 +234,9 @@ class SynthCoreOrchestrator:
         return self.baseline_mood
 
     async def _call_llm(self, prompt: str) -> str:
-        # Simulated LLM response for Phase 1 code structure
-        return f"[Simulated Nexus Response based on core logic]".strip()
\ No newline at end of file
+        # A NexusModelProvider or a bare client with call(); without one, the Phase 1 simulated response
+        client = self.llm.get_model_for_task('primary_reasoning') if hasattr(self.llm, 'get_model_for_task') else self.llm
+        if not hasattr(client, 'call'):
+            return f"[Simulated Nexus Response based on core logic]".strip()
+        res = await client.call(prompt)
+        return res.text if hasattr(res, 'text') else str(res)
\ No newline at end of file
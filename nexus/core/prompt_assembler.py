@@ -1,6 +1,7 @@
-import tiktoken
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 from .token_budget import TokenBudget
+from .prompt_cache import CachedPrefix
+from ..tokenizers import encoder_for
 
 class PromptAssembler:
     """
@@ -8,11 +9,9 @@ class PromptAssembler:
     Ensures each section isDelimited correctly and fits within budget.
     """
     def __init__(self, model_name: str = "gpt-4-turbo"):
-        try:
-            self.encoder = tiktoken.encoding_for_model(model_name)
-        except KeyError:
-            # Fallback to cl100k_base for newer/unknown models
-            self.encoder = tiktoken.get_encoding("cl100k_base")
+        self.model_name = model_name
+        # Shared per process; unknown models resolve to cl100k_base
+        self.encoder = encoder_for(model_name)
 
     def count_tokens(self, text: str) -> int:
         return len(self.encoder.encode(text))
@@ -24,23 +23,32 @@ class PromptAssembler:
     def assemble(
         self, 
         sections: List[Tuple[str, str]], 
-        budget: TokenBudget
+        budget: TokenBudget,
+        prefix: Optional[CachedPrefix] = None
     ) -> str:
         """
         Validates and joins a list of (header, content) tuples into the final prompt.
         Logs warnings if a section fails budget check.
+        A CachedPrefix (see prompt_cache) supplies the leading sections already
+        rendered and counted; the output is identical to passing them inline.
         """
         final_parts = []
+        if prefix is not None:
+            for cached in prefix.sections:
+                self._place(final_parts, cached.header, cached.content, cached.formatted, cached.tokens, budget)
         for header, content in sections:
-            tokens = self.count_tokens(self.format_section(header, content))
-            if budget.allocate(header.lower(), tokens):
-                final_parts.append(self.format_section(header, content))
-            else:
-                # Graceful degradation: skip memory if budget is tight, etc.
-                if header == "MEMORY":
-                    final_parts.append(self.format_section(header, "[Memory context omitted due to budget constraints]"))
-                else:
-                    # Critical sections like REQUEST should not be omitted here (handled by orchestrator FATAL path)
-                    pass
+            formatted = self.format_section(header, content)
+            self._place(final_parts, header, content, formatted, self.count_tokens(formatted), budget)
         
         return "\n".join(final_parts)
+
+    def _place(self, final_parts: List[str], header: str, content: str, formatted: str, tokens: int, budget: TokenBudget):
+        if budget.allocate(header.lower(), tokens):
+            final_parts.append(formatted)
+        else:
+            # Graceful degradation: skip memory if budget is tight, etc.
+            if header == "MEMORY":
+                final_parts.append(self.format_section(header, "[Memory context omitted due to budget constraints]"))
+            else:
+                # Critical sections like REQUEST should not be omitted here (handled by orchestrator FATAL path)
+                pass
@@ -0,0 +1,106 @@
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from ..identity.snapshot import IdentitySnapshot
+from ..affect.mood import MoodState, MoodPromptGenerator
+
+logger = logging.getLogger(__name__)
+
+def render_identity(identity: IdentitySnapshot) -> str:
+    kernel = identity.kernel
+    return (
+        f"Name: {kernel.name}\n"
+        f"Role: {kernel.role}\n"
+        f"Core Values: {', '.join(kernel.core_values)}\n"
+        f"Communication: {kernel.communication_style}\n"
+        f"Expertise: {', '.join(kernel.expertise_domains)}\n"
+        f"Invariants: {kernel.invariants}"
+    )
+
+@dataclass(frozen=True)
+class PrefixKey:
+    identity_version: int
+    identity_timestamp: str
+    mood_text: str
+    model: str
+    system_text: str
+
+@dataclass
+class PrefixSection:
+    header: str
+    content: str
+    formatted: str
+    tokens: int
+
+@dataclass
+class CachedPrefix:
+    """The stable leading sections of a prompt, rendered and tokenized once."""
+    key: PrefixKey
+    sections: List[PrefixSection]
+    text: str
+    token_ids: Tuple[int, ...] = field(repr=False)
+
+    @property
+    def token_count(self) -> int:
+        return len(self.token_ids)
+
+class PrefixCache:
+    """
+    Caches the SYSTEM / IDENTITY SNAPSHOT / MOOD STATE prefix keyed by
+    (identity version, rendered mood text, model). The mood text is rendered
+    from the unrounded mood on every call (a few comparisons and a format), so
+    the key changes exactly when the prompt would; moods that differ only past
+    the two displayed places and cross no implication threshold share an
+    entry. Consecutive turns with the same identity and mood reuse the exact
+    same bytes, so the assembler skips the re-render of the identity and the
+    re-tokenization, and provider-side prompt caching can hit.
+    """
+    def __init__(self, assembler, max_entries: int = 256):
+        self.assembler = assembler
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[PrefixKey, CachedPrefix]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def prefix_for(self, identity: IdentitySnapshot, mood: MoodState, system_text: str) -> CachedPrefix:
+        mood_text = MoodPromptGenerator.generate_injection_text(mood)
+        key = PrefixKey(
+            identity.version,
+            identity.timestamp.isoformat(),
+            mood_text,
+            getattr(self.assembler, "model_name", ""),
+            system_text
+        )
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        sections = []
+        for header, content in (
+            ("SYSTEM", system_text),
+            ("IDENTITY SNAPSHOT", render_identity(identity)),
+            ("MOOD STATE", mood_text),
+        ):
+            formatted = self.assembler.format_section(header, content)
+            sections.append(PrefixSection(header, content, formatted, self.assembler.count_tokens(formatted)))
+        text = "\n".join(s.formatted for s in sections)
+        prefix = CachedPrefix(key, sections, text, tuple(self.assembler.encoder.encode(text)))
+
+        self._entries[key] = prefix
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return prefix
+
+    def report(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import inspect
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class Embedder(ABC):
+    """
+    A text embedding model. Implementations set `name` and `dim` and return a
+    float32 matrix with one row per input text. embed() may be sync or async;
+    sync implementations are run off the event loop by EmbeddingService.
+    """
+    name: str = "embedder"
+    dim: int = 0
+
+    @abstractmethod
+    def embed(self, texts: List[str]):
+        ...
+
+    @property
+    def is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.embed)
+
+class CallableEmbedder(Embedder):
+    """Adapts any model function (sync or async, texts -> vectors) to the Embedder interface."""
+    def __init__(self, fn: Callable[[List[str]], Any], dim: int, name: str = "custom"):
+        self.fn = fn
+        self.dim = dim
+        self.name = name
+
+    @property
+    def is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.fn)
+
+    def embed(self, texts: List[str]):
+        return self.fn(texts)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic local embedder for tests and offline runs: signed feature
+    hashing of lower-cased words and character trigrams into `dim` buckets,
+    L2-normalised. No model download; identical text always yields the same
+    vector, and texts sharing words or word fragments land close together.
+    """
+    def __init__(self, dim: int = 384, char_ngrams: int = 3):
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> List[Tuple[str, float]]:
+        features = []
+        for word in _TOKEN_RE.findall(text.lower()):
+            features.append((f"w:{word}", 1.0))
+            padded = f"<{word}>"
+            for i in range(max(1, len(padded) - self.char_ngrams + 1)):
+                features.append((f"c:{padded[i:i + self.char_ngrams]}", 0.5))
+        return features
+
+    def embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, weight in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign * weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.vstack([self.embed_one(t) for t in texts]) if texts else np.zeros((0, self.dim), dtype=np.float32)
+
+@dataclass
+class EmbeddingStats:
+    requests: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0  # identical text already being embedded for another caller
+    batches: int = 0
+    embedded: int = 0
+    failures: int = 0
+    model_ms: float = 0.0
+
+    @property
+    def avg_batch(self) -> float:
+        return self.embedded / self.batches if self.batches else 0.0
+
+class EmbeddingService:
+    """
+    Micro-batching front end for an Embedder.
+
+    Texts requested by concurrent turns are collected into one batch, which is
+    sent to the model when it reaches `max_batch` texts or `max_wait_ms` after
+    its first text arrived. Results are cached by a hash of (model, text) in a
+    bounded LRU, and a text already in flight is shared rather than embedded
+    twice. Vectors are float32 and read-only (they are shared between callers).
+    """
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+        cache_size: int = 10_000
+    ):
+        self.embedder = embedder or HashingEmbedder()
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.cache_size = cache_size
+        self.stats = EmbeddingStats()
+        self._cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        self._pending: List[Tuple[bytes, str]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def dim(self) -> int:
+        return self.embedder.dim
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha1(f"{self.embedder.name}\0{text}".encode("utf-8")).digest()
+
+    async def embed(self, text: str) -> np.ndarray:
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: Sequence[str]) -> List[np.ndarray]:
+        loop = asyncio.get_running_loop()
+        waits: List[Any] = []
+        for text in texts:
+            self.stats.requests += 1
+            key = self._key(text)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats.cache_hits += 1
+                waits.append(cached)
+                continue
+            future = self._inflight.get(key)
+            if future is not None and future.cancelled():
+                # Left behind by a batch that was torn down; embed the text afresh
+                del self._inflight[key]
+                future = None
+            if future is not None:
+                self.stats.coalesced += 1
+            else:
+                future = loop.create_future()
+                self._inflight[key] = future
+                self._pending.append((key, text))
+            waits.append(future)
+
+        if len(self._pending) >= self.max_batch:
+            self._flush_now()
+        elif self._pending and self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000, self._flush_now)
+
+        # Shielded: a caller that times out or is cancelled must not cancel the
+        # shared future every other caller of the same text is waiting on
+        return [await asyncio.shield(w) if isinstance(w, asyncio.Future) else w for w in waits]
+
+    def _flush_now(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            asyncio.get_running_loop().create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[bytes, str]]):
+        texts = [text for _, text in batch]
+        start = time.perf_counter()
+        try:
+            if self.embedder.is_async:
+                result = await self.embedder.embed(texts)
+            else:
+                result = await asyncio.to_thread(self.embedder.embed, texts)
+            vectors = np.asarray(result, dtype=np.float32).reshape(len(texts), -1)
+        except asyncio.CancelledError:
+            for key, _ in batch:
+                future = self._inflight.pop(key, None)
+                if future is not None and not future.done():
+                    future.cancel()
+            raise
+        except Exception as e:
+            self.stats.failures += 1
+            logger.error(f"Embedding batch of {len(texts)} failed: {e}")
+            for key, _ in batch:
+                future = self._inflight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats.batches += 1
+        self.stats.embedded += len(texts)
+        self.stats.model_ms += (time.perf_counter() - start) * 1000
+        for (key, _), vector in zip(batch, vectors):
+            vector.setflags(write=False)
+            self._cache[key] = vector
+            future = self._inflight.pop(key, None)
+            if future is not None and not future.done():
+                future.set_result(vector)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def report(self) -> Dict[str, float]:
+        return {
+            "requests": self.stats.requests,
+            "cache_hits": self.stats.cache_hits,
+            "coalesced": self.stats.coalesced,
+            "batches": self.stats.batches,
+            "avg_batch": round(self.stats.avg_batch, 2),
+            "failures": self.stats.failures,
+            "model_ms": round(self.stats.model_ms, 1),
+        }
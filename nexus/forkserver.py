@@ -0,0 +1,178 @@
+import importlib
+import json
+import logging
+import os
+import runpy
+import signal
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional, Sequence
+
+from . import launch_timing
+
+logger = logging.getLogger(__name__)
+
+# Imported once in the warm parent and shared (copy-on-write) by every launch
+PRELOAD_MODULES = (
+    "PySide6.QtCore",
+    "PySide6.QtGui",
+    "PySide6.QtWidgets",
+    "pygpt_net.app",
+    "numpy",
+    "sqlalchemy",
+    "nexus.tokenizers",
+    "nexus.embeddings",
+    "nexus.synthmemory.episodic_store",
+    "nexus.synthmemory.semantic_store",
+    "nexus.synthcore.synthcore",
+    "nexus.core.orchestrator",
+)
+
+class ForkServer:
+    """
+    A warm parent process for launching main.py repeatedly (POSIX only).
+
+    start() forks a server that imports PRELOAD_MODULES and loads the
+    tokenizer once, then waits for launch requests on a pipe. Each launch()
+    forks a child of that server, which applies the requested environment
+    (NEXUS_MODS_ENABLED etc.) and runs main.py, so it starts with the heavy
+    imports already done. The server starts no threads of its own and never
+    creates a QApplication. The one exception is numpy's BLAS thread pool,
+    which exists once numpy is imported; OpenBLAS (numpy's bundled BLAS)
+    registers fork handlers that quiesce it and rebuild it in each child.
+    Do not add preload modules that start threads on import. The server
+    exits when the launcher closes its end of the pipe; launched windows
+    keep running.
+    """
+    def __init__(self, main_path: str, preload: Sequence[str] = PRELOAD_MODULES, warm_tokenizers: bool = True):
+        self.main_path = main_path
+        self.preload = tuple(preload)
+        self.warm_tokenizers = warm_tokenizers
+        self.pid: Optional[int] = None
+        self.preload_ms = 0.0
+        self.failed: List[str] = []
+        self._requests = None
+        self._replies = None
+        self._ready = False
+
+    @staticmethod
+    def available() -> bool:
+        return hasattr(os, "fork")
+
+    def start(self):
+        """Forks the server; preloading runs in the background while the launcher waits for input."""
+        if self.pid is not None:
+            return
+        request_r, request_w = os.pipe()
+        reply_r, reply_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(request_w)
+            os.close(reply_r)
+            self._serve(request_r, reply_w)
+        os.close(request_r)
+        os.close(reply_w)
+        self.pid = pid
+        self._requests = os.fdopen(request_w, "w", buffering=1)
+        self._replies = os.fdopen(reply_r, "r")
+
+    def wait_ready(self):
+        """Blocks until the server has finished preloading."""
+        if self._ready:
+            return
+        if self.pid is None:
+            self.start()
+        ready = self._reply()
+        self._ready = True
+        self.preload_ms = ready.get("preload_ms", 0.0)
+        self.failed = ready.get("failed", [])
+        if self.failed:
+            logger.warning(f"Fork server could not preload: {', '.join(self.failed)}")
+        logger.info(f"Fork server {self.pid} warm after {self.preload_ms:.0f}ms")
+
+    def _reply(self) -> dict:
+        line = self._replies.readline()
+        if not line:
+            raise RuntimeError("Fork server exited unexpectedly")
+        return json.loads(line)
+
+    def launch(self, env: Dict[str, str]) -> int:
+        """Starts main.py in a fresh child of the warm server with `env` applied. Returns its pid."""
+        self.wait_ready()
+        self._requests.write(json.dumps({"env": env}) + "\n")
+        return self._reply()["pid"]
+
+    def stop(self):
+        if self.pid is None:
+            return
+        for stream in (self._requests, self._replies):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        try:
+            os.waitpid(self.pid, 0)
+        except ChildProcessError:
+            pass
+        self.pid = None
+        self._ready = False
+
+    # --- server side (runs in the forked process, never returns) ---
+
+    def _serve(self, request_fd: int, reply_fd: int):
+        code = 0
+        try:
+            # Launched windows are reaped automatically; they reset this for themselves
+            signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+            replies = os.fdopen(reply_fd, "w", buffering=1)
+            start = time.perf_counter()
+            failed = self._preload()
+            replies.write(json.dumps({"preload_ms": (time.perf_counter() - start) * 1000, "failed": failed}) + "\n")
+            with os.fdopen(request_fd, "r") as requests:
+                for line in requests:
+                    env = json.loads(line)["env"]
+                    pid = os.fork()
+                    if pid == 0:
+                        requests.close()
+                        replies.close()
+                        self._run_child(env)
+                    replies.write(json.dumps({"pid": pid}) + "\n")
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _preload(self) -> List[str]:
+        failed = []
+        for name in self.preload:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                failed.append(f"{name} ({type(e).__name__})")
+        if self.warm_tokenizers:
+            try:
+                from .tokenizers import warmup
+                warmup(background=False)
+            except Exception as e:
+                failed.append(f"tokenizers ({type(e).__name__})")
+        return failed
+
+    def _run_child(self, env: Dict[str, str]):
+        code = 0
+        try:
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            os.environ.update(env)
+            launch_timing.mark("forked")
+            sys.argv = [self.main_path]
+            runpy.run_path(self.main_path, run_name="__main__")
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 0
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
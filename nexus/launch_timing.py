@@ -0,0 +1,55 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+# Set by the launcher on the process it starts; stages are reported relative to T0
+ENV_T0 = "NEXUS_LAUNCH_T0"
+ENV_REPORT = "NEXUS_LAUNCH_REPORT"
+ENV_LAUNCH_ID = "NEXUS_LAUNCH_ID"
+
+def mark(stage: str):
+    """Appends `stage` with the wall-clock ms since the launcher's selection. No-op outside timed launches."""
+    t0 = os.getenv(ENV_T0)
+    path = os.getenv(ENV_REPORT)
+    if not t0 or not path:
+        return
+    record = {
+        "launch": os.getenv(ENV_LAUNCH_ID, ""),
+        "stage": stage,
+        "pid": os.getpid(),
+        "ms": round((time.time() - float(t0)) * 1000, 1),
+    }
+    try:
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError:
+        pass
+
+def read_marks(path: str, launch_id: str) -> Dict[str, float]:
+    marks = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("launch") == launch_id:
+                    marks[record["stage"]] = record["ms"]
+    except FileNotFoundError:
+        pass
+    return marks
+
+def wait_for(path: str, launch_id: str, stage: str, timeout: float = 30.0, interval: float = 0.05) -> Dict[str, float]:
+    """Polls the report until `stage` is marked for this launch or `timeout` seconds pass."""
+    deadline = time.monotonic() + timeout
+    marks = read_marks(path, launch_id)
+    while stage not in marks and time.monotonic() < deadline:
+        time.sleep(interval)
+        marks = read_marks(path, launch_id)
+    return marks
+
+def format_marks(marks: Dict[str, float], order: Optional[List[str]] = None) -> str:
+    stages = order or sorted(marks, key=marks.get)
+    return ", ".join(f"{stage} {marks[stage]:.0f}ms" for stage in stages if stage in marks) or "no timings reported"
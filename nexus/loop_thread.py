@@ -0,0 +1,65 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Awaitable, Optional
+
+logger = logging.getLogger(__name__)
+
+class LoopThread:
+    """
+    An asyncio event loop running on its own daemon thread.
+
+    Lets synchronous code (a Qt event handler) hand coroutines to the Nexus
+    pipeline without ever running Nexus I/O on the calling thread: submit()
+    returns a concurrent.futures.Future the caller may poll, wait on with a
+    deadline, or ignore.
+    """
+    def __init__(self, name: str = "nexus-loop"):
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._started.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._started.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """Schedules `coro` on the loop thread (starting it if needed); thread-safe."""
+        if not self.running:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self, timeout: float = 5.0):
+        """Stops the loop; tasks still running are cancelled."""
+        if not self.running:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"Loop thread {self.name} did not stop within {timeout}s")
+        self._thread = None
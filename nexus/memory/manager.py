@@ -1,24 +1,32 @@
 import math
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional
+from typing import List, Optional, TYPE_CHECKING
 import json
 import numpy as np
 
 from .service import EpisodicMemory, MemoryRanker
-from .persistence import DatabaseManager, EpisodicModel
 from ..core.token_budget import TokenBudget
 from ..core.prompt_assembler import PromptAssembler
+from ..embeddings import EmbeddingService
+
+if TYPE_CHECKING:
+    # sqlalchemy is imported with the persistence layer, on first database use
+    from .persistence import DatabaseManager
 
 class MemoryService:
     """
     Coordinates database storage, retrieval, ranking, and packing of episodic memories.
     """
-    def __init__(self, assembler: PromptAssembler, db_manager: DatabaseManager):
+    def __init__(self, assembler: PromptAssembler, db_manager: "DatabaseManager", embeddings: Optional[EmbeddingService] = None):
         self.assembler = assembler
         self.db = db_manager
+        self.embeddings = embeddings
 
-    async def store_interaction(self, user_id: str, session_id: str, role: str, text: str, embedding: List[float]):
-        """Saves a new interaction to the database."""
+    async def store_interaction(self, user_id: str, session_id: str, role: str, text: str, embedding: Optional[List[float]] = None):
+        """Saves a new interaction to the database. Without an embedding, one is computed if a service is configured."""
+        if embedding is None and self.embeddings is not None:
+            embedding = (await self.embeddings.embed(text)).tolist()
+        from .persistence import EpisodicModel
         session = self.db.get_session()
         try:
             episode = EpisodicModel(
@@ -48,6 +56,7 @@ class MemoryService:
         """
         Retrieves from DB with limits, ranks, and packs with diversity constraints.
         """
+        from .persistence import EpisodicModel
         session = self.db.get_session()
         try:
             # Fetch with limits to avoid OOM/performance hits
@@ -4,6 +4,7 @@ from sqlalchemy.orm import sessionmaker, Session
 from datetime import datetime, timezone
 import logging
 import os
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 Base = declarative_base()
@@ -56,10 +57,11 @@ class DatabaseManager:
     def initialize_db(self):
         """Create tables and ensure pgvector extension is present."""
         try:
-            with self.engine.connect() as conn:
-                # Note: This requires the database user to have superuser or appropriate privileges.
-                conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-                conn.commit()
+            if self.engine.dialect.name == "postgresql":
+                with self.engine.connect() as conn:
+                    # Note: This requires the database user to have superuser or appropriate privileges.
+                    conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+                    conn.commit()
             Base.metadata.create_all(bind=self.engine)
             logger.info("Database initialized successfully.")
         except Exception as e:
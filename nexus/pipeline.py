@@ -0,0 +1,84 @@
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .core.orchestrator import SynthCoreOrchestrator
+
+logger = logging.getLogger(__name__)
+
+def baseline_prompt(prompt: str) -> str:
+    return f"[NEXUS ACTIVE]\n{prompt}\n\n[IDENTITY]: Defined by SynthIdentity\n[MOOD]: Stable/Baseline"
+
+class NexusPipeline:
+    """
+    What the bridge runs on its loop thread. Both coroutines may do database
+    or model I/O; the defaults are the static baseline. build_pipeline()
+    returns the orchestrator-backed one for the enabled mods.
+    """
+    async def modulate_system_prompt(self, prompt: str, user_text: str = "") -> str:
+        return baseline_prompt(prompt)
+
+    async def persist_turn(self, user_text: str, response_text: str) -> Dict[str, Any]:
+        return {}
+
+    def draft_changed(self, text: str):
+        """Called on the loop thread for every edit of the input box; hook speculative prefetch here."""
+
+class OrchestratorPipeline(NexusPipeline):
+    """
+    Runs the bridge's work through a SynthCoreOrchestrator for the single
+    local GUI user: the host's system prompt becomes the SYSTEM section of the
+    identity/mood prefix, followed by memory relevant to the request when a
+    database is configured, prefetched while the user types; completed turns
+    are stored through the orchestrator's MemoryService.
+    """
+    def __init__(self, orchestrator: "SynthCoreOrchestrator", user_id: str = "local", session_id: str = "default"):
+        self.orchestrator = orchestrator
+        self.user_id = user_id
+        self.session_id = session_id
+
+    @property
+    def has_memory(self) -> bool:
+        return self.orchestrator.memory.db is not None
+
+    async def modulate_system_prompt(self, prompt: str, user_text: str = "") -> str:
+        return await self.orchestrator.build_system_prompt(
+            self.user_id, self.session_id, prompt, user_text, with_memory=self.has_memory
+        )
+
+    def draft_changed(self, text: str):
+        """Starts the orchestrator's speculative memory retrieval for the draft; modulate_system_prompt takes it."""
+        if self.has_memory:
+            self.orchestrator.draft_changed(self.user_id, self.session_id, text)
+
+    async def persist_turn(self, user_text: str, response_text: str) -> Dict[str, Any]:
+        if not self.has_memory:
+            return {"stored": 0}
+        memory = self.orchestrator.memory
+        await memory.store_interaction(self.user_id, self.session_id, "user", user_text)
+        await memory.store_interaction(self.user_id, self.session_id, "assistant", response_text)
+        return {"stored": 2}
+
+def build_pipeline(enabled_mods: List[str], db_url: Optional[str] = None) -> Optional[NexusPipeline]:
+    """
+    The pipeline for NEXUS_MODS_ENABLED, or None (static baseline) without
+    synthcore. Memory needs a database (db_url, else NEXUS_DB_URL); without
+    one the prompt carries identity and mood only and turns are not stored.
+    """
+    if "synthcore" not in enabled_mods:
+        return None
+    from .core.orchestrator import SynthCoreOrchestrator
+    from .core.prompt_assembler import PromptAssembler
+    from .memory.manager import MemoryService
+
+    db = None
+    db_url = db_url or os.getenv("NEXUS_DB_URL")
+    if db_url:
+        from .memory.persistence import DatabaseManager
+        db = DatabaseManager(db_url)
+        db.initialize_db()
+    else:
+        logger.info("NEXUS_DB_URL not set; Nexus memory retrieval and persistence are off")
+    assembler = PromptAssembler()
+    return OrchestratorPipeline(SynthCoreOrchestrator(MemoryService(assembler, db), assembler, None))
@@ -0,0 +1,196 @@
+import asyncio
+import difflib
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+def draft_key(scope: Hashable, text: str) -> str:
+    normalized = " ".join(text.split()).lower()
+    return hashlib.sha1(f"{scope!r}\0{normalized}".encode("utf-8")).hexdigest()
+
+@dataclass
+class _Entry:
+    scope: Hashable
+    text: str
+    task: asyncio.Task
+    started: float
+    elapsed_ms: float = 0.0
+
+@dataclass
+class PrefetchStats:
+    started: int = 0
+    hits_exact: int = 0
+    hits_near: int = 0
+    misses: int = 0
+    wasted: int = 0  # speculative fetches whose result no turn used
+    wasted_ms: float = 0.0
+    skipped_short: int = 0
+    skipped_cap: int = 0
+    failed: int = 0
+
+class SpeculativePrefetcher:
+    """
+    Debounced speculative work for a draft the user is still typing.
+
+    draft_changed() (called on the event loop, once per edit) waits until the
+    draft has been stable for `debounce_ms`, then runs `fetch(scope, draft)`
+    and caches the task under a hash of the normalised draft. take() at turn
+    start returns the result for the final text: an exact match is awaited
+    (up to `timeout`) even if still running, otherwise the most similar
+    completed draft at or above `near_ratio` is reused. Every other fetch for
+    the scope counts as wasted. At most `max_per_turn` fetches start per scope
+    between turns and one runs at a time, so wasted work is bounded.
+    """
+    def __init__(
+        self,
+        fetch: Callable[[Hashable, str], Awaitable[Any]],
+        debounce_ms: float = 300.0,
+        min_chars: int = 12,
+        near_ratio: float = 0.9,
+        max_per_turn: int = 4,
+        max_entries: int = 64
+    ):
+        self.fetch = fetch
+        self.debounce_ms = debounce_ms
+        self.min_chars = min_chars
+        self.near_ratio = near_ratio
+        self.max_per_turn = max_per_turn
+        self.max_entries = max_entries
+        self.stats = PrefetchStats()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._started_this_turn: Dict[Hashable, int] = {}
+        self._latest: Dict[Hashable, str] = {}
+
+    def draft_changed(self, scope: Hashable, text: str):
+        """Must be called on the event loop thread."""
+        timer = self._timers.pop(scope, None)
+        if timer is not None:
+            timer.cancel()
+        self._latest[scope] = text
+        if len(text.strip()) < self.min_chars:
+            self.stats.skipped_short += 1
+            return
+        self._timers[scope] = asyncio.get_running_loop().call_later(self.debounce_ms / 1000, self._fire, scope)
+
+    def _fire(self, scope: Hashable):
+        self._timers.pop(scope, None)
+        text = self._latest.get(scope)
+        if text is None:
+            return
+        key = draft_key(scope, text)
+        if key in self._entries:
+            return
+        if any(e.scope == scope and not e.task.done() for e in self._entries.values()):
+            # One fetch per scope at a time; the latest draft is retried when it finishes
+            return
+        if self._started_this_turn.get(scope, 0) >= self.max_per_turn:
+            self.stats.skipped_cap += 1
+            return
+        self._started_this_turn[scope] = self._started_this_turn.get(scope, 0) + 1
+        self.stats.started += 1
+        task = asyncio.get_running_loop().create_task(self.fetch(scope, text))
+        entry = _Entry(scope, text, task, time.perf_counter())
+        task.add_done_callback(lambda t, entry=entry: self._done(entry))
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._discard(self._entries.popitem(last=False)[1])
+
+    def _done(self, entry: _Entry):
+        entry.elapsed_ms = (time.perf_counter() - entry.started) * 1000
+        if not entry.task.cancelled() and entry.task.exception() is not None:
+            self.stats.failed += 1
+            logger.debug(f"Speculative prefetch failed: {entry.task.exception()}")
+        latest = self._latest.get(entry.scope)
+        if latest is not None and latest != entry.text and entry.scope not in self._timers:
+            self._fire(entry.scope)
+
+    def _discard(self, entry: _Entry):
+        self.stats.wasted += 1
+        if entry.task.done():
+            self.stats.wasted_ms += entry.elapsed_ms
+        else:
+            # Left to finish rather than cancelled: the fetch may be waiting on work shared
+            # with a real turn (a coalesced embedding), and at most max_per_turn run per scope
+            entry.task.add_done_callback(lambda t, entry=entry: self._count_wasted(entry))
+
+    def _count_wasted(self, entry: _Entry):
+        self.stats.wasted_ms += entry.elapsed_ms
+
+    async def take(self, scope: Hashable, text: str, timeout: float = 0.5) -> Tuple[Optional[Any], str]:
+        """
+        The prefetched result for the final `text` and how it matched
+        ("exact", "near" or "miss"). Clears the scope's speculative state.
+        """
+        timer = self._timers.pop(scope, None)
+        if timer is not None:
+            timer.cancel()
+        self._latest.pop(scope, None)
+        self._started_this_turn.pop(scope, None)
+
+        scoped = {k: e for k, e in self._entries.items() if e.scope == scope}
+        for key in scoped:
+            del self._entries[key]
+
+        chosen, match = None, "miss"
+        exact = scoped.pop(draft_key(scope, text), None)
+        if exact is not None:
+            chosen, match = exact, "exact"
+        else:
+            normalized = " ".join(text.split()).lower()
+            best, best_ratio = None, self.near_ratio
+            for key, entry in scoped.items():
+                if not entry.task.done() or entry.task.cancelled() or entry.task.exception() is not None:
+                    continue
+                ratio = difflib.SequenceMatcher(None, " ".join(entry.text.split()).lower(), normalized).ratio()
+                if ratio >= best_ratio:
+                    best, best_ratio = key, ratio
+            if best is not None:
+                chosen, match = scoped.pop(best), "near"
+
+        for entry in scoped.values():
+            self._discard(entry)
+
+        result = None
+        if chosen is not None:
+            try:
+                result = await asyncio.wait_for(asyncio.shield(chosen.task), timeout)
+            except asyncio.CancelledError:
+                if not chosen.task.cancelled():
+                    # The turn itself is being cancelled, not the prefetch
+                    raise
+                logger.debug(f"Prefetched result unusable ({match}): fetch was cancelled")
+                self._discard(chosen)
+                match = "miss"
+            except Exception as e:
+                logger.debug(f"Prefetched result unusable ({match}): {e}")
+                self._discard(chosen)
+                match = "miss"
+        if match == "exact":
+            self.stats.hits_exact += 1
+        elif match == "near":
+            self.stats.hits_near += 1
+        else:
+            self.stats.misses += 1
+        return result, match
+
+    def report(self) -> Dict[str, float]:
+        used = self.stats.hits_exact + self.stats.hits_near
+        return {
+            "started": self.stats.started,
+            "hits_exact": self.stats.hits_exact,
+            "hits_near": self.stats.hits_near,
+            "misses": self.stats.misses,
+            "hit_rate": used / (used + self.stats.misses) if used + self.stats.misses else 0.0,
+            "wasted": self.stats.wasted,
+            "wasted_ratio": self.stats.wasted / self.stats.started if self.stats.started else 0.0,
+            "wasted_ms": round(self.stats.wasted_ms, 1),
+            "skipped_short": self.stats.skipped_short,
+            "skipped_cap": self.stats.skipped_cap,
+            "failed": self.stats.failed,
+        }
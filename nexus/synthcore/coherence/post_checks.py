@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from .contradiction_detector import ContradictionDetector, ContradictionReport
+from .state_tracker import MultiTurnCoherenceTracker, InvariantViolationReport, DriftReport
+from ...synthidentity.snapshot import IdentitySnapshot
+from ...synthmemory.semantic_store import SemanticStore
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CheckResult:
+    name: str
+    status: str  # 'ok', 'skipped' (deadline exceeded), 'error'
+    value: Any = None
+    elapsed_ms: float = 0.0
+    reason: str = ""
+
+@dataclass
+class PostCheckReport:
+    """Combined outcome of the post-generation checks for one turn."""
+    contradictions: ContradictionReport
+    invariants: InvariantViolationReport
+    drift: DriftReport
+    results: Dict[str, CheckResult] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+    @property
+    def skipped(self) -> List[str]:
+        return [name for name, r in self.results.items() if r.status != "ok"]
+
+class PostGenerationChecks:
+    """
+    Runs contradiction detection, invariant checks and drift detection
+    concurrently. The checks only read shared state, so the wall time is the
+    slowest check rather than the sum. A check that misses its deadline (or
+    raises) degrades to a neutral result and is recorded as skipped.
+    """
+    DEFAULT_DEADLINE_S = 0.5
+
+    def __init__(
+        self,
+        detector: ContradictionDetector,
+        tracker: MultiTurnCoherenceTracker,
+        deadline_s: float = DEFAULT_DEADLINE_S,
+        deadlines: Optional[Dict[str, float]] = None
+    ):
+        self.detector = detector
+        self.tracker = tracker
+        self.deadline_s = deadline_s
+        self.deadlines = deadlines or {}
+
+    async def run(self, user_id: str, response_text: str, identity: IdentitySnapshot, semantic_store: SemanticStore) -> PostCheckReport:
+        """Checks `response_text` against `user_id`'s own turn history."""
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            self._run_check(
+                "contradictions",
+                lambda: self.detector.detect_all_contradictions(response_text, self.tracker.history(user_id), semantic_store),
+                ContradictionReport(severity="none")
+            ),
+            self._run_check(
+                "invariants",
+                lambda: self.tracker.check_invariants(response_text, identity),
+                InvariantViolationReport()
+            ),
+            self._run_check(
+                "drift",
+                lambda: self.tracker.detect_drift(user_id),
+                DriftReport(drift_detected=False, reason="skipped")
+            ),
+        )
+        by_name = {r.name: r for r in results}
+        return PostCheckReport(
+            contradictions=by_name["contradictions"].value,
+            invariants=by_name["invariants"].value,
+            drift=by_name["drift"].value,
+            results=by_name,
+            elapsed_ms=(time.perf_counter() - start) * 1000
+        )
+
+    async def check_invariants(self, response_text: str, identity: IdentitySnapshot) -> InvariantViolationReport:
+        """Single deadline-bounded invariant check, e.g. after a regeneration."""
+        result = await self._run_check(
+            "invariants",
+            lambda: self.tracker.check_invariants(response_text, identity),
+            InvariantViolationReport()
+        )
+        return result.value
+
+    async def _run_check(self, name: str, check: Callable[[], Awaitable[Any]], fallback: Any) -> CheckResult:
+        deadline = self.deadlines.get(name, self.deadline_s)
+        start = time.perf_counter()
+        try:
+            value = await asyncio.wait_for(check(), timeout=deadline)
+            return CheckResult(name, "ok", value, (time.perf_counter() - start) * 1000)
+        except asyncio.TimeoutError:
+            logger.warning(f"Post-check '{name}' exceeded {deadline * 1000:.0f}ms deadline, skipped")
+            return CheckResult(name, "skipped", fallback, (time.perf_counter() - start) * 1000, "deadline_exceeded")
+        except Exception as e:
+            logger.error(f"Post-check '{name}' failed, skipped: {e}")
+            return CheckResult(name, "error", fallback, (time.perf_counter() - start) * 1000, str(e))
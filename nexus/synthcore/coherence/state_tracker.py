@@ -1,7 +1,8 @@
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any
 from ..model_provider import NexusModelProvider
 from ...synthmood.mood import PADState
 from ...synthidentity.kernel import IdentityKernel
@@ -36,12 +37,27 @@ class TurnStateSnapshot:
     semantic_count: int
 
 class MultiTurnCoherenceTracker:
-    def __init__(self, model_provider: NexusModelProvider):
+    """
+    Per-user turn snapshots. Turns of different users run in parallel, so each
+    user has their own history and drift/contradiction checks only ever
+    compare a response against that user's earlier turns.
+    """
+    HISTORY_LIMIT = 100
+
+    def __init__(self, model_provider: NexusModelProvider, max_users: int = 10_000):
         self.models = model_provider
-        self.state_history: List[TurnStateSnapshot] = []
+        self.max_users = max_users
+        # user_id -> snapshots, least recently active user first
+        self._histories: "OrderedDict[str, List[TurnStateSnapshot]]" = OrderedDict()
         self.invariants = []
 
-    async def snapshot_after_turn(self, turn_id, timestamp, identity, mood, memory, response_text):
+    def history(self, user_id: str) -> List[TurnStateSnapshot]:
+        return self._histories.get(user_id, [])
+
+    def snapshot_count(self) -> int:
+        return sum(len(h) for h in self._histories.values())
+
+    async def snapshot_after_turn(self, user_id, turn_id, timestamp, identity, mood, memory, response_text):
         snapshot = TurnStateSnapshot(
             turn_id=turn_id,
             timestamp=timestamp,
@@ -52,9 +68,13 @@ class MultiTurnCoherenceTracker:
             episodic_count=await memory.episodic.count(),
             semantic_count=await memory.semantic.count()
         )
-        self.state_history.append(snapshot)
-        if len(self.state_history) > 100:
-            self.state_history.pop(0)
+        history = self._histories.setdefault(user_id, [])
+        self._histories.move_to_end(user_id)
+        history.append(snapshot)
+        if len(history) > self.HISTORY_LIMIT:
+            history.pop(0)
+        if len(self._histories) > self.max_users:
+            self._histories.popitem(last=False)
 
     async def check_invariants(self, response_text, identity) -> InvariantViolationReport:
         report = InvariantViolationReport()
@@ -62,12 +82,13 @@ class MultiTurnCoherenceTracker:
              report.violations.append(InvariantViolation("id_01", "Identity name mismatch in response", "warn"))
         return report
 
-    async def detect_drift(self) -> DriftReport:
-        if len(self.state_history) < 5:
+    async def detect_drift(self, user_id: str) -> DriftReport:
+        history = self.history(user_id)
+        if len(history) < 5:
             return DriftReport(drift_detected=False, reason="insufficient_history")
 
-        recent = self.state_history[-1]
-        historical = self.state_history[-min(20, len(self.state_history))]
+        recent = history[-1]
+        historical = history[-min(20, len(history))]
 
         mood_drift = (abs(recent.pad_state.valence - historical.pad_state.valence) +
                       abs(recent.pad_state.arousal - historical.pad_state.arousal)) / 2
@@ -0,0 +1,136 @@
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+from ..tokenizers import encoder_for
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PackItem:
+    section: str  # header the item is rendered under, e.g. "RELEVANT FACTS"
+    text: str
+    priority: int  # lower is admitted first
+    order: int = 0  # tie-break within a priority (rank, or recency for history)
+    position: int = 0  # render position within its section
+
+@dataclass
+class PackResult:
+    text: str
+    tokens: int
+    budget: int
+    included: Dict[str, int] = field(default_factory=dict)
+    dropped: Dict[str, int] = field(default_factory=dict)
+    truncated: int = 0
+
+    @property
+    def dropped_total(self) -> int:
+        return sum(self.dropped.values())
+
+class MemoryPacker:
+    """
+    Packs retrieved memory items into a token budget.
+
+    Items are admitted greedily in (priority, order) until the budget is used;
+    when the next item does not fit, smaller ones further down are still tried,
+    and the highest-priority item that missed is truncated on a token boundary
+    into whatever is left. Per-item token ids are cached, so the same fact or
+    turn is tokenized once across turns.
+    """
+    TRUNCATION_MARKER = " [...]"
+    # Below this much leftover budget a truncated fragment is not worth including
+    MIN_TRUNCATED_TOKENS = 16
+
+    def __init__(self, model_name: str = "gpt-4-turbo", encoder=None, cache_size: int = 4096):
+        self.model_name = model_name
+        self._encoder = encoder
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple]" = OrderedDict()
+
+    @property
+    def encoder(self):
+        if self._encoder is None:
+            # Shared registry; falls back to character estimates when no encoding can be loaded
+            self._encoder = encoder_for(self.model_name)
+        return self._encoder
+
+    def tokens(self, text: str) -> Tuple:
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return cached
+        tokens = tuple(self.encoder.encode(text))
+        self._cache[text] = tokens
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return tokens
+
+    def count(self, text: str) -> int:
+        return len(self.tokens(text))
+
+    def pack(self, items: List[PackItem], budget: int, section_order: Sequence[str]) -> PackResult:
+        candidates = sorted(items, key=lambda item: (item.priority, item.order))
+        # Costed with the separating blank line; the first section renders without it
+        headers = {section: f"\n[{section}]\n" for section in section_order}
+        admitted: List[PackItem] = []
+        missed: List[PackItem] = []
+        opened = set()
+        used = 0
+
+        for item in candidates:
+            cost = self.count(item.text + "\n")
+            if item.section not in opened:
+                cost += self.count(headers[item.section])
+            if used + cost <= budget:
+                admitted.append(item)
+                opened.add(item.section)
+                used += cost
+            else:
+                missed.append(item)
+
+        truncated = 0
+        if missed:
+            item = missed[0]
+            header_cost = 0 if item.section in opened else self.count(headers[item.section])
+            room = budget - used - header_cost - self.count(self.TRUNCATION_MARKER + "\n")
+            if room >= self.MIN_TRUNCATED_TOKENS:
+                cut = PackItem(
+                    item.section,
+                    self.encoder.decode(self.tokens(item.text)[:room]) + self.TRUNCATION_MARKER,
+                    item.priority, item.order, item.position
+                )
+                admitted.append(cut)
+                opened.add(item.section)
+                missed.pop(0)
+                truncated = 1
+
+        # Per-item counts can differ slightly from the joined text at merge boundaries;
+        # the final count is authoritative, shed lowest-priority items until it fits.
+        text = self._render(admitted, section_order)
+        tokens = len(self.encoder.encode(text))
+        while tokens > budget and admitted:
+            shed = admitted.pop()
+            if shed.text.endswith(self.TRUNCATION_MARKER):
+                truncated = 0
+            missed.append(shed)
+            text = self._render(admitted, section_order)
+            tokens = len(self.encoder.encode(text))
+
+        included: Dict[str, int] = {}
+        for item in admitted:
+            included[item.section] = included.get(item.section, 0) + 1
+        dropped: Dict[str, int] = {}
+        for item in missed:
+            dropped[item.section] = dropped.get(item.section, 0) + 1
+        if missed:
+            logger.debug(f"Memory pack dropped {len(missed)} items ({dropped}) to fit {budget} tokens")
+        return PackResult(text, tokens, budget, included, dropped, truncated)
+
+    def _render(self, admitted: List[PackItem], section_order: Sequence[str]) -> str:
+        blocks = []
+        for section in section_order:
+            lines = sorted((item for item in admitted if item.section == section), key=lambda item: item.position)
+            if lines:
+                blocks.append("\n".join([f"[{section}]"] + [item.text for item in lines]))
+        return "\n\n".join(blocks)
@@ -1,5 +1,3 @@
-import http.server
-from prometheus_client import start_http_server, Counter, Gauge, Histogram
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,6 +10,8 @@ class PrometheusExporter:
     
     def __init__(self, port: int = 8000):
         self.port = port
+        # prometheus_client is only needed once an exporter is actually created
+        from prometheus_client import Counter, Gauge, Histogram
         # Define Prometheus Metrics
         self.turn_latency = Histogram('nexus_turn_latency_ms', 'Latency of turn processing in ms')
         self.tokens_used = Counter('nexus_tokens_total', 'Total tokens consumed', ['task_type'])
@@ -22,6 +22,7 @@ class PrometheusExporter:
     def start(self):
         """Start the Prometheus metrics server"""
         try:
+            from prometheus_client import start_http_server
             start_http_server(self.port)
             logger.info(f"Prometheus metrics exported on port {self.port}")
         except Exception as e:
@@ -16,12 +16,25 @@ from ..synthidentity.consistency_validator import IdentityConsistencyValidator
 from ..synthidentity.snapshot import IdentitySnapshot, MINIMAL_SKELETON_IDENTITY
 from .coherence.state_tracker import MultiTurnCoherenceTracker
 from .coherence.contradiction_detector import ContradictionDetector
+from .coherence.post_checks import PostGenerationChecks
 from .observability.metrics import NexusMetrics, TurnMetrics
+from .post_turn import PostTurnPipeline
+from .turn_scheduler import TurnScheduler
+from ..synthmemory.sharding import ShardedMemory
 
 logger = logging.getLogger(__name__)
 
 class SynthCore:
-    def __init__(self, model_provider: NexusModelProvider, memory: SynthMemory, assembler: PromptAssembler):
+    def __init__(
+        self,
+        model_provider: NexusModelProvider,
+        memory: Optional[SynthMemory],
+        assembler: PromptAssembler,
+        post_turn: Optional[PostTurnPipeline] = None,
+        check_deadline_s: float = PostGenerationChecks.DEFAULT_DEADLINE_S,
+        shards: Optional[ShardedMemory] = None,
+        scheduler: Optional[TurnScheduler] = None
+    ):
         self.models = model_provider
         self.memory = memory
         self.assembler = assembler
@@ -31,11 +44,37 @@ class SynthCore:
         self.validator = IdentityConsistencyValidator(model_provider)
         self.state_tracker = MultiTurnCoherenceTracker(model_provider)
         self.contradiction_detector = ContradictionDetector(model_provider)
+        self.post_checks = PostGenerationChecks(self.contradiction_detector, self.state_tracker, deadline_s=check_deadline_s)
         self.metrics = NexusMetrics()
+        self.post_turn = post_turn or PostTurnPipeline()
+        # Sharded mode: each user's memory lives in its own files and `memory` may be None
+        self.shards = shards
+        # Turns for one user run one at a time in arrival order; different users run in parallel up to the cap
+        self.scheduler = scheduler or TurnScheduler()
+
+    async def _acquire_memory(self, user_id: str) -> SynthMemory:
+        return await self.shards.acquire(user_id) if self.shards is not None else self.memory
+
+    async def _release_memory(self, user_id: str):
+        if self.shards is not None:
+            await self.shards.release(user_id)
 
     async def orchestrate_turn(self, user_id: str, session_id: str, user_text: str) -> Dict[str, Any]:
+        return await self.scheduler.run(user_id, lambda: self._run_turn(user_id, session_id, user_text))
+
+    async def _run_turn(self, user_id: str, session_id: str, user_text: str) -> Dict[str, Any]:
+        memory = await self._acquire_memory(user_id)
+        try:
+            return await self._orchestrate_turn(memory, user_id, session_id, user_text)
+        finally:
+            await self._release_memory(user_id)
+
+    async def _orchestrate_turn(self, memory: SynthMemory, user_id: str, session_id: str, user_text: str) -> Dict[str, Any]:
         start_time = time.time()
         turn_id = str(uuid.uuid4())
+
+        # 0. Previous turn's post-turn work must land before drift/contradiction checks read state
+        await self.post_turn.wait_for_user(user_id)
         
         # 1. State Initialization
         identity = await self._load_identity(user_id)
@@ -47,7 +86,7 @@ class SynthCore:
         budget = TokenBudget(available_input=allocations['response'])
         
         # 3. Execution
-        memory_context = await self.memory.retrieve_memory_for_turn(user_text, allocations['memory_context'])
+        memory_context = await memory.retrieve_memory_for_turn(user_text, allocations['memory_context'])
         system_prompt = "Act as the kernel defined in IDENTITY SNAPSHOT."
         modulated_system = await self.synth_mood.modulate_response_prompt(system_prompt, mood)
 
@@ -55,33 +94,55 @@ class SynthCore:
             SectionSpec("system", modulated_system, priority=1, degradable=False),
             SectionSpec("identity", identity.to_prompt(), priority=1, degradable=False),
             SectionSpec("memory", memory_context, priority=2),
-            SectionSpec("request", user_text, priority=1)
+            SectionSpec("request", user_text, priority=1, degradable=False)
         ], budget)
 
         primary_model = self.models.get_model_for_task('primary_reasoning')
         response = await primary_model.call(prompt)
         response_text = response.text if hasattr(response, 'text') else str(response)
 
-        # 4. Roadmap Post-Check Contradictions (2C.4)
-        report = await self.contradiction_detector.detect_all_contradictions(
-            response_text, self.state_tracker.state_history, self.memory.semantic
-        )
+        # 4. Roadmap Post-Checks (2C.4): contradictions, invariants and drift run concurrently
+        checks = await self.post_checks.run(user_id, response_text, identity, memory.semantic)
+        report = checks.contradictions
+        inv_report = checks.invariants
+        drift_report = checks.drift
+        if checks.skipped:
+            logger.warning(f"Post-checks degraded: {checks.skipped}")
 
         if report.severity == "error":
             logger.warning("Critical contradictions detected, regenerating...")
             response_text = await self._regenerate_response_with_constraints(user_text, report, identity, mood, budget)
+            # 5. Invariants must hold for the text we actually return
+            inv_report = await self.post_checks.check_invariants(response_text, identity)
 
-        # 5. Invariant Checks & Drift
-        inv_report = await self.state_tracker.check_invariants(response_text, identity)
-        drift_report = await self.state_tracker.detect_drift()
         if drift_report.drift_detected:
              logger.warning(f"Identity drift detected: {drift_report.reason}")
 
-        # 6. Persistence
-        await self.memory.store_turn_memory(turn_id, user_text, response_text, identity.to_dict(), mood.to_dict(), {})
-        await self.state_tracker.snapshot_after_turn(turn_id, datetime.now(), identity, mood, self.memory, response_text)
+        # 6. Persistence (off the response path); the job holds its own pin on the shard
+        job_memory = await self._acquire_memory(user_id)
+
+        async def persist():
+            try:
+                await self._persist_turn(job_memory, user_id, turn_id, user_text, response_text, identity, mood)
+            finally:
+                await self._release_memory(user_id)
+
+        await self.post_turn.submit(user_id, persist, name=f"turn:{turn_id}")
+
+        return {"response": response_text, "turn_id": turn_id, "drift": drift_report.drift_detected, "skipped_checks": checks.skipped}
+
+    async def _persist_turn(self, memory, user_id, turn_id, user_text, response_text, identity, mood):
+        await memory.store_turn_memory(turn_id, user_text, response_text, identity.to_dict(), mood.to_dict(), {})
+        await self.state_tracker.snapshot_after_turn(user_id, turn_id, datetime.now(), identity, mood, memory, response_text)
 
-        return {"response": response_text, "turn_id": turn_id, "drift": drift_report.drift_detected}
+    async def shutdown(self, timeout: Optional[float] = 10.0):
+        """Finish queued turns, drain pending post-turn work and commit queued memory writes before the process exits."""
+        await self.scheduler.shutdown(timeout)
+        await self.post_turn.shutdown(timeout)
+        if self.memory:
+            await self.memory.flush()
+        if self.shards is not None:
+            await self.shards.shutdown()
 
     async def _regenerate_response_with_constraints(self, original_request, report, identity, mood, budget) -> str:
         """Roadmap Logic: Regenerate response if contradictions detected"""
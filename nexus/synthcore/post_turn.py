@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PostTurnJob = Callable[[], Awaitable[Any]]
+
+@dataclass
+class PostTurnStats:
+    """Counters and recent enqueue-to-start lag samples for the post-turn queue."""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    dropped: int = 0  # still queued when shutdown gave up draining
+    backpressure_waits: int = 0
+    lag_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=512))
+
+class PostTurnPipeline:
+    """
+    Background queue for work that does not affect the response text
+    (claim extraction, state snapshots, episodic persistence, metrics).
+
+    Users are hashed onto a fixed set of lanes; each lane is a bounded queue
+    drained by a single worker, so jobs for one user run strictly in
+    submission order. A full lane blocks the submitter (backpressure).
+    """
+    def __init__(self, lanes: int = 4, max_pending: int = 256):
+        if lanes < 1:
+            raise ValueError("PostTurnPipeline requires at least one lane")
+        self.lanes = lanes
+        self.max_pending = max_pending
+        self._queues: List[asyncio.Queue] = [
+            asyncio.Queue(maxsize=max(1, max_pending // lanes)) for _ in range(lanes)
+        ]
+        self._workers: List[asyncio.Task] = []
+        self._last_job: Dict[str, asyncio.Future] = {}
+        self._closed = False
+        self.stats = PostTurnStats()
+
+    def _lane_for(self, user_id: str) -> asyncio.Queue:
+        return self._queues[zlib.crc32(user_id.encode("utf-8")) % self.lanes]
+
+    def _ensure_workers(self):
+        if self._workers:
+            return
+        loop = asyncio.get_running_loop()
+        self._workers = [loop.create_task(self._worker(q)) for q in self._queues]
+
+    async def submit(self, user_id: str, job: PostTurnJob, name: str = "post_turn"):
+        """
+        Enqueue a job for `user_id`. Returns once the job is queued, not once it ran.
+        Waits while the user's lane is full.
+        """
+        if self._closed:
+            raise RuntimeError("PostTurnPipeline is shut down")
+        self._ensure_workers()
+
+        queue = self._lane_for(user_id)
+        done = asyncio.get_running_loop().create_future()
+        item = (job, user_id, name, time.perf_counter(), done)
+
+        self._last_job[user_id] = done
+        self.stats.submitted += 1
+
+        if queue.full():
+            self.stats.backpressure_waits += 1
+            logger.warning(f"Post-turn lane full ({queue.qsize()} pending), applying backpressure to {user_id}")
+        await queue.put(item)
+        if self._closed and not self._workers:
+            # Was waiting on a full lane while shutdown stopped the workers
+            self._drop_queued()
+
+    async def wait_for_user(self, user_id: str):
+        """Wait until every job submitted so far for `user_id` has finished."""
+        done = self._last_job.get(user_id)
+        if done is not None and not done.done():
+            await asyncio.shield(done)
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            job, user_id, name, enqueued_at, done = await queue.get()
+            self.stats.lag_ms.append((time.perf_counter() - enqueued_at) * 1000)
+            try:
+                await job()
+                self.stats.completed += 1
+            except Exception as e:
+                self.stats.failed += 1
+                logger.error(f"Post-turn job '{name}' failed for {user_id}: {e}")
+            finally:
+                if not done.done():
+                    done.set_result(None)
+                if self._last_job.get(user_id) is done:
+                    del self._last_job[user_id]
+                queue.task_done()
+
+    def pending(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wait until every queued job has been processed."""
+        if not self._workers:
+            return
+        await asyncio.wait_for(asyncio.gather(*(q.join() for q in self._queues)), timeout)
+
+    async def shutdown(self, timeout: Optional[float] = 10.0):
+        """
+        Stop accepting jobs, drain what is queued, then stop the workers. Jobs
+        still queued after `timeout` are dropped and their waiters released.
+        """
+        self._closed = True
+        try:
+            await self.drain(timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Post-turn drain timed out after {timeout}s; {self.pending()} jobs dropped")
+        finally:
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+            self._drop_queued()
+
+    def _drop_queued(self):
+        """Discard jobs no worker will run, releasing anyone in wait_for_user."""
+        for queue in self._queues:
+            while not queue.empty():
+                _, _, _, _, done = queue.get_nowait()
+                queue.task_done()
+                self.stats.dropped += 1
+                if not done.done():
+                    done.set_result(None)
+        for done in self._last_job.values():
+            if not done.done():
+                done.set_result(None)
+        self._last_job.clear()
+
+    def report(self) -> Dict[str, Any]:
+        lags = sorted(self.stats.lag_ms)
+        return {
+            "pending": self.pending(),
+            "capacity": sum(q.maxsize for q in self._queues),
+            "submitted": self.stats.submitted,
+            "completed": self.stats.completed,
+            "failed": self.stats.failed,
+            "dropped": self.stats.dropped,
+            "backpressure_waits": self.stats.backpressure_waits,
+            "lag_avg_ms": (sum(lags) / len(lags)) if lags else 0.0,
+            "lag_p95_ms": lags[int(0.95 * (len(lags) - 1))] if lags else 0.0,
+            "lag_max_ms": lags[-1] if lags else 0.0,
+        }
@@ -1,7 +1,10 @@
-import tiktoken
+import logging
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from .token_budget import TokenBudget
+from ..tokenizers import encoder_for
+
+logger = logging.getLogger(__name__)
 
 @dataclass
 class SectionSpec:
@@ -12,16 +15,58 @@ class SectionSpec:
     min_tokens_reserved: Optional[int] = None
     display_title: str = ""
 
+@dataclass
+class SectionPlan:
+    """How one section was placed: cost is the full formatted section, granted what it got."""
+    name: str
+    header: str
+    priority: int
+    cost: int
+    cap: int
+    reserved: int = 0
+    granted: int = 0
+    status: str = "pending"  # full | truncated | omitted | forced
+    text: str = field(default="", repr=False)
+    content_ids: List[int] = field(default_factory=list, repr=False)
+
+@dataclass
+class AssemblyPlan:
+    available: int
+    sections: List[SectionPlan]
+
+    @property
+    def used(self) -> int:
+        return sum(s.granted for s in self.sections)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.used > self.available
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "available": self.available,
+            "used": self.used,
+            "over_budget": self.over_budget,
+            "sections": {
+                s.name: {"status": s.status, "cost": s.cost, "reserved": s.reserved, "granted": s.granted}
+                for s in self.sections
+            }
+        }
+
 class PromptAssembler:
     """
     Assembles the strict 5-section Nexus prompt template.
     Ensures deterministic output and budget enforcement.
     """
+    TRUNCATION_MARKER = " [...]"
+    # A degradable section truncated below this much content is omitted instead
+    MIN_TRUNCATED_TOKENS = 16
+
     def __init__(self, model_name: str = "gpt-4-turbo"):
-        try:
-            self.encoder = tiktoken.encoding_for_model(model_name)
-        except KeyError:
-            self.encoder = tiktoken.get_encoding("cl100k_base")
+        self.model_name = model_name
+        self.encoder = encoder_for(model_name)
+        self._overhead: Dict[str, int] = {}
+        self.last_plan: Optional[AssemblyPlan] = None
 
     def count_tokens(self, text: str) -> int:
         return len(self.encoder.encode(text))
@@ -30,35 +75,117 @@ class PromptAssembler:
         """Canonical Nexus section delimiter."""
         return f"---\n## {header}\n{content}\n"
 
+    def _wrapper_tokens(self, header: str) -> int:
+        overhead = self._overhead.get(header)
+        if overhead is None:
+            overhead = self._overhead[header] = self.count_tokens(self.format_section(header, ""))
+        return overhead
+
+    def plan(self, sections: List[SectionSpec], budget: TokenBudget) -> AssemblyPlan:
+        """
+        Decides every allocation before anything is rendered. Each section's
+        content is tokenized once. Reserved minimums are granted first (the
+        whole section for non-degradable ones), in priority order; the remaining
+        tokens then go to sections by priority, each up to its full cost and its
+        budget cap. A degradable section granted less than its cost is cut on a
+        token boundary, or omitted if too little is left to be useful.
+        Non-degradable sections are always placed in full; if they alone exceed
+        the window the plan is marked over_budget for the orchestrator to handle.
+        """
+        available = budget.remaining()
+        plans: List[SectionPlan] = []
+        for spec in sections:
+            header = spec.display_title or spec.name.upper()
+            content_ids = self.encoder.encode(spec.content)
+            cost = self._wrapper_tokens(header) + len(content_ids)
+            plans.append(SectionPlan(
+                name=spec.name.lower(),
+                header=header,
+                priority=spec.priority,
+                cost=cost,
+                cap=budget.cap_for(spec.name.lower()),
+                content_ids=content_ids
+            ))
+        # Stable: equal priorities keep template order
+        by_priority = sorted(zip(sections, plans), key=lambda pair: pair[0].priority)
+
+        # 1. Reservations
+        left = available
+        for spec, plan in by_priority:
+            if not spec.degradable:
+                plan.reserved = plan.cost
+                plan.status = "full"
+            elif spec.min_tokens_reserved:
+                plan.reserved = min(spec.min_tokens_reserved, plan.cost, plan.cap, max(left, 0))
+            plan.granted = plan.reserved
+            left -= plan.reserved
+        if left < 0:
+            logger.warning(f"Non-degradable sections need {available - left} tokens, {available} available")
+
+        # 2. Remaining tokens by priority
+        for spec, plan in by_priority:
+            if not spec.degradable or left <= 0:
+                continue
+            extra = min(plan.cost, plan.cap) - plan.granted
+            if extra > 0:
+                grant = min(extra, left)
+                plan.granted += grant
+                left -= grant
+
+        # 3. Decide how each degradable section is rendered with what it was granted
+        for spec, plan in zip(sections, plans):
+            if not spec.degradable:
+                plan.text = self.format_section(plan.header, spec.content)
+                if left < 0:
+                    plan.status = "forced"
+                continue
+            if plan.granted >= plan.cost:
+                plan.status = "full"
+                plan.text = self.format_section(plan.header, spec.content)
+                continue
+            room = plan.granted - self._wrapper_tokens(plan.header) - self.count_tokens(self.TRUNCATION_MARKER)
+            if room >= self.MIN_TRUNCATED_TOKENS:
+                plan.status = "truncated"
+                plan.text = self.format_section(
+                    plan.header, self.encoder.decode(plan.content_ids[:room]) + self.TRUNCATION_MARKER
+                )
+            else:
+                # Tokens too few to be useful go back to the pool for the omission stub
+                plan.status = "omitted"
+                left += plan.granted
+                plan.granted = 0
+
+        for spec, plan in zip(sections, plans):
+            if plan.status != "omitted":
+                continue
+            stub = self.format_section(plan.header, f"[{plan.header} omitted due to budget constraints]")
+            stub_tokens = self.count_tokens(stub)
+            if stub_tokens <= left:
+                plan.text = stub
+                plan.granted = stub_tokens
+                left -= stub_tokens
+
+        return AssemblyPlan(available=available, sections=plans)
+
+    def render(self, plan: AssemblyPlan, budget: TokenBudget) -> str:
+        """Commits a plan's grants to the budget and joins the placed sections in template order."""
+        for section in plan.sections:
+            if section.granted:
+                budget.record(section.name, section.granted)
+        degraded = {s.name: s.status for s in plan.sections if s.status in ("truncated", "omitted", "forced")}
+        if degraded:
+            logger.info(f"Prompt assembly degraded sections: {degraded} ({plan.used}/{plan.available} tokens)")
+        return "\n".join(s.text for s in plan.sections if s.text)
+
     def assemble(
-        self, 
-        sections: List[SectionSpec], 
+        self,
+        sections: List[SectionSpec],
         budget: TokenBudget
     ) -> str:
         """
         Assembles sections based on SectionSpec. Enforces hard caps and priorities.
+        The applied plan is kept on last_plan.
         """
-        final_parts = []
-        
-        # Standard sequence: SYSTEM, IDENTITY, MOOD, MEMORY, REQUEST
-        for spec in sections:
-            header = spec.name.upper()
-            display_header = spec.display_title or header
-            content = spec.content
-
-            # Check Hard Caps if defined in budget
-            # (Hard caps are handled inside budget.allocate in next refactor)
-            
-            formatted = self.format_section(display_header, content)
-            tokens = self.count_tokens(formatted)
-
-            if budget.allocate(spec.name.lower(), tokens):
-                final_parts.append(formatted)
-            elif not spec.degradable:
-                # Critical section failed budget - this is a fatal Orchestrator state
-                final_parts.append(formatted) # Force it, Orchestrator handles total window
-            else:
-                # Omit or use fallback
-                final_parts.append(self.format_section(display_header, f"[{display_header} omitted due to budget constraints]"))
-
-        return "\n".join(final_parts)
\ No newline at end of file
+        plan = self.plan(sections, budget)
+        self.last_plan = plan
+        return self.render(plan, budget)
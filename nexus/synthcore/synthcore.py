@@ -15,12 +15,25 @@ from ..synthmood.synthmood import SynthMood
 from ..synthidentity.snapshot import IdentitySnapshot, MINIMAL_SKELETON_IDENTITY
 from .coherence.state_tracker import MultiTurnCoherenceTracker
 from .coherence.contradiction_detector import ContradictionDetector
+from .coherence.post_checks import PostGenerationChecks
 from .observability.metrics import NexusMetrics, TurnMetrics
+from .post_turn import PostTurnPipeline
+from .turn_scheduler import TurnScheduler
+from ..synthmemory.sharding import ShardedMemory
 
 logger = logging.getLogger(__name__)
 
 class SynthCore:
-    def __init__(self, model_provider: NexusModelProvider, memory: SynthMemory, assembler: PromptAssembler):
+    def __init__(
+        self,
+        model_provider: NexusModelProvider,
+        memory: Optional[SynthMemory],
+        assembler: PromptAssembler,
+        post_turn: Optional[PostTurnPipeline] = None,
+        check_deadline_s: float = PostGenerationChecks.DEFAULT_DEADLINE_S,
+        shards: Optional[ShardedMemory] = None,
+        scheduler: Optional[TurnScheduler] = None
+    ):
         self.models = model_provider
         self.memory = memory
         self.assembler = assembler
@@ -29,12 +42,38 @@ class SynthCore:
         self.budget_adjuster = MoodAwareTokenBudgeting()
         self.state_tracker = MultiTurnCoherenceTracker(model_provider)
         self.contradiction_detector = ContradictionDetector(model_provider)
+        self.post_checks = PostGenerationChecks(self.contradiction_detector, self.state_tracker, deadline_s=check_deadline_s)
         self.metrics = NexusMetrics()
+        self.post_turn = post_turn or PostTurnPipeline()
+        # Sharded mode: each user's memory lives in its own files and `memory` may be None
+        self.shards = shards
+        # Turns for one user run one at a time in arrival order; different users run in parallel up to the cap
+        self.scheduler = scheduler or TurnScheduler()
+
+    async def _acquire_memory(self, user_id: str) -> SynthMemory:
+        return await self.shards.acquire(user_id) if self.shards is not None else self.memory
+
+    async def _release_memory(self, user_id: str):
+        if self.shards is not None:
+            await self.shards.release(user_id)
 
     async def orchestrate_turn(self, request: TurnRequest) -> TurnResponse:
+        return await self.scheduler.run(request.user_id, lambda: self._run_turn(request))
+
+    async def _run_turn(self, request: TurnRequest) -> TurnResponse:
+        memory = await self._acquire_memory(request.user_id)
+        try:
+            return await self._orchestrate_turn(memory, request)
+        finally:
+            await self._release_memory(request.user_id)
+
+    async def _orchestrate_turn(self, memory: SynthMemory, request: TurnRequest) -> TurnResponse:
         start_time = time.time()
         turn_id = str(uuid.uuid4())
 
+        # 0. Previous turn's post-turn work must land before we read state
+        await self.post_turn.wait_for_user(request.user_id)
+
         # 1. Load context
         identity = await self._load_identity(request.user_id)
         raw_mood = await self._load_mood(request.user_id)
@@ -43,7 +82,7 @@ class SynthCore:
         # 2. Budget and Memory
         allocations = await self.budget_adjuster.allocate_tokens(mood, 4000)
         budget = TokenBudget(available_input=allocations['response'])
-        memory_context = await self.memory.retrieve_memory_for_turn(request.user_input, allocations['memory_context'])
+        memory_context = await memory.retrieve_memory_for_turn(request.user_input, allocations['memory_context'])
 
         # 3. Assemble Prompt
         modulated_system = await self.synth_mood.modulate_response_prompt("Act as defined in IDENTITY SNAPSHOT.", mood)
@@ -51,7 +90,7 @@ class SynthCore:
             SectionSpec("system", modulated_system, priority=1, degradable=False),
             SectionSpec("identity", identity.to_prompt(), priority=1),
             SectionSpec("memory", memory_context, priority=2),
-            SectionSpec("request", request.user_input, priority=1)
+            SectionSpec("request", request.user_input, priority=1, degradable=False)
         ], budget)
 
         # 4. Execute Primary Reasoning
@@ -70,21 +109,52 @@ class SynthCore:
             token_usage=TokenUsage(total_tokens=budget.used)
         )
 
-        # 6. Post-Check Protocols
-        report = await self.contradiction_detector.detect_all_contradictions(response_text, self.state_tracker.state_history, self.memory.semantic)
+        # 6. Post-Check Protocols: contradictions, invariants and drift run concurrently under a deadline
+        checks = await self.post_checks.run(request.user_id, response_text, identity, memory.semantic)
+        report = checks.contradictions
+        invariants = checks.invariants
+        if checks.skipped:
+            logger.warning(f"Post-checks degraded: {checks.skipped}")
         if report.severity == "error":
             logger.warning("Critical Coherence Failure. Regenerating...")
             response_text = await self._regenerate_response_with_constraints(request, report)
+            # Invariants must hold for the text we actually return
+            invariants = await self.post_checks.check_invariants(response_text, identity)
+        if invariants.violations:
+            logger.warning(f"Invariant violations: {[v.invariant_id for v in invariants.violations]}")
+        if checks.drift.drift_detected:
+            logger.warning(f"Identity drift detected: {checks.drift.reason}")
 
-        # 7. Final State Operations
-        await self.state_tracker.snapshot_after_turn(turn_id, current_turn.timestamp, identity, mood, self.memory, response_text)
-        await self.memory.store_turn_memory(current_turn.id, current_turn.user_input, current_turn.response, current_turn.identity_snapshot.to_dict(), current_turn.mood_state.to_dict(), current_turn.token_usage.to_dict())
-
-        # 8. Metrics
+        # 7. Final state operations and metrics run off the response path
         total_latency = (time.time() - start_time) * 1000
-        await self.metrics.record_turn(TurnMetrics(latency_ms=total_latency, tokens_used=budget.used, contradiction_count=len(report.intra_turn_contradictions), model_used=client.name if hasattr(client, 'name') else 'unknown'))
+        turn_metrics = TurnMetrics(latency_ms=total_latency, tokens_used=budget.used, contradiction_count=len(report.intra_turn_contradictions), model_used=client.name if hasattr(client, 'name') else 'unknown')
+        # The job holds its own pin on the user's shard
+        job_memory = await self._acquire_memory(request.user_id)
+
+        async def finalize():
+            try:
+                await self._finalize_turn(job_memory, request.user_id, current_turn, response_text, turn_metrics)
+            finally:
+                await self._release_memory(request.user_id)
+
+        await self.post_turn.submit(request.user_id, finalize, name=f"turn:{turn_id}")
+
+        return TurnResponse(text=response_text, metadata={"turn_id": turn_id, "drift": checks.drift.drift_detected, "skipped_checks": checks.skipped})
+
+    async def _finalize_turn(self, memory: SynthMemory, user_id: str, turn: Turn, response_text: str, turn_metrics: TurnMetrics):
+        """Post-turn pipeline job: claim extraction + snapshot, episodic write, metrics."""
+        await self.state_tracker.snapshot_after_turn(user_id, turn.id, turn.timestamp, turn.identity_snapshot, turn.mood_state, memory, response_text)
+        await memory.store_turn_memory(turn.id, turn.user_input, turn.response, turn.identity_snapshot.to_dict(), turn.mood_state.to_dict(), turn.token_usage.to_dict())
+        await self.metrics.record_turn(turn_metrics)
 
-        return TurnResponse(text=response_text, metadata={"turn_id": turn_id})
+    async def shutdown(self, timeout: Optional[float] = 10.0):
+        """Finish queued turns, drain pending post-turn work and commit queued memory writes before the process exits."""
+        await self.scheduler.shutdown(timeout)
+        await self.post_turn.shutdown(timeout)
+        if self.memory:
+            await self.memory.flush()
+        if self.shards is not None:
+            await self.shards.shutdown()
 
     async def _regenerate_response_with_constraints(self, request, report) -> str:
         prompt = f"Fix your response to be consistent with your identity. Request: {request.user_input}"
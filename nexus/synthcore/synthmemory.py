@@ -1,11 +1,15 @@
+import asyncio
 import logging
 import json
 from typing import List, Optional, Dict
 from datetime import datetime
 from .model_provider import NexusModelProvider
+from .memory_packer import MemoryPacker, PackItem, PackResult
 from ..synthmemory.episodic_store import EpisodicStore, EpisodicMemory
 from ..synthmemory.semantic_store import SemanticStore, SemanticFact
 from ..synthmemory.semantic_consolidation import SemanticConsolidationEngine
+from ..synthmemory.sharding import ShardedMemory
+from ..embeddings import EmbeddingService
 
 logger = logging.getLogger(__name__)
 
@@ -19,41 +23,70 @@ class SynthMemory:
         self, 
         model_provider: NexusModelProvider,
         episodic_store: Optional[EpisodicStore] = None,
-        semantic_store: Optional[SemanticStore] = None
+        semantic_store: Optional[SemanticStore] = None,
+        packer: Optional[MemoryPacker] = None,
+        embeddings: Optional[EmbeddingService] = None
     ):
         self.models = model_provider
         self.episodic = episodic_store or EpisodicStore()
         self.semantic = semantic_store or SemanticStore()
+        self.packer = packer or MemoryPacker()
+        # Optional: without it retrieval stays lexical unless callers pass query_embedding.
+        # Keep one model per store: the vector index rejects a change of dimension.
+        self.embeddings = embeddings
+        self.last_pack: Optional[PackResult] = None
         self.consolidation = SemanticConsolidationEngine(model_provider, self.episodic, self.semantic)
 
     async def retrieve_memory_for_turn(
         self, 
         user_input: str, 
-        token_budget: int
+        token_budget: int,
+        query_embedding: Optional[List[float]] = None
     ) -> str:
         """
         Context Retrieval Pipeline:
         1. Recent episodic (hot context)
-        2. Relevant semantic (long-term facts)
+        2. Relevant semantic (long-term facts, hybrid lexical+vector when an embedding is given)
         3. Formatted and truncated to budget
         """
-        recent_episodes = await self.episodic.retrieve_range(hours=24)
-        semantic_facts = await self.semantic.retrieve_relevant_facts(user_input, limit=10)
+        if query_embedding is None and self.embeddings is not None:
+            try:
+                query_embedding = await self.embeddings.embed(user_input)
+            except Exception as e:
+                logger.warning(f"Query embedding failed, semantic retrieval stays lexical: {e}")
+        recent_episodes = await self.episodic.retrieve_range(hours=24, limit=5)
+        semantic_facts = await self.semantic.retrieve_relevant_facts(user_input, limit=10, query_embedding=query_embedding)
         return await self._pack_memory(recent_episodes, semantic_facts, token_budget)
 
     async def _pack_memory(self, episodes: List[EpisodicMemory], facts: List[SemanticFact], budget: int) -> str:
-        sections = ["[RELEVANT FACTS]"]
-        for f in facts:
-            sections.append(f"- {f.subject} {f.predicate} {f.object} (confidence: {f.confidence:.2f})")
-            
-        sections.append("\n[RECENT HISTORY]")
-        for m in reversed(episodes[:5]):
-            sections.append(f"User: {m.user_input}\nAssistant: {m.assistant_response}")
+        """
+        Token-exact packing. Admission order: the latest exchange, then facts by
+        retrieval rank, then older history newest-first. Facts render in rank
+        order and history chronologically.
+        """
+        items = []
+        for rank, f in enumerate(facts):
+            items.append(PackItem(
+                "RELEVANT FACTS",
+                f"- {f.subject} {f.predicate} {f.object} (confidence: {f.confidence:.2f})",
+                priority=1, order=rank, position=rank
+            ))
+        # episodes arrive newest first
+        for age, m in enumerate(episodes):
+            items.append(PackItem(
+                "RECENT HISTORY",
+                f"User: {m.user_input}\nAssistant: {m.assistant_response}",
+                priority=0 if age == 0 else 2, order=age, position=-age
+            ))
 
-        combined = "\n".join(sections)
-        if len(combined) > budget * 4:
-            combined = combined[:budget * 4] + "... [Context Truncated]"
-        return combined
+        result = self.packer.pack(items, budget, ["RELEVANT FACTS", "RECENT HISTORY"])
+        if result.dropped_total or result.truncated:
+            logger.info(
+                f"Memory context packed to {result.tokens}/{budget} tokens: "
+                f"dropped {result.dropped}, truncated {result.truncated}"
+            )
+        self.last_pack = result
+        return result.text
 
     async def store_turn_memory(
         self, 
@@ -75,5 +108,51 @@ class SynthMemory:
         )
         await self.episodic.store(memory)
 
+    async def store_facts(self, facts: List[SemanticFact]):
+        """Store facts, embedding those without a vector when an embedding service is configured."""
+        missing = [f for f in facts if f.embedding is None]
+        if missing and self.embeddings is not None:
+            vectors = await self.embeddings.embed_many([f"{f.subject} {f.predicate} {f.object}" for f in missing])
+            for fact, vector in zip(missing, vectors):
+                fact.embedding = vector
+        return await self.semantic.store_facts(facts)
+
+    async def flush(self):
+        """Wait for write-behind episodic writes to be committed."""
+        await self.episodic.flush()
+
+    async def close(self):
+        """Commit queued writes, persist the vector index and close both stores."""
+        await asyncio.to_thread(self.episodic.close)
+        await asyncio.to_thread(self.semantic.close)
+
+    @classmethod
+    def sharded(
+        cls,
+        model_provider: NexusModelProvider,
+        root: str,
+        buckets: Optional[int] = None,
+        max_open: int = 64,
+        packer: Optional[MemoryPacker] = None,
+        embeddings: Optional[EmbeddingService] = None
+    ) -> ShardedMemory:
+        """Per-user SynthMemory instances under `root`, opened on demand (see ShardedMemory)."""
+        packer = packer or MemoryPacker()
+        return ShardedMemory(
+            root,
+            lambda episodic_path, semantic_path: cls(
+                model_provider, EpisodicStore(episodic_path), SemanticStore(semantic_path), packer, embeddings
+            ),
+            buckets=buckets,
+            max_open=max_open
+        )
+
+    async def reconcile_counts(self) -> Dict[str, bool]:
+        """Maintenance check: verify (and repair) the trigger-maintained row counts."""
+        episodic = await self.episodic.reconcile_count()
+        semantic = await self.semantic.reconcile_count()
+        return {"episodic": episodic[0] == episodic[1], "semantic": semantic[0] == semantic[1]}
+
     async def trigger_consolidation(self):
+        await self.reconcile_counts()
         return await self.consolidation.consolidate_nightly()
@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -21,17 +21,21 @@ class TokenBudget:
         total_context: int = 128000, 
         reserved_output: int = 8000, 
         safety_buffer_percent: float = 0.85,
-        component_caps: Dict[str, int] = None
+        component_caps: Dict[str, int] = None,
+        available_input: Optional[int] = None
     ):
         self.total_context = total_context
-        self.available_input = int(total_context * safety_buffer_percent) - reserved_output
+        # An explicit input window (e.g. from MoodAwareTokenBudgeting) overrides the derived one
+        if available_input is None:
+            available_input = int(total_context * safety_buffer_percent) - reserved_output
+        self.available_input = available_input
         self.used = 0
         self.allocations: Dict[str, int] = {}
         self.caps = component_caps or self.DEFAULT_CAPS
 
     def allocate(self, component: str, token_count: int) -> bool:
         # 1. Individual Cap Check
-        cap = self.caps.get(component, self.available_input)
+        cap = self.cap_for(component)
         if token_count > cap:
             logger.warning(f"Budget Cap Exceeded: {component} requested {token_count} (Cap: {cap})")
             return False
@@ -40,9 +44,19 @@ class TokenBudget:
         if self.used + token_count > self.available_input:
             return False
         
+        self.record(component, token_count)
+        return True
+
+    def record(self, component: str, token_count: int):
+        """Books tokens without checks; used by planned assembly, which enforces caps itself."""
         self.used += token_count
         self.allocations[component] = self.allocations.get(component, 0) + token_count
-        return True
+
+    def cap_for(self, component: str) -> int:
+        return self.caps.get(component, self.available_input)
+
+    def remaining(self) -> int:
+        return self.available_input - self.used
 
     def report(self) -> Dict[str, Any]:
         return {
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+TurnJob = Callable[[], Awaitable[Any]]
+
+@dataclass
+class TurnSchedulerStats:
+    """Counters and recent mailbox wait samples (enqueue to start, cap wait included)."""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    actors_started: int = 0
+    actors_evicted: int = 0
+    max_running: int = 0
+    wait_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=512))
+
+@dataclass
+class _Actor:
+    mailbox: asyncio.Queue
+    task: Optional[asyncio.Task] = None
+
+class TurnScheduler:
+    """
+    Per-user actors for turn processing.
+
+    Each user gets a mailbox drained by one actor task, so that user's turns
+    run one at a time in submission order and never race on mood, coherence
+    state or episodic writes. Actors of different users run in parallel, with
+    at most `max_concurrent` turns in flight overall. An actor whose mailbox
+    stays empty for `idle_timeout_s` exits and is dropped; the next turn for
+    that user starts a fresh one. A full mailbox blocks the submitter
+    (backpressure).
+    """
+    def __init__(self, max_concurrent: int = 16, idle_timeout_s: float = 60.0, mailbox_size: int = 8):
+        if max_concurrent < 1:
+            raise ValueError("TurnScheduler requires max_concurrent >= 1")
+        self.max_concurrent = max_concurrent
+        self.idle_timeout_s = idle_timeout_s
+        self.mailbox_size = mailbox_size
+        self._actors: Dict[str, _Actor] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._running = 0
+        self._closed = False
+        self._stopping = False
+        self.stats = TurnSchedulerStats()
+
+    async def run(self, user_id: str, job: TurnJob, name: str = "turn") -> Any:
+        """
+        Queue `job` on the user's actor and wait for its result. Cancelling the
+        caller before the job starts withdraws it; a job already running is
+        left to finish so the user's state stays consistent.
+        """
+        if self._closed:
+            raise RuntimeError("TurnScheduler is shut down")
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+
+        actor = self._actors.get(user_id)
+        if actor is None:
+            actor = _Actor(asyncio.Queue(maxsize=self.mailbox_size))
+            self._actors[user_id] = actor
+            actor.task = asyncio.get_running_loop().create_task(self._actor(user_id, actor))
+            self.stats.actors_started += 1
+
+        result = asyncio.get_running_loop().create_future()
+        self.stats.submitted += 1
+        if actor.mailbox.full():
+            logger.warning(f"Turn mailbox full for {user_id} ({actor.mailbox.qsize()} queued), applying backpressure")
+        await actor.mailbox.put((job, name, time.perf_counter(), result))
+        return await result
+
+    async def _actor(self, user_id: str, actor: _Actor):
+        try:
+            while True:
+                try:
+                    job, name, enqueued_at, result = await asyncio.wait_for(actor.mailbox.get(), self.idle_timeout_s)
+                except asyncio.TimeoutError:
+                    if actor.mailbox.empty():
+                        break
+                    continue
+                try:
+                    if result.cancelled():
+                        self.stats.cancelled += 1
+                        continue
+                    async with self._slots:
+                        if result.cancelled():
+                            self.stats.cancelled += 1
+                            continue
+                        self.stats.wait_ms.append((time.perf_counter() - enqueued_at) * 1000)
+                        self._running += 1
+                        self.stats.max_running = max(self.stats.max_running, self._running)
+                        try:
+                            value = await job()
+                        except asyncio.CancelledError as e:
+                            if self._actor_cancelled():
+                                if not result.done():
+                                    result.cancel()
+                                raise
+                            # The job itself was cancelled (e.g. it awaited a cancelled future): fail
+                            # this turn only and keep the actor and the user's queued turns alive
+                            self.stats.failed += 1
+                            logger.error(f"Turn '{name}' was cancelled inside its job for {user_id}")
+                            if not result.done():
+                                # Surfaced as an ordinary error so the caller does not mistake it for its own cancellation
+                                error = RuntimeError(f"Turn '{name}' for {user_id} was cancelled")
+                                error.__cause__ = e
+                                result.set_exception(error)
+                        except BaseException as e:
+                            self.stats.failed += 1
+                            logger.error(f"Turn '{name}' failed for {user_id}: {e}")
+                            if not result.done():
+                                result.set_exception(e)
+                            if not isinstance(e, Exception):
+                                raise
+                        else:
+                            self.stats.completed += 1
+                            if not result.done():
+                                result.set_result(value)
+                        finally:
+                            self._running -= 1
+                finally:
+                    # Unresolved only if the actor is being torn down while waiting for a slot
+                    if not result.done():
+                        result.cancel()
+                    actor.mailbox.task_done()
+        finally:
+            # Anything still queued (shutdown cancels the actor) must not hang its caller
+            while not actor.mailbox.empty():
+                _, _, _, result = actor.mailbox.get_nowait()
+                if not result.done():
+                    result.cancel()
+            if self._actors.get(user_id) is actor:
+                del self._actors[user_id]
+                if not self._closed:
+                    self.stats.actors_evicted += 1
+
+    def _actor_cancelled(self) -> bool:
+        """Whether the current actor task is being cancelled (shutdown or loop teardown), not just its job."""
+        if self._stopping:
+            return True
+        cancelling = getattr(asyncio.current_task(), "cancelling", None)  # Python 3.11+
+        return bool(cancelling and cancelling())
+
+    def running(self) -> int:
+        return self._running
+
+    def pending(self) -> int:
+        return sum(a.mailbox.qsize() for a in self._actors.values())
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wait until every queued turn has been processed."""
+        mailboxes = [a.mailbox.join() for a in self._actors.values()]
+        if mailboxes:
+            await asyncio.wait_for(asyncio.gather(*mailboxes), timeout)
+
+    async def shutdown(self, timeout: Optional[float] = 10.0):
+        """Stop accepting turns, let queued ones finish, then stop the actors."""
+        self._closed = True
+        try:
+            await self.drain(timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Turn drain timed out after {timeout}s; {self.pending()} turns cancelled")
+        finally:
+            self._stopping = True
+            tasks = [a.task for a in self._actors.values() if a.task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._actors.clear()
+
+    def report(self) -> Dict[str, Any]:
+        waits = sorted(self.stats.wait_ms)
+        return {
+            "actors": len(self._actors),
+            "running": self._running,
+            "pending": self.pending(),
+            "max_concurrent": self.max_concurrent,
+            "max_running": self.stats.max_running,
+            "submitted": self.stats.submitted,
+            "completed": self.stats.completed,
+            "failed": self.stats.failed,
+            "cancelled": self.stats.cancelled,
+            "actors_started": self.stats.actors_started,
+            "actors_evicted": self.stats.actors_evicted,
+            "wait_avg_ms": (sum(waits) / len(waits)) if waits else 0.0,
+            "wait_p95_ms": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+            "wait_max_ms": waits[-1] if waits else 0.0,
+        }
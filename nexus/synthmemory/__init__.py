@@ -1,11 +1,27 @@
-from .episodic_store import EpisodicStore, EpisodicMemory
-from .semantic_store import SemanticStore, SemanticFact
-from .semantic_consolidation import SemanticConsolidationEngine
-
-__all__ = [
-    "EpisodicStore",
-    "EpisodicMemory",
-    "SemanticStore",
-    "SemanticFact",
-    "SemanticConsolidationEngine",
-]
+import importlib
+
+# Exports resolve on first access, so importing one store does not load the
+# others (or numpy, via the vector index) as a side effect.
+_EXPORTS = {
+    "EpisodicStore": ".episodic_store",
+    "EpisodicMemory": ".episodic_store",
+    "SemanticStore": ".semantic_store",
+    "SemanticFact": ".semantic_store",
+    "SemanticConsolidationEngine": ".semantic_consolidation",
+    "VectorIndex": ".vector_index",
+    "ShardedMemory": ".sharding",
+    "ShardLayout": ".sharding",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,13 +1,20 @@
+import asyncio
+import hashlib
 import sqlite3
 import json
 import os
 import logging
-from datetime import datetime
+import zlib
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from ..synthcore.types import TokenUsage
 from ..synthidentity.snapshot import IdentitySnapshot
-from ..synthmood.mood import PADState
+from ..synthmood.mood import PADState, MoodState
+from .sqlite_writer import SQLiteWriter
+from .sqlite_pool import ReaderPool
+
+logger = logging.getLogger(__name__)
 
 @dataclass
 class EpisodicMemory:
@@ -24,54 +31,410 @@ class EpisodicMemory:
     concept_tags: List[str] = field(default_factory=list)
     contradiction_flags: List[str] = field(default_factory=list)
 
+def _as_dict(value) -> dict:
+    return value.to_dict() if hasattr(value, "to_dict") else value
+
+def to_epoch_us(ts: datetime) -> int:
+    """Sortable integer timestamp (UTC microseconds). Naive datetimes are local time."""
+    return int(ts.timestamp() * 1_000_000)
+
+def from_epoch_us(ts_us: int) -> datetime:
+    return datetime.fromtimestamp(ts_us / 1_000_000, tz=timezone.utc)
+
+def _token_count(data: dict, name: str) -> int:
+    """TokenUsage.to_dict() uses short keys ('prompt'); accept the field names too."""
+    return int(data.get(name, data.get(f"{name}_tokens", 0)) or 0)
+
 class EpisodicStore:
-    def __init__(self, db_path: str = "/home/novus/.config/pygpt-net/data/nexus_episodic.db"):
+    """
+    Turn-level memory. Writes go through a write-behind SQLiteWriter thread
+    (WAL mode, group commits), so store() never waits on an fsync; reads run
+    in parallel on a ReaderPool of read-only connections.
+
+    Rows are normalised: the identity snapshot is stored once per version in
+    episodic_identity and referenced by key, mood and token usage live in typed
+    columns, and turn text above `compress_min_bytes` is zlib-compressed (the
+    text columns hold TEXT or BLOB, decoded by type on read). The row count is
+    maintained by triggers in episodic_meta, so count() never scans the table.
+    """
+    SCHEMA_VERSION = 2
+    EPISODE_COLUMNS = """
+        turn_id TEXT PRIMARY KEY,
+        ts_us INTEGER NOT NULL,
+        user_input,
+        response,
+        identity_key TEXT,
+        mood_valence REAL,
+        mood_arousal REAL,
+        mood_dominance REAL,
+        mood_ts_us INTEGER,
+        prompt_tokens INTEGER,
+        completion_tokens INTEGER,
+        total_tokens INTEGER,
+        salience REAL,
+        valence REAL,
+        tags TEXT,
+        flags TEXT
+    """
+    INSERT_SQL = """
+        INSERT INTO episodic_memory
+        (turn_id, ts_us, user_input, response, identity_key,
+         mood_valence, mood_arousal, mood_dominance, mood_ts_us,
+         prompt_tokens, completion_tokens, total_tokens,
+         salience, valence, tags, flags)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    IDENTITY_SQL = "INSERT OR IGNORE INTO episodic_identity (identity_key, version, identity_json) VALUES (?, ?, ?)"
+    SELECT_COLUMNS = """
+        rowid, ts_us, turn_id, user_input, response, identity_key,
+        mood_valence, mood_arousal, mood_dominance, mood_ts_us,
+        prompt_tokens, completion_tokens, total_tokens,
+        salience, valence, tags, flags
+    """
+
+    def __init__(
+        self,
+        db_path: str = "/home/novus/.config/pygpt-net/data/nexus_episodic.db",
+        flush_interval: float = 0.05,
+        max_batch: int = 128,
+        synchronous: str = "NORMAL",
+        compress_min_bytes: Optional[int] = 1024,
+        readers: int = 4
+    ):
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.db = sqlite3.connect(db_path)
-        self._init_schema()
-
-    def _init_schema(self):
-        self.db.execute("""
-            CREATE TABLE IF NOT EXISTS episodic_memory (
-                turn_id TEXT PRIMARY KEY,
-                timestamp TEXT,
-                user_input TEXT,
-                response TEXT, 
-                identity_json TEXT,
-                mood_json TEXT,
-                token_json TEXT,
-                salience REAL,
-                valence REAL,
-                tags TEXT,
-                flags TEXT
-            )
+        self.compress_min_bytes = compress_min_bytes
+        self._identity_keys = set()
+        self._identity_cache: Dict[str, Any] = {}
+        conn = sqlite3.connect(db_path)
+        try:
+            self._init_schema(conn)
+        finally:
+            conn.close()
+        self.writer = SQLiteWriter(db_path, flush_interval=flush_interval, max_batch=max_batch, synchronous=synchronous)
+        self.readers = ReaderPool(db_path, size=readers)
+
+    def _init_schema(self, conn: sqlite3.Connection):
+        conn.execute("PRAGMA journal_mode=WAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            self._upgrade_schema(conn)
+        self._init_counters(conn)
+
+    def _upgrade_schema(self, conn: sqlite3.Connection):
+        legacy = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'episodic_memory'"
+        ).fetchone() is not None
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS episodic_identity (
+                    identity_key TEXT PRIMARY KEY,
+                    version INTEGER,
+                    identity_json TEXT
+                )
+            """)
+            table = "episodic_memory_v2" if legacy else "episodic_memory"
+            conn.execute(f"CREATE TABLE {table} ({self.EPISODE_COLUMNS})")
+            migrated = 0
+            if legacy:
+                migrated = self._migrate_legacy(conn, table)
+                conn.execute("DROP TABLE episodic_memory")
+                conn.execute(f"ALTER TABLE {table} RENAME TO episodic_memory")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_episodic_ts ON episodic_memory (ts_us)")
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        if legacy:
+            # Give the space freed by the per-row JSON copies back to the filesystem
+            conn.execute("VACUUM")
+            logger.info(f"Episodic store migrated to schema v{self.SCHEMA_VERSION} ({migrated} rows)")
+
+    def _init_counters(self, conn: sqlite3.Connection):
+        """Seeded with one COUNT(*) the first time, then kept exact by the triggers."""
+        conn.execute("CREATE TABLE IF NOT EXISTS episodic_meta (key TEXT PRIMARY KEY, value INTEGER)")
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS episodic_memory_count_ai AFTER INSERT ON episodic_memory BEGIN
+                UPDATE episodic_meta SET value = value + 1 WHERE key = 'row_count';
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS episodic_memory_count_ad AFTER DELETE ON episodic_memory BEGIN
+                UPDATE episodic_meta SET value = value - 1 WHERE key = 'row_count';
+            END
         """)
-        self.db.commit()
+        conn.execute("""
+            INSERT OR IGNORE INTO episodic_meta (key, value) SELECT 'row_count', (SELECT COUNT(*) FROM episodic_memory)
+            WHERE NOT EXISTS (SELECT 1 FROM episodic_meta WHERE key = 'row_count')
+        """)
+        conn.commit()
+
+    def _migrate_legacy(self, conn: sqlite3.Connection, table: str) -> int:
+        """Copy pre-v2 rows (per-row JSON blobs, with or without ts_us) into the normalised table."""
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(episodic_memory)")]
+        has_ts_us = "ts_us" in columns
+        cursor = conn.execute(f"""
+            SELECT turn_id, timestamp, {'ts_us' if has_ts_us else 'NULL'}, user_input, response,
+                   identity_json, mood_json, token_json, salience, valence, tags, flags
+            FROM episodic_memory
+        """)
+        migrated = 0
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                return migrated
+            identities, episodes = {}, []
+            for turn_id, timestamp, ts_us, user_input, response, identity_json, mood_json, token_json, salience, valence, tags, flags in rows:
+                identity_row = self._identity_row(json.loads(identity_json) if identity_json else {})
+                identities[identity_row[0]] = identity_row
+                if ts_us is None:
+                    ts_us = to_epoch_us(datetime.fromisoformat(timestamp))
+                episodes.append(self._episode_row(
+                    turn_id, ts_us, user_input, response, identity_row[0],
+                    json.loads(mood_json) if mood_json else {},
+                    json.loads(token_json) if token_json else {},
+                    salience, valence, tags, flags
+                ))
+            conn.executemany(self.IDENTITY_SQL, identities.values())
+            conn.executemany(self.INSERT_SQL.replace("episodic_memory", table, 1), episodes)
+            self._identity_keys.update(identities)
+            migrated += len(episodes)
+
+    def _identity_row(self, identity: dict) -> Tuple[str, Optional[int], str]:
+        """(key, version, json) for an identity dict; the key is stable for identical content."""
+        payload = json.dumps(identity, sort_keys=True, default=str)
+        digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+        version = identity.get("version") if isinstance(identity, dict) else None
+        return f"{version}:{digest}", version, payload
+
+    def _episode_row(self, turn_id, ts_us, user_input, response, identity_key, mood: dict, tokens: dict, salience, valence, tags, flags) -> tuple:
+        mood = mood or {}
+        tokens = tokens or {}
+        mood_ts = mood.get("timestamp")
+        return (
+            turn_id,
+            ts_us,
+            self._pack_text(user_input),
+            self._pack_text(response),
+            identity_key,
+            mood.get("valence"),
+            mood.get("arousal"),
+            mood.get("dominance"),
+            to_epoch_us(datetime.fromisoformat(mood_ts)) if mood_ts else None,
+            _token_count(tokens, "prompt"),
+            _token_count(tokens, "completion"),
+            _token_count(tokens, "total"),
+            salience,
+            valence,
+            tags,
+            flags
+        )
+
+    def _pack_text(self, text):
+        if text is None or self.compress_min_bytes is None:
+            return text
+        raw = text.encode("utf-8")
+        if len(raw) < self.compress_min_bytes:
+            return text
+        packed = zlib.compress(raw)
+        return packed if len(packed) < len(raw) else text
+
+    @staticmethod
+    def _unpack_text(value) -> str:
+        return zlib.decompress(value).decode("utf-8") if isinstance(value, bytes) else value
 
     async def store(self, memory: EpisodicMemory):
-        self.db.execute("""
-            INSERT INTO episodic_memory 
-            (turn_id, timestamp, user_input, response, 
-             identity_json, mood_json, token_json, salience, valence, tags, flags)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        """Queue the turn for the writer thread; durable after the next group commit."""
+        identity_key, version, payload = self._identity_row(_as_dict(memory.identity_state) or {})
+        if identity_key not in self._identity_keys:
+            # Queued ahead of the episode on the same writer, so it commits first
+            self.writer.submit(self.IDENTITY_SQL, (identity_key, version, payload))
+            self._identity_keys.add(identity_key)
+        self.writer.submit(self.INSERT_SQL, self._episode_row(
             memory.turn_id,
-            memory.timestamp.isoformat(),
+            to_epoch_us(memory.timestamp),
             memory.user_input,
             memory.assistant_response,
-            json.dumps(memory.identity_state.to_dict()),
-            json.dumps(memory.mood_state.to_dict()),
-            json.dumps(memory.token_usage.to_dict()),
+            identity_key,
+            _as_dict(memory.mood_state),
+            _as_dict(memory.token_usage),
             memory.salience_score,
             memory.emotional_valence,
             ",".join(memory.concept_tags),
             ",".join(memory.contradiction_flags)
         ))
-        self.db.commit()
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write is committed (tests, shutdown)."""
+        return await asyncio.to_thread(self.writer.flush, timeout)
+
+    async def retrieve_range(
+        self,
+        hours: Optional[float] = 24,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 50,
+        newest_first: bool = True
+    ) -> List[EpisodicMemory]:
+        """
+        Turns inside a time window, at most `limit` of them, read through the
+        ts_us index: O(log n + limit) regardless of store size.
+        `since` overrides `hours`; `hours=None` and no `since` means unbounded.
+        """
+        await self._read_your_writes()
+        since_us, until_us = self._window(hours, since, until)
+        memories, _ = await self.readers.run(self._read_page, since_us, until_us, None, limit, newest_first)
+        return memories
+
+    async def iter_range(
+        self,
+        hours: Optional[float] = 24,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        newest_first: bool = True,
+        batch_size: int = 64
+    ) -> AsyncIterator[EpisodicMemory]:
+        """Stream a window page by page (keyset pagination) without materializing it."""
+        await self._read_your_writes()
+        since_us, until_us = self._window(hours, since, until)
+        after = None
+        while True:
+            memories, after = await self.readers.run(self._read_page, since_us, until_us, after, batch_size, newest_first)
+            for memory in memories:
+                yield memory
+            if len(memories) < batch_size:
+                return
+
+    def _window(self, hours, since, until) -> Tuple[Optional[int], Optional[int]]:
+        if since is None and hours is not None:
+            since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        return (
+            to_epoch_us(since) if since is not None else None,
+            to_epoch_us(until) if until is not None else None
+        )
+
+    def _read_page(self, conn: sqlite3.Connection, since_us, until_us, after: Optional[Tuple[int, int]], limit: int, newest_first: bool):
+        """One page of the window plus the (ts_us, rowid) key to continue after."""
+        rows = self._range_rows(conn, since_us, until_us, after, limit, newest_first)
+        last = (rows[-1][1], rows[-1][0]) if rows else after
+        return [self._row_to_memory(conn, row) for row in rows], last
+
+    def _range_rows(self, conn: sqlite3.Connection, since_us, until_us, after: Optional[Tuple[int, int]], limit: int, newest_first: bool):
+        conditions, params = [], []
+        if since_us is not None:
+            conditions.append("ts_us >= ?")
+            params.append(since_us)
+        if until_us is not None:
+            conditions.append("ts_us < ?")
+            params.append(until_us)
+        if after is not None:
+            conditions.append("(ts_us, rowid) < (?, ?)" if newest_first else "(ts_us, rowid) > (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        order = "DESC" if newest_first else "ASC"
+        params.append(limit)
+        return conn.execute(f"""
+            SELECT {self.SELECT_COLUMNS} FROM episodic_memory
+            {where}
+            ORDER BY ts_us {order}, rowid {order}
+            LIMIT ?
+        """, params).fetchall()
+
+    def _row_to_memory(self, conn: sqlite3.Connection, row) -> EpisodicMemory:
+        (_, ts_us, turn_id, user_input, response, identity_key,
+         mood_valence, mood_arousal, mood_dominance, mood_ts_us,
+         prompt_tokens, completion_tokens, total_tokens,
+         salience, valence, tags, flags) = row
+        timestamp = from_epoch_us(ts_us)
+        if mood_valence is not None:
+            mood = MoodState(
+                valence=mood_valence,
+                arousal=mood_arousal,
+                dominance=mood_dominance,
+                timestamp=from_epoch_us(mood_ts_us) if mood_ts_us is not None else timestamp
+            )
+        else:
+            mood = {}
+        return EpisodicMemory(
+            turn_id=turn_id,
+            timestamp=timestamp,
+            user_input=self._unpack_text(user_input),
+            assistant_response=self._unpack_text(response),
+            identity_state=self._load_identity(conn, identity_key),
+            mood_state=mood,
+            token_usage=TokenUsage(
+                prompt_tokens=prompt_tokens or 0,
+                completion_tokens=completion_tokens or 0,
+                total_tokens=total_tokens or 0
+            ),
+            salience_score=salience,
+            emotional_valence=valence,
+            concept_tags=tags.split(",") if tags else [],
+            contradiction_flags=flags.split(",") if flags else []
+        )
+
+    def _load_identity(self, conn: sqlite3.Connection, identity_key: Optional[str]):
+        """Decoded once per key; every turn under the same identity shares the object."""
+        if identity_key is None:
+            return {}
+        cached = self._identity_cache.get(identity_key)
+        if cached is not None:
+            return cached
+        row = conn.execute(
+            "SELECT identity_json FROM episodic_identity WHERE identity_key = ?", (identity_key,)
+        ).fetchone()
+        if row is None:
+            logger.warning(f"Episodic identity {identity_key} missing")
+            return {}
+        identity = self._decode_identity(row[0])
+        self._identity_cache[identity_key] = identity
+        return identity
+
+    def _decode_identity(self, raw: str):
+        data = json.loads(raw) if raw else {}
+        try:
+            return IdentitySnapshot.from_dict(data)
+        except (KeyError, TypeError, ValueError):
+            return data
+
+    async def _read_your_writes(self):
+        """Turns queued by store() become visible to the next read."""
+        if self.writer.pending():
+            await self.flush()
 
     async def count(self) -> int:
-        return self.db.execute("SELECT COUNT(*) FROM episodic_memory").fetchone()[0]
+        """Committed rows (turns still queued on the writer are not included)."""
+        return await self.readers.run(self._read_count)
+
+    @staticmethod
+    def _read_count(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT value FROM episodic_meta WHERE key = 'row_count'").fetchone()[0]
+
+    async def reconcile_count(self) -> Tuple[int, int]:
+        """
+        Check the maintained count against a full COUNT(*) and repair it on
+        mismatch. Returns (counter, actual) as read before any repair.
+        """
+        await self.flush()
+        counter, actual = await self.readers.run(lambda conn: conn.execute("""
+            SELECT (SELECT value FROM episodic_meta WHERE key = 'row_count'),
+                   (SELECT COUNT(*) FROM episodic_memory)
+        """).fetchone())
+        if counter != actual:
+            logger.warning(f"Episodic row counter drifted ({counter} vs {actual}), repairing")
+            # Relative update: rows committed after our read move both sides equally
+            self.writer.submit("UPDATE episodic_meta SET value = value + ? WHERE key = 'row_count'", (actual - counter,))
+            await self.flush()
+        return counter, actual
 
     async def expire_records(self, days: int = 7):
-        self.db.execute("DELETE FROM episodic_memory WHERE timestamp < datetime('now', '-{} days')".format(days))
-        self.db.commit()
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        self.writer.submit("DELETE FROM episodic_memory WHERE ts_us < ?", (to_epoch_us(cutoff),))
+        await self.flush()
+
+    def close(self):
+        self.writer.close()
+        self.readers.close()
@@ -1,10 +1,40 @@
+import asyncio
 import sqlite3
+import logging
 import json
 import os
 import re
+import threading
+import time
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from typing import List, Optional
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional, Tuple
+from .vector_index import VectorIndex, to_blob
+from .sqlite_pool import ReaderPool
+
+logger = logging.getLogger(__name__)
+
+# Dropped from lexical queries; they match nearly every fact and only add noise to BM25
+STOP_WORDS = frozenset("""
+a an and are as at be but by can could do does for from had has have how i if in into is it its
+me my no not of on or our so than that the their them then there these they this to was we were
+what when where which who why will with would you your
+""".split())
+
+# Temporal decay, evaluated lazily at read time:
+#   decay = MAX(FLOOR, MIN(1.0, decay_age + BOOST * reinforcement_count) - PER_DAY * days_since(timestamp))
+# decay_age is the base multiplier the fact was stored with; timestamp is the last reinforcement.
+DECAY_FLOOR = 0.1
+DECAY_PER_DAY = 0.05
+REINFORCEMENT_BOOST = 0.1
+
+def effective_decay_sql(alias: str = "") -> str:
+    """SQL expression for the current decay multiplier of a semantic_facts row."""
+    p = f"{alias}." if alias else ""
+    return (
+        f"MAX({DECAY_FLOOR}, MIN(1.0, {p}decay_age + {REINFORCEMENT_BOOST} * {p}reinforcement_count)"
+        f" - {DECAY_PER_DAY} * (julianday('now') - julianday({p}timestamp)))"
+    )
 
 @dataclass
 class SemanticFact:
@@ -14,73 +44,358 @@ class SemanticFact:
     object: str
     confidence: float
     timestamp: datetime
-    decay_age: float = 1.0  # Decay multiplier (1.0 = no decay)
+    decay_age: float = 1.0  # Decay multiplier (1.0 = no decay); effective value when read back
+    embedding: Optional[List[float]] = field(default=None, repr=False, compare=False)
 
     def to_dict(self):
         d = asdict(self)
         d['timestamp'] = self.timestamp.isoformat()
+        d.pop('embedding')
         return d
 
+@dataclass
+class UpsertReport:
+    """Outcome of a store_facts call: rows written and wall time per executemany batch."""
+    rows: int = 0
+    batch_ms: List[float] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.batch_ms)
+
+@dataclass
+class CompactionReport:
+    """Outcome of a compact_decayed call."""
+    floored: int = 0  # rows whose clamped decay was persisted
+    deleted: int = 0
+
 class SemanticStore:
     """Persistent semantic knowledge graph with temporal decay"""
+    # BM25 candidates fetched per requested fact before confidence/decay re-ranking
+    CANDIDATE_POOL_FACTOR = 5
+    # Hybrid relevance = LEXICAL_WEIGHT * normalised BM25 + VECTOR_WEIGHT * cosine similarity
+    LEXICAL_WEIGHT = 0.4
+    VECTOR_WEIGHT = 0.6
+    # Facts per executemany call; all batches of one store_facts share a transaction
+    UPSERT_BATCH_SIZE = 5000
+    # fact_id aliases the rowid, so the FTS index and the vector index can key on it
+    # without VACUUM renumbering rows underneath them
+    FACT_COLUMNS = """
+        fact_id INTEGER PRIMARY KEY,
+        subject TEXT,
+        predicate TEXT,
+        object TEXT,
+        confidence REAL,
+        timestamp TEXT,
+        decay_age REAL,
+        embedding BLOB,
+        reinforcement_count INTEGER NOT NULL DEFAULT 0,
+        UNIQUE (subject, predicate, object)
+    """
+    UPSERT_SQL = """
+        INSERT INTO semantic_facts
+        (subject, predicate, object, confidence, timestamp, decay_age, embedding)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(subject, predicate, object) DO UPDATE SET
+        confidence = MAX(confidence, excluded.confidence),
+        timestamp = excluded.timestamp,
+        reinforcement_count = reinforcement_count + 1,
+        embedding = COALESCE(excluded.embedding, embedding)
+    """
     
-    def __init__(self, db_path: str = "/home/novus/.config/pygpt-net/data/nexus_semantic.db"):
+    def __init__(self, db_path: str = "/home/novus/.config/pygpt-net/data/nexus_semantic.db", readers: int = 4):
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.db = sqlite3.connect(db_path)
+        self.db_path = db_path
+        # Single writer connection; writes run on a worker thread (store_facts) and the lock serialises them.
+        # Reads go through the ReaderPool (WAL snapshots) and never take this lock.
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        # Guards the in-memory vector index, which readers search while writers update it
+        self._vectors_lock = threading.Lock()
+        self.fts_enabled = False
         self._init_schema()
+        self._init_vectors()
+        self.readers = ReaderPool(db_path, size=readers)
     
     def _init_schema(self):
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(f"CREATE TABLE IF NOT EXISTS semantic_facts ({self.FACT_COLUMNS})")
         self.db.execute("""
-            CREATE TABLE IF NOT EXISTS semantic_facts (
-                subject TEXT,
-                predicate TEXT,
-                object TEXT,
-                confidence REAL,
-                timestamp TEXT,
-                decay_age REAL,
-                PRIMARY KEY (subject, predicate, object)
+            CREATE TABLE IF NOT EXISTS semantic_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER
             )
         """)
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(semantic_facts)")}
+        if "embedding" not in columns:
+            # float32 blob, see vector_index.to_blob
+            self.db.execute("ALTER TABLE semantic_facts ADD COLUMN embedding BLOB")
+        if "reinforcement_count" not in columns:
+            # Legacy rows keep their stored decay_age as the base multiplier
+            self.db.execute("ALTER TABLE semantic_facts ADD COLUMN reinforcement_count INTEGER NOT NULL DEFAULT 0")
+        if "fact_id" not in columns:
+            self._migrate_fact_id()
+        # Row count kept by triggers (upsert conflicts update in place and never fire them)
+        self.db.execute("""
+            CREATE TRIGGER IF NOT EXISTS semantic_facts_count_ai AFTER INSERT ON semantic_facts BEGIN
+                UPDATE semantic_meta SET value = value + 1 WHERE key = 'row_count';
+            END
+        """)
+        self.db.execute("""
+            CREATE TRIGGER IF NOT EXISTS semantic_facts_count_ad AFTER DELETE ON semantic_facts BEGIN
+                UPDATE semantic_meta SET value = value - 1 WHERE key = 'row_count';
+            END
+        """)
+        self.db.execute("""
+            INSERT OR IGNORE INTO semantic_meta (key, value) SELECT 'row_count', (SELECT COUNT(*) FROM semantic_facts)
+            WHERE NOT EXISTS (SELECT 1 FROM semantic_meta WHERE key = 'row_count')
+        """)
         self.db.commit()
-    
-    async def store_facts(self, facts: List[SemanticFact]):
-        """Store extracted semantic facts using UPSERT logic"""
-        for fact in facts:
-            self.db.execute("""
-                INSERT INTO semantic_facts
-                (subject, predicate, object, confidence, timestamp, decay_age)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(subject, predicate, object) DO UPDATE SET
-                confidence = MAX(confidence, excluded.confidence),
-                timestamp = excluded.timestamp,
-                decay_age = MIN(1.0, decay_age + 0.1) -- Reinforcement
-            """, (
-                fact.subject,
-                fact.predicate,
-                fact.object,
-                fact.confidence,
-                fact.timestamp.isoformat(),
-                fact.decay_age
-            ))
+        self._init_fts()
+
+    def _migrate_fact_id(self):
+        """
+        Rebuild a pre-fact_id table (composite primary key, implicit rowid) with
+        fact_id taking over each row's current rowid, so the persisted vector
+        index stays valid. The FTS table is dropped and rebuilt by _init_fts.
+        """
         self.db.commit()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.execute(f"CREATE TABLE semantic_facts_v2 ({self.FACT_COLUMNS})")
+            self.db.execute("""
+                INSERT INTO semantic_facts_v2
+                (fact_id, subject, predicate, object, confidence, timestamp, decay_age, embedding, reinforcement_count)
+                SELECT rowid, subject, predicate, object, confidence, timestamp, decay_age, embedding, reinforcement_count
+                FROM semantic_facts
+            """)
+            self.db.execute("DROP TABLE IF EXISTS semantic_facts_fts")
+            self.db.execute("DROP TABLE semantic_facts")
+            self.db.execute("ALTER TABLE semantic_facts_v2 RENAME TO semantic_facts")
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        logger.info("Semantic store migrated to fact_id keys")
+
+    def _init_fts(self):
+        """
+        External-content FTS5 index over the triple text, kept in sync by triggers
+        so every write path (store_facts upserts included) updates it.
+        Falls back to LIKE matching when SQLite is built without FTS5.
+        """
+        try:
+            exists = self.db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'semantic_facts_fts'"
+            ).fetchone()
+            self.db.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS semantic_facts_fts USING fts5(
+                    subject, predicate, object,
+                    content='semantic_facts', content_rowid='fact_id',
+                    tokenize='porter unicode61'
+                );
+                CREATE TRIGGER IF NOT EXISTS semantic_facts_ai AFTER INSERT ON semantic_facts BEGIN
+                    INSERT INTO semantic_facts_fts(rowid, subject, predicate, object)
+                    VALUES (new.fact_id, new.subject, new.predicate, new.object);
+                END;
+                CREATE TRIGGER IF NOT EXISTS semantic_facts_ad AFTER DELETE ON semantic_facts BEGIN
+                    INSERT INTO semantic_facts_fts(semantic_facts_fts, rowid, subject, predicate, object)
+                    VALUES ('delete', old.fact_id, old.subject, old.predicate, old.object);
+                END;
+                CREATE TRIGGER IF NOT EXISTS semantic_facts_au AFTER UPDATE OF subject, predicate, object ON semantic_facts BEGIN
+                    INSERT INTO semantic_facts_fts(semantic_facts_fts, rowid, subject, predicate, object)
+                    VALUES ('delete', old.fact_id, old.subject, old.predicate, old.object);
+                    INSERT INTO semantic_facts_fts(rowid, subject, predicate, object)
+                    VALUES (new.fact_id, new.subject, new.predicate, new.object);
+                END;
+            """)
+            if not exists:
+                # Index facts written before the FTS table existed
+                self.db.execute("INSERT INTO semantic_facts_fts(semantic_facts_fts) VALUES ('rebuild')")
+            self.db.commit()
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, semantic retrieval falls back to LIKE scans: {e}")
+
+    def _init_vectors(self):
+        """
+        Memory-map the persisted vector index if it matches the current embedding
+        generation, otherwise rebuild it from the stored blobs.
+        """
+        self.vectors = VectorIndex(os.path.splitext(self.db_path)[0])
+        generation = self._embedding_generation()
+        if not self.vectors.load(generation):
+            rows = self.db.execute("SELECT fact_id, embedding FROM semantic_facts WHERE embedding IS NOT NULL")
+            self.vectors.rebuild(rows, generation)
+            if len(self.vectors):
+                self.vectors.save()
+
+    def _embedding_generation(self) -> int:
+        row = self.db.execute("SELECT value FROM semantic_meta WHERE key = 'embedding_generation'").fetchone()
+        return row[0] if row else 0
+
+    def _bump_embedding_generation(self) -> int:
+        self.db.execute("""
+            INSERT INTO semantic_meta (key, value) VALUES ('embedding_generation', 1)
+            ON CONFLICT(key) DO UPDATE SET value = value + 1
+        """)
+        return self._embedding_generation()
+    
+    async def store_facts(self, facts: List[SemanticFact], batch_size: int = UPSERT_BATCH_SIZE) -> UpsertReport:
+        """
+        Store extracted semantic facts using UPSERT logic.
+        Runs off the event loop as chunked executemany calls inside a single
+        transaction. Facts carrying an embedding also update the vector index
+        incrementally.
+        """
+        if not facts:
+            return UpsertReport()
+        return await asyncio.to_thread(self._store_facts_sync, facts, batch_size)
+
+    def _store_facts_sync(self, facts: List[SemanticFact], batch_size: int) -> UpsertReport:
+        report = UpsertReport()
+        embedded = [f for f in facts if f.embedding is not None]
+        with self._lock:
+            try:
+                self.db.execute("BEGIN IMMEDIATE")
+                for start in range(0, len(facts), batch_size):
+                    chunk = facts[start:start + batch_size]
+                    batch_start = time.perf_counter()
+                    self.db.executemany(self.UPSERT_SQL, [
+                        (
+                            f.subject,
+                            f.predicate,
+                            f.object,
+                            f.confidence,
+                            f.timestamp.isoformat(),
+                            f.decay_age,
+                            to_blob(f.embedding) if f.embedding is not None else None
+                        )
+                        for f in chunk
+                    ])
+                    report.batch_ms.append((time.perf_counter() - batch_start) * 1000)
+                    report.rows += len(chunk)
+
+                fact_ids = self._lookup_fact_ids(embedded) if embedded else []
+                generation = self._bump_embedding_generation() if embedded else None
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+
+            if embedded:
+                with self._vectors_lock:
+                    self.vectors.upsert(fact_ids, [f.embedding for f in embedded])
+                    self.vectors.generation = generation
+        return report
+
+    def _lookup_fact_ids(self, facts: List[SemanticFact], chunk: int = 300) -> List[int]:
+        """Resolve fact_ids for upserted triples, a few hundred primary-key probes per statement."""
+        found: Dict[tuple, int] = {}
+        keys = list({(f.subject, f.predicate, f.object) for f in facts})
+        for start in range(0, len(keys), chunk):
+            part = keys[start:start + chunk]
+            params = [value for key in part for value in key]
+            cursor = self.db.execute(f"""
+                SELECT fact_id, subject, predicate, object FROM semantic_facts
+                WHERE (subject, predicate, object) IN (VALUES {','.join(['(?, ?, ?)'] * len(part))})
+            """, params)
+            for fact_id, subject, predicate, obj in cursor:
+                found[(subject, predicate, obj)] = fact_id
+        return [found[(f.subject, f.predicate, f.object)] for f in facts]
     
     async def retrieve_relevant_facts(
         self, 
         query: str, 
-        limit: int = 15
+        limit: int = 15,
+        query_embedding: Optional[List[float]] = None
     ) -> List[SemanticFact]:
         """
         Retrieve semantically relevant facts.
-        Simple lexical search for now; Phase 3 will introduce embeddings.
+        Lexical search: any query term may match (OR), ranked by
+        BM25 relevance weighted by confidence * decay.
+        With a query embedding, lexical and nearest-neighbour candidates are
+        merged and scored by hybrid relevance * confidence * decay.
+        Decay is computed for the candidates only (see effective_decay_sql).
         """
-        # Clean query for simple LIKE matching
-        clean_query = re.sub(r'[^a-zA-Z0-9\s]', '', query)
-        terms = clean_query.split()
-        
-        if not terms:
+        return await self.readers.run(self._retrieve, query, limit, query_embedding)
+
+    def _retrieve(self, conn: sqlite3.Connection, query: str, limit: int, query_embedding) -> List[SemanticFact]:
+        terms = self._query_terms(query)
+        use_vectors = query_embedding is not None and len(self.vectors) > 0
+        if not terms and not use_vectors:
             return []
 
-        # Build a simple multi-term match query
+        if use_vectors:
+            return self._retrieve_hybrid(conn, terms, query_embedding, limit)
+        if not self.fts_enabled:
+            return self._retrieve_like(conn, terms, limit)
+
+        # FTS5 returns the BM25 top candidates cheaply (ORDER BY rank LIMIT);
+        # only that pool is re-weighted by confidence and decay.
+        cursor = conn.execute(f"""
+            SELECT f.subject, f.predicate, f.object, f.confidence, f.timestamp, {effective_decay_sql('f')} AS decay
+            FROM (
+                SELECT rowid, rank FROM semantic_facts_fts
+                WHERE semantic_facts_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            ) AS hits
+            JOIN semantic_facts AS f ON f.fact_id = hits.rowid
+            ORDER BY -hits.rank * f.confidence * decay DESC
+            LIMIT ?
+        """, (self._match_expr(terms), limit * self.CANDIDATE_POOL_FACTOR, limit))
+        return [self._row_to_fact(row) for row in cursor.fetchall()]
+
+    def _retrieve_hybrid(self, conn: sqlite3.Connection, terms: List[str], query_embedding, limit: int) -> List[SemanticFact]:
+        pool = limit * self.CANDIDATE_POOL_FACTOR
+
+        lexical: Dict[int, float] = {}
+        if terms and self.fts_enabled:
+            cursor = conn.execute("""
+                SELECT rowid, rank FROM semantic_facts_fts
+                WHERE semantic_facts_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """, (self._match_expr(terms), pool))
+            lexical = {rowid: -rank for rowid, rank in cursor.fetchall()}
+
+        with self._vectors_lock:
+            similarity = dict(self.vectors.search(query_embedding, pool))
+            candidates = set(lexical) | set(similarity)
+            if not candidates:
+                return []
+            similarity.update(self.vectors.similarities(query_embedding, [r for r in candidates if r not in similarity]))
+
+        rows = conn.execute(f"""
+            SELECT fact_id, subject, predicate, object, confidence, timestamp, {effective_decay_sql()}
+            FROM semantic_facts WHERE fact_id IN ({','.join('?' * len(candidates))})
+        """, list(candidates)).fetchall()
+
+        top_lexical = max(lexical.values(), default=0.0)
+        scored = []
+        for row in rows:
+            fact_id = row[0]
+            lexical_score = lexical.get(fact_id, 0.0) / top_lexical if top_lexical > 0 else 0.0
+            vector_score = max(0.0, similarity.get(fact_id, 0.0))
+            relevance = self.LEXICAL_WEIGHT * lexical_score + self.VECTOR_WEIGHT * vector_score
+            scored.append((relevance * row[4] * row[6], row[1:]))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [self._row_to_fact(row) for _, row in scored[:limit]]
+
+    def _match_expr(self, terms: List[str]) -> str:
+        return " OR ".join(f'"{t}"' for t in terms)
+
+    def _query_terms(self, query: str) -> List[str]:
+        clean_query = re.sub(r'[^a-zA-Z0-9\s]', ' ', query).lower()
+        terms = []
+        for term in clean_query.split():
+            if term not in STOP_WORDS and term not in terms:
+                terms.append(term)
+        return terms
+
+    def _retrieve_like(self, conn: sqlite3.Connection, terms: List[str], limit: int) -> List[SemanticFact]:
+        """Full-scan fallback for SQLite builds without FTS5."""
         conditions = []
         params = []
         for term in terms:
@@ -88,14 +403,15 @@ class SemanticStore:
             params.extend([f"%{term}%", f"%{term}%", f"%{term}%"])
         
         sql = f"""
-            SELECT * FROM semantic_facts
-            WHERE {' AND '.join(conditions)}
-            ORDER BY confidence * decay_age DESC
+            SELECT subject, predicate, object, confidence, timestamp, {effective_decay_sql()} AS decay
+            FROM semantic_facts
+            WHERE {' OR '.join(conditions)}
+            ORDER BY confidence * decay DESC
             LIMIT ?
         """
         params.append(limit)
         
-        cursor = self.db.execute(sql, params)
+        cursor = conn.execute(sql, params)
         return [self._row_to_fact(row) for row in cursor.fetchall()]
     
     def _row_to_fact(self, row) -> SemanticFact:
@@ -108,15 +424,93 @@ class SemanticStore:
             decay_age=row[5]
         )
 
-    async def apply_decay(self):
+    async def compact_decayed(self, batch_size: int = 500, delete_below: Optional[float] = None) -> CompactionReport:
         """
-        Apply temporal decay to facts.
-        Older facts become less relevant unless reinforced.
+        Optional maintenance. Facts whose decay has reached DECAY_FLOOR get the
+        clamped value persisted (decay_age = DECAY_FLOOR, reinforcement_count = 0),
+        so they read back at the same weight and a later reinforcement restarts
+        from the floor instead of from the fact's original strength. Nothing is
+        deleted unless `delete_below` is given: then facts whose current decay is
+        strictly below it are removed, and callers opt into that data loss.
+        Walks the table once in fact_id order and writes in small batches, so only
+        rows that change are written and the lock is held briefly.
         """
-        self.db.execute("""
-            UPDATE semantic_facts
-            SET decay_age = MAX(0.1, decay_age - 0.05 * (
-                (julianday('now') - julianday(timestamp))
-            ))
-        """)
-        self.db.commit()
+        return await asyncio.to_thread(self._compact_decayed_sync, batch_size, delete_below)
+
+    def _compact_decayed_sync(self, batch_size: int, delete_below: Optional[float]) -> CompactionReport:
+        report = CompactionReport()
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self.db.execute(f"""
+                    SELECT fact_id, {effective_decay_sql()} AS decay, decay_age, reinforcement_count FROM semantic_facts
+                    WHERE fact_id > ?
+                    ORDER BY fact_id
+                    LIMIT ?
+                """, (last_id, batch_size)).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            stale = [r[0] for r in rows if delete_below is not None and r[1] < delete_below]
+            dropped = set(stale)
+            floored = [
+                r[0] for r in rows
+                if r[0] not in dropped and r[1] <= DECAY_FLOOR and (r[2] != DECAY_FLOOR or r[3] != 0)
+            ]
+            if not stale and not floored:
+                continue
+            with self._lock:
+                if floored:
+                    self.db.execute(f"""
+                        UPDATE semantic_facts SET decay_age = ?, reinforcement_count = 0
+                        WHERE fact_id IN ({','.join('?' * len(floored))})
+                    """, [DECAY_FLOOR, *floored])
+                if stale:
+                    self.db.execute(f"DELETE FROM semantic_facts WHERE fact_id IN ({','.join('?' * len(stale))})", stale)
+                    self._bump_embedding_generation()
+                self.db.commit()
+                if stale:
+                    with self._vectors_lock:
+                        self.vectors.remove(stale)
+            report.floored += len(floored)
+            report.deleted += len(stale)
+
+        if report.floored or report.deleted:
+            logger.info(f"Decay compaction persisted the floor for {report.floored} facts and removed {report.deleted}")
+        return report
+
+    async def count(self) -> int:
+        """Maintained by triggers: a key lookup, not a table scan."""
+        return await self.readers.run(
+            lambda conn: conn.execute("SELECT value FROM semantic_meta WHERE key = 'row_count'").fetchone()[0]
+        )
+
+    async def reconcile_count(self) -> Tuple[int, int]:
+        """
+        Check the maintained count against a full COUNT(*) and repair it on
+        mismatch. Returns (counter, actual) as read before any repair.
+        """
+        return await asyncio.to_thread(self._reconcile_count_sync)
+
+    def _reconcile_count_sync(self) -> Tuple[int, int]:
+        with self._lock:
+            counter, actual = self.db.execute("""
+                SELECT (SELECT value FROM semantic_meta WHERE key = 'row_count'),
+                       (SELECT COUNT(*) FROM semantic_facts)
+            """).fetchone()
+            if counter != actual:
+                logger.warning(f"Semantic row counter drifted ({counter} vs {actual}), repairing")
+                self.db.execute("UPDATE semantic_meta SET value = ? WHERE key = 'row_count'", (actual,))
+                self.db.commit()
+        return counter, actual
+
+    def save_vector_index(self):
+        """Persist the vector index so the next start can memory-map it instead of rebuilding."""
+        with self._lock, self._vectors_lock:
+            self.vectors.save(self._embedding_generation())
+
+    def close(self):
+        self.save_vector_index()
+        self.readers.close()
+        with self._lock:
+            self.db.close()
@@ -0,0 +1,306 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_FILE = "shards.json"
+EPISODIC_FILE = "episodic.db"
+SEMANTIC_FILE = "semantic.db"
+
+def shard_key(user_id: str) -> str:
+    """Filesystem-safe, collision-free directory name for a user."""
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", user_id)[:48]
+    return f"{safe}-{hashlib.sha1(user_id.encode('utf-8')).hexdigest()[:8]}"
+
+class ShardLayout:
+    """
+    Maps users to shard directories under `root`.
+
+    Every user gets a private directory holding their episodic and semantic
+    databases (the stores have no user_id scoping, so tenants never share a
+    file). With `buckets` set, user directories are grouped into that many
+    hash-bucket directories to bound fan-out: root/b007/<user>/. Without it the
+    layout is flat: root/<user>/. The layout is recorded in shards.json and a
+    mismatch must be resolved with rebalance().
+    """
+    def __init__(self, root: str, buckets: Optional[int] = None):
+        if buckets is not None and buckets < 1:
+            raise ValueError("buckets must be a positive integer")
+        self.root = root
+        self.buckets = buckets
+
+    def bucket_of(self, key: str) -> Optional[str]:
+        if self.buckets is None:
+            return None
+        return f"b{zlib.crc32(key.encode('utf-8')) % self.buckets:03d}"
+
+    def directory_for_key(self, key: str) -> str:
+        bucket = self.bucket_of(key)
+        return os.path.join(self.root, bucket, key) if bucket else os.path.join(self.root, key)
+
+    def directory_for(self, user_id: str) -> str:
+        return self.directory_for_key(shard_key(user_id))
+
+    def paths_for(self, user_id: str) -> Tuple[str, str]:
+        directory = self.directory_for(user_id)
+        return os.path.join(directory, EPISODIC_FILE), os.path.join(directory, SEMANTIC_FILE)
+
+    def read_recorded(self) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.root, LAYOUT_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def record(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = os.path.join(self.root, f"{LAYOUT_FILE}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"buckets": self.buckets}, f)
+        os.replace(tmp, os.path.join(self.root, LAYOUT_FILE))
+
+    def verify(self):
+        recorded = self.read_recorded()
+        if recorded is None:
+            self.record()
+        elif recorded.get("buckets") != self.buckets:
+            raise ValueError(
+                f"Shard root {self.root} is laid out with buckets={recorded.get('buckets')}, "
+                f"configured buckets={self.buckets}; run rebalance first"
+            )
+
+    def shard_dirs(self) -> List[str]:
+        """Every user shard directory present under root, whatever layout placed it."""
+        found = []
+        if not os.path.isdir(self.root):
+            return found
+        for entry in os.scandir(self.root):
+            if not entry.is_dir():
+                continue
+            if _is_shard_dir(entry.path):
+                found.append(entry.path)
+            else:
+                found.extend(sub.path for sub in os.scandir(entry.path) if sub.is_dir() and _is_shard_dir(sub.path))
+        return found
+
+def _is_shard_dir(path: str) -> bool:
+    return os.path.exists(os.path.join(path, EPISODIC_FILE)) or os.path.exists(os.path.join(path, SEMANTIC_FILE))
+
+def rebalance(root: str, buckets: Optional[int]) -> int:
+    """
+    Offline tool: move every user shard under `root` to where a layout with
+    `buckets` expects it, then record the new layout. A shard is one directory
+    (databases, WAL files, vector index), so each move is a single rename.
+    Stores must not be open while this runs. Returns the number of shards moved.
+    """
+    layout = ShardLayout(root, buckets)
+    moved = 0
+    for current in layout.shard_dirs():
+        target = layout.directory_for_key(os.path.basename(current))
+        if os.path.abspath(current) == os.path.abspath(target):
+            continue
+        if os.path.exists(target):
+            raise FileExistsError(f"Cannot move shard {current}: {target} already exists")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.rename(current, target)
+        moved += 1
+    for entry in os.scandir(root) if os.path.isdir(root) else []:
+        # Bucket directories left empty by the move
+        if entry.is_dir() and not _is_shard_dir(entry.path) and not os.listdir(entry.path):
+            os.rmdir(entry.path)
+    layout.record()
+    logger.info(f"Rebalanced {moved} shards under {root} to buckets={buckets}")
+    return moved
+
+def adopt_legacy(root: str, user_id: str, episodic_path: str, semantic_path: str, buckets: Optional[int] = None):
+    """Offline tool: move the single shared pre-sharding databases into one user's shard."""
+    layout = ShardLayout(root, buckets)
+    layout.verify()
+    target_episodic, target_semantic = layout.paths_for(user_id)
+    os.makedirs(os.path.dirname(target_episodic), exist_ok=True)
+    for source, target in ((episodic_path, target_episodic), (semantic_path, target_semantic)):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(source + suffix):
+                os.rename(source + suffix, target + suffix)
+    # Vector index files sit next to the semantic database
+    source_prefix = os.path.splitext(semantic_path)[0]
+    target_prefix = os.path.splitext(target_semantic)[0]
+    for suffix in (".vectors.npy", ".vector_ids.npy", ".vectors.json"):
+        if os.path.exists(source_prefix + suffix):
+            os.rename(source_prefix + suffix, target_prefix + suffix)
+
+@dataclass
+class _Shard:
+    memory: object
+    pins: int = 0
+
+class ShardedMemory:
+    """
+    Per-user memory shards with a bounded LRU of open ones.
+
+    `factory(episodic_path, semantic_path)` builds the memory object for a
+    shard (a SynthMemory in practice). At most `max_open` shards stay open;
+    the least recently used unpinned shard is closed (queued writes
+    committed, vector index saved) when the limit is exceeded. Shards in use
+    are pinned via acquire()/release() and are never evicted, so the limit
+    can be exceeded temporarily under load.
+
+    The lock only guards the bookkeeping and is never held across I/O: a
+    cold open runs once per user (concurrent acquires for that user wait on
+    it, other users are not blocked), and reopening a shard that is still
+    being closed waits for the close, so two instances never share files.
+    """
+    def __init__(
+        self,
+        root: str,
+        factory: Callable[[str, str], object],
+        buckets: Optional[int] = None,
+        max_open: int = 64
+    ):
+        self.layout = ShardLayout(root, buckets)
+        self.layout.verify()
+        self.factory = factory
+        self.max_open = max_open
+        self._open: "OrderedDict[str, _Shard]" = OrderedDict()
+        self._opening: Dict[str, asyncio.Future] = {}
+        self._closing: Dict[str, asyncio.Future] = {}
+        self._lock = asyncio.Lock()
+        self.opened = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    async def acquire(self, user_id: str):
+        """Open (or reuse) the user's shard and pin it until release()."""
+        while True:
+            async with self._lock:
+                pending = self._closing.get(user_id) or self._opening.get(user_id)
+                if pending is None:
+                    shard = self._open.get(user_id)
+                    if shard is not None:
+                        self._open.move_to_end(user_id)
+                        shard.pins += 1
+                        victims = self._pick_victims()
+                        break
+                    opening = asyncio.get_running_loop().create_future()
+                    # Waiters may all have gone; never leave an unretrieved exception behind
+                    opening.add_done_callback(lambda f: f.cancelled() or f.exception())
+                    self._opening[user_id] = opening
+            if pending is not None:
+                # Still closing (evicted) or being opened by another acquire: wait, then look again
+                await asyncio.shield(pending)
+                continue
+            shard, victims = await self._open_shard(user_id, opening)
+            break
+        await self._close_all(victims)
+        return shard.memory
+
+    async def _open_shard(self, user_id: str, opening: asyncio.Future) -> Tuple[_Shard, List[Tuple[str, object]]]:
+        try:
+            episodic_path, semantic_path = self.layout.paths_for(user_id)
+            os.makedirs(os.path.dirname(episodic_path), exist_ok=True)
+            memory = await asyncio.to_thread(self.factory, episodic_path, semantic_path)
+        except BaseException as e:
+            async with self._lock:
+                del self._opening[user_id]
+            if isinstance(e, Exception):
+                opening.set_exception(e)
+            else:
+                opening.cancel()
+            raise
+        async with self._lock:
+            shard = _Shard(memory, pins=1)
+            self._open[user_id] = shard
+            del self._opening[user_id]
+            self.opened += 1
+            victims = self._pick_victims()
+        opening.set_result(None)
+        return shard, victims
+
+    async def release(self, user_id: str):
+        async with self._lock:
+            shard = self._open.get(user_id)
+            if shard is None:
+                return
+            shard.pins = max(0, shard.pins - 1)
+            victims = self._pick_victims()
+        await self._close_all(victims)
+
+    def _pick_victims(self) -> List[Tuple[str, object]]:
+        """Called under the lock; victims are marked closing until _close_all finishes."""
+        victims = []
+        excess = len(self._open) - self.max_open
+        for user_id in list(self._open):
+            if excess <= 0:
+                break
+            if self._open[user_id].pins == 0:
+                victims.append((user_id, self._open.pop(user_id).memory))
+                self._closing[user_id] = asyncio.get_running_loop().create_future()
+                excess -= 1
+        self.evicted += len(victims)
+        return victims
+
+    async def _close_all(self, victims: List[Tuple[str, object]]):
+        for user_id, memory in victims:
+            try:
+                await memory.close()
+            except Exception as e:
+                logger.error(f"Failed to close evicted memory shard: {e}")
+            finally:
+                done = self._closing.pop(user_id, None)
+                if done is not None and not done.done():
+                    done.set_result(None)
+
+    async def shutdown(self):
+        async with self._lock:
+            victims = [(user_id, shard.memory) for user_id, shard in self._open.items()]
+            self._open.clear()
+            for user_id, _ in victims:
+                self._closing[user_id] = asyncio.get_running_loop().create_future()
+            closing = [f for user_id, f in self._closing.items() if user_id not in dict(victims)]
+        await self._close_all(victims)
+        if closing:
+            await asyncio.gather(*(asyncio.shield(f) for f in closing))
+
+    def report(self) -> Dict[str, int]:
+        return {
+            "open": len(self._open),
+            "pinned": sum(1 for shard in self._open.values() if shard.pins),
+            "max_open": self.max_open,
+            "opened": self.opened,
+            "evicted": self.evicted,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Nexus memory shard maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_rebalance = sub.add_parser("rebalance", help="Move user shards to a new bucket layout")
+    p_rebalance.add_argument("--root", required=True)
+    p_rebalance.add_argument("--buckets", type=int, default=None, help="Omit for a flat per-user layout")
+    p_adopt = sub.add_parser("adopt-legacy", help="Move the shared pre-sharding databases into one user's shard")
+    p_adopt.add_argument("--root", required=True)
+    p_adopt.add_argument("--user", required=True)
+    p_adopt.add_argument("--episodic", required=True)
+    p_adopt.add_argument("--semantic", required=True)
+    p_adopt.add_argument("--buckets", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "rebalance":
+        print(f"moved {rebalance(args.root, args.buckets)} shards")
+    else:
+        adopt_legacy(args.root, args.user, args.episodic, args.semantic, args.buckets)
+        print(f"adopted legacy databases into {ShardLayout(args.root, args.buckets).directory_for(args.user)}")
+
+if __name__ == "__main__":
+    main()
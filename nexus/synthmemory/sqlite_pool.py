@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+class ReaderPool:
+    """
+    Read-only SQLite connections, one per worker thread, for a WAL database.
+
+    Every read runs on a pool thread against that thread's own connection, so
+    concurrent turns read in parallel and never wait on the writer (WAL readers
+    see the last committed snapshot). Writes stay on the store's single writer
+    connection. Connections are opened lazily with mode=ro and query_only.
+    """
+    def __init__(self, db_path: str, size: int = 4):
+        if size < 1:
+            raise ValueError("ReaderPool requires at least one connection")
+        self.db_path = db_path
+        self.size = size
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"sqlite-read:{os.path.basename(db_path)}")
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._closed = False
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _call(self, fn: Callable[..., Any], args) -> Any:
+        return fn(self._connection(), *args)
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run fn(conn, *args) on a pool thread and return its result."""
+        if self._closed:
+            raise RuntimeError(f"Reader pool for {self.db_path} is closed")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._call, fn, args)
+
+    def run_sync(self, fn: Callable[..., Any], *args) -> Any:
+        """Blocking variant for callers that are already off the event loop."""
+        if self._closed:
+            raise RuntimeError(f"Reader pool for {self.db_path} is closed")
+        return self._executor.submit(self._call, fn, args).result()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
@@ -0,0 +1,173 @@
+import itertools
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+@dataclass
+class WriterStats:
+    statements: int = 0
+    commits: int = 0
+    failed: int = 0
+
+class SQLiteWriter:
+    """
+    Dedicated writer thread that owns the only write connection to a SQLite file.
+
+    Statements are queued by callers and applied in group commits: a batch is
+    committed once it holds `max_batch` statements or `flush_interval` seconds
+    after its first statement arrived, whichever comes first. The database runs
+    in WAL mode so readers on other connections are never blocked by the writer.
+    `synchronous=NORMAL` in WAL mode can lose the last commits on power loss but
+    never corrupts the file; use FULL for per-commit durability.
+    """
+    def __init__(
+        self,
+        db_path: str,
+        flush_interval: float = 0.05,
+        max_batch: int = 128,
+        synchronous: str = "NORMAL"
+    ):
+        if synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Invalid synchronous mode: {synchronous}")
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.synchronous = synchronous.upper()
+        self.stats = WriterStats()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._submitted = 0
+        self._processed = 0
+        self._count_lock = threading.Lock()
+        self._closed = False
+        self._startup_error: Optional[BaseException] = None
+        self._error: Optional[BaseException] = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"sqlite-writer:{os.path.basename(db_path)}", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+        if self._startup_error is not None:
+            # Bad path, permissions, locked file: fail the store's constructor instead of hanging it
+            self._closed = True
+            raise self._startup_error
+
+    def submit(self, sql: str, params: Sequence[Any] = ()):
+        """Queue a write statement. Returns immediately."""
+        if self._closed:
+            raise RuntimeError(f"Writer for {self.db_path} is closed")
+        if not self._thread.is_alive():
+            raise RuntimeError(f"Writer thread for {self.db_path} has died: {self._error}")
+        with self._count_lock:
+            self._submitted += 1
+        self._queue.put((sql, params))
+
+    def pending(self) -> int:
+        """Statements submitted but not yet committed (or dropped)."""
+        with self._count_lock:
+            return self._submitted - self._processed
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything submitted before this call is committed."""
+        if self._closed:
+            return True
+        marker = threading.Event()
+        self._queue.put(marker)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Waits in slices so a writer thread that died is noticed instead of waited on forever
+        while True:
+            wait = 0.1 if deadline is None else min(0.1, max(0.0, deadline - time.monotonic()))
+            if marker.wait(wait):
+                return True
+            if not self._thread.is_alive():
+                logger.error(f"Writer thread for {self.db_path} is not running ({self._error}); flush abandoned")
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def close(self, timeout: Optional[float] = None):
+        """Commit whatever is queued and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        except Exception as e:
+            self._startup_error = self._error = e
+            return
+        finally:
+            self._ready.set()
+
+        try:
+            self._loop(conn)
+        except Exception as e:
+            self._error = e
+            logger.error(f"Writer thread for {self.db_path} stopped: {e}")
+        finally:
+            conn.close()
+
+    def _loop(self, conn: sqlite3.Connection):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            batch, markers = [], []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._commit(conn, batch)
+                with self._count_lock:
+                    self._processed += len(batch)
+            for marker in markers:
+                marker.set()
+
+    def _commit(self, conn: sqlite3.Connection, batch: list):
+        try:
+            with conn:
+                for sql, group in itertools.groupby(batch, key=lambda item: item[0]):
+                    conn.executemany(sql, [params for _, params in group])
+            self.stats.commits += 1
+            self.stats.statements += len(batch)
+        except sqlite3.Error as e:
+            # One bad row must not take the rest of the group down with it
+            logger.warning(f"Group commit of {len(batch)} statements failed ({e}), retrying individually")
+            for sql, params in batch:
+                try:
+                    with conn:
+                        conn.execute(sql, params)
+                    self.stats.commits += 1
+                    self.stats.statements += 1
+                except sqlite3.Error as row_error:
+                    self.stats.failed += 1
+                    logger.error(f"Dropped write to {self.db_path}: {row_error}")
@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def to_blob(vector) -> bytes:
+    """Serialize an embedding as a float32 blob for SQLite storage."""
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+def from_blob(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float32)
+
+class VectorIndex:
+    """
+    In-memory cosine index over fact embeddings, keyed by semantic_facts fact_id.
+
+    Vectors are L2-normalised and kept in one contiguous float32 matrix so a
+    query is a single matrix-vector product. The SQLite blobs are the source
+    of truth; the index is persisted next to the database as .npy files and
+    memory-mapped on load, together with the write generation it reflects.
+    """
+    def __init__(self, path_prefix: str):
+        self.path_prefix = path_prefix
+        self.dim: Optional[int] = None
+        self.generation = 0
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._size = 0
+        self._pos: Dict[int, int] = {}
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def _matrix_path(self) -> str:
+        return f"{self.path_prefix}.vectors.npy"
+
+    @property
+    def _ids_path(self) -> str:
+        return f"{self.path_prefix}.vector_ids.npy"
+
+    @property
+    def _meta_path(self) -> str:
+        return f"{self.path_prefix}.vectors.json"
+
+    def load(self, expected_generation: int) -> bool:
+        """Memory-map a persisted index. Returns False if missing or stale."""
+        try:
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+            if meta.get("generation") != expected_generation:
+                return False
+            matrix = np.load(self._matrix_path, mmap_mode="r")
+            ids = np.load(self._ids_path)
+        except (OSError, ValueError) as e:
+            if os.path.exists(self._meta_path):
+                logger.warning(f"Vector index at {self.path_prefix} unreadable, rebuilding: {e}")
+            return False
+
+        self._matrix = matrix
+        self._ids = ids
+        self._size = len(ids)
+        self.dim = int(meta["dim"]) if meta.get("dim") else None
+        self.generation = expected_generation
+        self._pos = {int(rowid): i for i, rowid in enumerate(ids)}
+        self._dirty = False
+        return True
+
+    def rebuild(self, rows: Iterable[Tuple[int, bytes]], generation: int):
+        """Rebuild from (rowid, blob) pairs read out of SQLite."""
+        ids, vectors = [], []
+        for rowid, blob in rows:
+            ids.append(rowid)
+            vectors.append(from_blob(blob))
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._size = 0
+        self._pos = {}
+        self.dim = None
+        if ids:
+            self.upsert(ids, np.vstack(vectors))
+        self.generation = generation
+        self._dirty = True
+
+    def upsert(self, ids: Sequence[int], vectors: np.ndarray):
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match index dimension {self.dim}")
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1.0)
+
+        positions = []
+        next_pos = self._size
+        for rowid in ids:
+            pos = self._pos.get(rowid)
+            if pos is None:
+                pos = next_pos
+                self._pos[rowid] = pos
+                next_pos += 1
+            positions.append(pos)
+        self._reserve(next_pos)
+        self._ids[positions] = ids
+        self._matrix[positions] = vectors
+        self._size = next_pos
+        self._dirty = True
+
+    def remove(self, ids: Iterable[int]):
+        """Drop vectors by rowid, moving the last row into each freed slot."""
+        for rowid in ids:
+            pos = self._pos.pop(rowid, None)
+            if pos is None:
+                continue
+            self._reserve(self._size)
+            last = self._size - 1
+            if pos != last:
+                moved = int(self._ids[last])
+                self._matrix[pos] = self._matrix[last]
+                self._ids[pos] = moved
+                self._pos[moved] = pos
+            self._size = last
+            self._dirty = True
+
+    def _reserve(self, capacity: int):
+        """Grow (or detach from the read-only mmap) with amortised doubling."""
+        writable = isinstance(self._matrix, np.ndarray) and not isinstance(self._matrix, np.memmap)
+        if writable and self._matrix.shape[0] >= capacity and self._matrix.shape[1] == self.dim:
+            return
+        new_capacity = max(capacity, 2 * self._matrix.shape[0], 64)
+        matrix = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        ids = np.zeros(new_capacity, dtype=np.int64)
+        if self._size:
+            matrix[:self._size] = self._matrix[:self._size]
+            ids[:self._size] = self._ids[:self._size]
+        self._matrix = matrix
+        self._ids = ids
+
+    def _normalise_query(self, query) -> Optional[np.ndarray]:
+        q = np.asarray(query, dtype=np.float32).ravel()
+        if self.dim is None or q.shape[0] != self.dim:
+            return None
+        norm = np.linalg.norm(q)
+        return q / norm if norm > 0 else None
+
+    def search(self, query, k: int) -> List[Tuple[int, float]]:
+        """Top-k (rowid, cosine similarity) pairs."""
+        q = self._normalise_query(query)
+        if q is None or self._size == 0 or k <= 0:
+            return []
+        scores = self._matrix[:self._size] @ q
+        k = min(k, self._size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self._ids[i]), float(scores[i])) for i in top]
+
+    def similarities(self, query, ids: Iterable[int]) -> Dict[int, float]:
+        """Cosine similarity of the query against specific rowids (those without a vector are omitted)."""
+        q = self._normalise_query(query)
+        if q is None:
+            return {}
+        known = [(rowid, self._pos[rowid]) for rowid in ids if rowid in self._pos]
+        if not known:
+            return {}
+        scores = self._matrix[[pos for _, pos in known]] @ q
+        return {rowid: float(score) for (rowid, _), score in zip(known, scores)}
+
+    def save(self, generation: Optional[int] = None):
+        """Persist atomically (write to temp files, then rename)."""
+        if generation is not None:
+            self.generation = generation
+        if not self._dirty:
+            return
+        matrix_tmp = f"{self.path_prefix}.vectors.tmp.npy"
+        ids_tmp = f"{self.path_prefix}.vector_ids.tmp.npy"
+        np.save(matrix_tmp, np.ascontiguousarray(self._matrix[:self._size]))
+        np.save(ids_tmp, self._ids[:self._size])
+        os.replace(matrix_tmp, self._matrix_path)
+        os.replace(ids_tmp, self._ids_path)
+        meta_tmp = f"{self._meta_path}.tmp"
+        with open(meta_tmp, "w") as f:
+            json.dump({"generation": self.generation, "dim": self.dim, "count": self._size}, f)
+        os.replace(meta_tmp, self._meta_path)
+        self._dirty = False
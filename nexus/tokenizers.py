@@ -0,0 +1,245 @@
+import base64
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Where tiktoken fetches each encoding from; its on-disk cache names files by sha1 of this URL
+ENCODING_URL = "https://openaipublic.blob.core.windows.net/encodings/{name}.tiktoken"
+# Encodings shipped with the application, if a deployment adds them: <bundle>/<encoding>.tiktoken
+BUNDLED_DIR = os.path.join(os.path.dirname(__file__), "assets", "tokenizers")
+DEFAULT_ENCODING = "cl100k_base"
+
+# Split pattern, special tokens and file hash of the encodings the model table maps to, as defined
+# in tiktoken_ext.openai_public. They let an explicit cache_dir be read without going through
+# tiktoken's own cache, whose location is process-wide (TIKTOKEN_CACHE_DIR).
+ENCODING_SPECS: Dict[str, dict] = {
+    "cl100k_base": {
+        "pat_str": r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+| ?[^\s\p{L}\p{N}]++[\r\n]*+|\s++$|\s*[\r\n]|\s+(?!\S)|\s""",
+        "special_tokens": {
+            "<|endoftext|>": 100257,
+            "<|fim_prefix|>": 100258,
+            "<|fim_middle|>": 100259,
+            "<|fim_suffix|>": 100260,
+            "<|endofprompt|>": 100276,
+        },
+        "sha256": "223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7",
+    },
+    "o200k_base": {
+        "pat_str": "|".join([
+            r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]*[\p{Ll}\p{Lm}\p{Lo}\p{M}]+(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+            r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]+[\p{Ll}\p{Lm}\p{Lo}\p{M}]*(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+            r"""\p{N}{1,3}""",
+            r""" ?[^\s\p{L}\p{N}]+[\r\n/]*""",
+            r"""\s*[\r\n]+""",
+            r"""\s+(?!\S)""",
+            r"""\s+""",
+        ]),
+        "special_tokens": {"<|endoftext|>": 199999, "<|endofprompt|>": 200018},
+        "sha256": "446a9538cb6c348e3516120d7c08b09f57c36495e2acfffe59a5bf8b0cfb1a2d",
+    },
+}
+
+# Model name (or prefix) -> encoding, consulted before tiktoken's own table.
+# Extend per deployment with register_model() or NEXUS_TOKENIZER_MODELS="model=encoding,...".
+DEFAULT_MODEL_ENCODINGS: Dict[str, str] = {
+    "gpt-4o": "o200k_base",
+    "o1": "o200k_base",
+    "o3": "o200k_base",
+    "gpt-4": "cl100k_base",
+    "gpt-3.5": "cl100k_base",
+}
+
+class CharEncoder:
+    """Fallback when no BPE encoding can be loaded: 4-character pieces, the old len/4 estimate."""
+    name = "char4"
+
+    def encode(self, text: str) -> List[str]:
+        return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+    def decode(self, tokens: Sequence[str]) -> str:
+        return "".join(tokens)
+
+def _parse_model_env(value: str) -> Dict[str, str]:
+    mapping = {}
+    for pair in value.split(","):
+        if "=" in pair:
+            model, encoding = pair.split("=", 1)
+            mapping[model.strip()] = encoding.strip()
+    return mapping
+
+class TokenizerRegistry:
+    """
+    Resolves each tiktoken encoding once per process and shares it.
+
+    Encodings are read from `cache_dir` (NEXUS_TOKENIZER_CACHE) when given,
+    else from tiktoken's own cache (TIKTOKEN_CACHE_DIR or its default). An
+    explicit cache_dir is used directly and never exported to the environment,
+    so other tiktoken users in the process are unaffected. Before the first
+    load the cache is seeded from `bundle_dir` (NEXUS_TOKENIZER_BUNDLE or the
+    packaged assets, when present); anything else is downloaded once. With
+    `offline` (NEXUS_TOKENIZER_OFFLINE=1) an encoding missing from both falls
+    back to CharEncoder instead of attempting the download. warmup() loads
+    encodings on a background thread during startup.
+    """
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        bundle_dir: Optional[str] = None,
+        model_encodings: Optional[Dict[str, str]] = None,
+        default_encoding: str = DEFAULT_ENCODING,
+        offline: Optional[bool] = None
+    ):
+        self.cache_dir = cache_dir or os.getenv("NEXUS_TOKENIZER_CACHE")
+        self.bundle_dir = bundle_dir or os.getenv("NEXUS_TOKENIZER_BUNDLE") or BUNDLED_DIR
+        self.model_encodings = dict(DEFAULT_MODEL_ENCODINGS)
+        self.model_encodings.update(_parse_model_env(os.getenv("NEXUS_TOKENIZER_MODELS", "")))
+        self.model_encodings.update(model_encodings or {})
+        self.default_encoding = default_encoding
+        self.offline = offline if offline is not None else os.getenv("NEXUS_TOKENIZER_OFFLINE", "") == "1"
+        self._encodings: Dict[str, object] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def register_model(self, model: str, encoding: str):
+        self.model_encodings[model] = encoding
+
+    def encoding_name_for(self, model: str) -> str:
+        if model in self.model_encodings:
+            return self.model_encodings[model]
+        # Longest configured prefix wins, so "gpt-4o-mini" maps via "gpt-4o" rather than "gpt-4"
+        for prefix in sorted(self.model_encodings, key=len, reverse=True):
+            if model.startswith(prefix):
+                return self.model_encodings[prefix]
+        try:
+            from tiktoken.model import encoding_name_for_model
+            return encoding_name_for_model(model)
+        except Exception:
+            return self.default_encoding
+
+    def for_model(self, model: str):
+        return self.get_encoding(self.encoding_name_for(model))
+
+    def get_encoding(self, name: str):
+        encoding = self._encodings.get(name)
+        if encoding is not None:
+            return encoding
+        with self._locks_lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            encoding = self._encodings.get(name)
+            if encoding is None:
+                encoding = self._encodings[name] = self._load(name)
+        return encoding
+
+    def _cache_path(self, name: str) -> str:
+        cache_dir = (
+            self.cache_dir
+            or os.getenv("TIKTOKEN_CACHE_DIR")
+            or os.getenv("DATA_GYM_CACHE_DIR")
+            or os.path.join(tempfile.gettempdir(), "data-gym-cache")
+        )
+        return os.path.join(cache_dir, hashlib.sha1(ENCODING_URL.format(name=name).encode()).hexdigest())
+
+    def _seed(self, name: str) -> bool:
+        """Copies a bundled encoding into tiktoken's cache. Returns whether the cache now has it."""
+        target = self._cache_path(name)
+        if os.path.exists(target):
+            return True
+        source = os.path.join(self.bundle_dir, f"{name}.tiktoken") if self.bundle_dir else ""
+        if not source or not os.path.exists(source):
+            return False
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = f"{target}.{os.getpid()}.tmp"
+            shutil.copyfile(source, tmp)
+            os.replace(tmp, target)
+            logger.info(f"Seeded tokenizer cache with bundled {name}")
+            return True
+        except OSError as e:
+            logger.error(f"Could not seed tokenizer cache from {source}: {e}")
+            return False
+
+    def _load(self, name: str):
+        cached = self._seed(name)
+        if self.offline and not cached:
+            logger.error(f"Encoding {name} is not bundled or cached and downloads are disabled; using character estimates")
+            return CharEncoder()
+        try:
+            if self.cache_dir:
+                if name in ENCODING_SPECS:
+                    return self._load_from_cache_dir(name, cached)
+                logger.warning(f"No spec for {name}; loading it through tiktoken's default cache instead of {self.cache_dir}")
+            import tiktoken
+            return tiktoken.get_encoding(name)
+        except Exception as e:
+            logger.error(f"Tokenizer {name} unavailable, falling back to character estimates: {e}")
+            return CharEncoder()
+
+    def _load_from_cache_dir(self, name: str, cached: bool):
+        """Builds the encoding from <cache_dir>/<sha1(url)>, downloading it there first if needed."""
+        import tiktoken
+        from tiktoken.load import read_file
+        spec = ENCODING_SPECS[name]
+        path = self._cache_path(name)
+        if not cached:
+            data = read_file(ENCODING_URL.format(name=name))
+            if hashlib.sha256(data).hexdigest() != spec["sha256"]:
+                raise ValueError(f"Hash mismatch for downloaded {name}")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            logger.info(f"Downloaded {name} into {self.cache_dir}")
+        ranks = {}
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    token, rank = line.split()
+                    ranks[base64.b64decode(token)] = int(rank)
+        return tiktoken.Encoding(name, pat_str=spec["pat_str"], mergeable_ranks=ranks, special_tokens=spec["special_tokens"])
+
+    def warmup(self, models: Iterable[str] = (), encodings: Iterable[str] = (), background: bool = True) -> Optional[threading.Thread]:
+        """Loads the encodings for `models` (default encoding if none given) ahead of the first turn."""
+        names = list(dict.fromkeys([self.encoding_name_for(m) for m in models] + list(encodings))) or [self.default_encoding]
+
+        def load_all():
+            for name in names:
+                self.get_encoding(name)
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="tokenizer-warmup", daemon=True)
+        thread.start()
+        return thread
+
+_registry: Optional[TokenizerRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_registry() -> TokenizerRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = TokenizerRegistry()
+    return _registry
+
+def configure(**kwargs) -> TokenizerRegistry:
+    """Replaces the process-wide registry; call at startup, before any encoder is requested."""
+    global _registry
+    with _registry_lock:
+        _registry = TokenizerRegistry(**kwargs)
+    return _registry
+
+def encoder_for(model: str):
+    return get_registry().for_model(model)
+
+def warmup(models: Iterable[str] = (), background: bool = True) -> Optional[threading.Thread]:
+    return get_registry().warmup(models=models, background=background)
@@ -0,0 +1,67 @@
+from nexus.synthcore.prompt_assembler import PromptAssembler, SectionSpec
+from nexus.synthcore.token_budget import TokenBudget
+
+def words(n: int, word: str = "alpha") -> str:
+    return " ".join([word] * n)
+
+def costs(assembler, specs):
+    plan = assembler.plan(specs, TokenBudget(available_input=10**6))
+    return {s.name: s.cost for s in plan.sections}
+
+def test_request_is_never_truncated():
+    assembler = PromptAssembler()
+    specs = [
+        SectionSpec("system", "You are Nexus.", priority=1, degradable=False),
+        SectionSpec("memory", words(400, "memory"), priority=2),
+        SectionSpec("request", words(300, "question"), priority=1, degradable=False),
+    ]
+    cost = costs(assembler, specs)
+    budget = TokenBudget(available_input=cost["system"] + cost["request"] + 40)
+    plan = assembler.plan(specs, budget)
+    sections = {s.name: s for s in plan.sections}
+
+    assert sections["request"].status == "full" and sections["request"].granted == cost["request"]
+    assert sections["memory"].status == "truncated"
+    assert not plan.over_budget
+    assert words(300, "question") in assembler.render(plan, budget)
+
+def test_reservations_come_before_higher_priority_sections():
+    assembler = PromptAssembler()
+    specs = [
+        SectionSpec("profile", words(200, "profile"), priority=1),
+        SectionSpec("memory", words(200, "memory"), priority=3, min_tokens_reserved=60),
+    ]
+    cost = costs(assembler, specs)
+    plan = assembler.plan(specs, TokenBudget(available_input=cost["profile"]))
+    sections = {s.name: s for s in plan.sections}
+
+    assert sections["memory"].reserved == 60 and sections["memory"].granted == 60
+    assert sections["memory"].status == "truncated"
+    assert sections["profile"].granted == cost["profile"] - 60
+    assert plan.used == cost["profile"]
+
+def test_leftover_goes_by_priority_then_template_order():
+    assembler = PromptAssembler()
+    specs = [
+        SectionSpec("memory", words(100, "memory"), priority=3),
+        SectionSpec("identity", words(100, "identity"), priority=2),
+        SectionSpec("notes", words(100, "notes"), priority=2),
+    ]
+    cost = costs(assembler, specs)
+    plan = assembler.plan(specs, TokenBudget(available_input=cost["identity"] + cost["notes"] // 2))
+    status = {s.name: s.status for s in plan.sections}
+
+    assert status == {"memory": "omitted", "identity": "full", "notes": "truncated"}
+    # Template order is kept in the rendered prompt regardless of priority
+    assert [s.name for s in plan.sections] == ["memory", "identity", "notes"]
+
+def test_caps_limit_grants_and_forced_sections_mark_over_budget():
+    assembler = PromptAssembler()
+    capped = TokenBudget(available_input=10**6, component_caps={"memory": 50})
+    plan = assembler.plan([SectionSpec("memory", words(300, "memory"), priority=2)], capped)
+    assert plan.sections[0].granted == 50 and plan.sections[0].status == "truncated"
+
+    specs = [SectionSpec("request", words(300, "question"), priority=1, degradable=False)]
+    plan = assembler.plan(specs, TokenBudget(available_input=100))
+    assert plan.sections[0].status == "forced"
+    assert plan.over_budget
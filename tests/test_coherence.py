@@ -0,0 +1,55 @@
+import asyncio
+from types import SimpleNamespace
+
+from benchmarks.fake_models import LatencyProfile, make_fake_provider
+from nexus.synthcore.coherence.state_tracker import MultiTurnCoherenceTracker
+from nexus.synthcore.orchestrator import SynthCore
+from nexus.synthcore.prompt_assembler import PromptAssembler
+from nexus.synthcore.synthmemory import SynthMemory
+from nexus.synthcore.turn_scheduler import TurnScheduler
+
+FAST = LatencyProfile(ttft_ms=1.0, output_tokens=8, jitter=0.0)
+
+def test_concurrent_users_keep_separate_histories(tmp_path):
+    async def scenario():
+        provider = make_fake_provider(FAST, FAST)
+        shards = SynthMemory.sharded(provider, str(tmp_path / "shards"), max_open=4)
+        core = SynthCore(provider, None, PromptAssembler(), shards=shards, scheduler=TurnScheduler(max_concurrent=4))
+        turns = {"alice": [], "bob": []}
+
+        async def user(user_id):
+            for i in range(3):
+                result = await core.orchestrate_turn(user_id, f"{user_id}-session", f"{user_id} question {i}")
+                turns[user_id].append(result["turn_id"])
+
+        await asyncio.gather(user("alice"), user("bob"))
+        await core.shutdown()
+        return core, turns
+
+    core, turns = asyncio.run(scenario())
+    for user_id, turn_ids in turns.items():
+        assert [s.turn_id for s in core.state_tracker.history(user_id)] == turn_ids
+    assert core.state_tracker.snapshot_count() == 6
+
+def test_drift_only_compares_a_users_own_turns():
+    class Memory:
+        episodic = semantic = SimpleNamespace(count=lambda: asyncio.sleep(0, 0))
+
+    class Models:
+        def get_model_for_task(self, task):
+            return SimpleNamespace(call=lambda prompt: asyncio.sleep(0, "claim"))
+
+    async def scenario():
+        tracker = MultiTurnCoherenceTracker(Models())
+        identity = SimpleNamespace(kernel=None)
+        calm, excited = SimpleNamespace(valence=0.0, arousal=0.0), SimpleNamespace(valence=0.9, arousal=0.9)
+        for i in range(5):
+            await asyncio.gather(
+                tracker.snapshot_after_turn("calm", f"c{i}", None, identity, calm, Memory(), "ok"),
+                tracker.snapshot_after_turn("excited", f"e{i}", None, identity, excited, Memory(), "ok"),
+            )
+        return await tracker.detect_drift("calm"), await tracker.detect_drift("excited")
+
+    calm_drift, excited_drift = asyncio.run(scenario())
+    assert not calm_drift.drift_detected and calm_drift.mood_drift == 0.0
+    assert not excited_drift.drift_detected and excited_drift.mood_drift == 0.0
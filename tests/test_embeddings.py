@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from nexus.embeddings import CallableEmbedder, Embedder, EmbeddingService
+
+def test_caller_timeout_does_not_cancel_coalesced_callers():
+    async def slow(texts):
+        await asyncio.sleep(0.1)
+        return [[1.0, 0.0]] * len(texts)
+
+    async def scenario():
+        service = EmbeddingService(CallableEmbedder(slow, dim=2))
+        impatient = asyncio.ensure_future(asyncio.wait_for(service.embed("same text"), 0.02))
+        patient = asyncio.ensure_future(service.embed("same text"))
+        outcomes = await asyncio.gather(impatient, patient, return_exceptions=True)
+        return outcomes, service
+
+    (impatient, patient), service = asyncio.run(scenario())
+    assert isinstance(impatient, asyncio.TimeoutError)
+    assert patient.tolist() == [1.0, 0.0]
+    assert service.report()["coalesced"] == 1
+    assert not service._inflight
+
+def test_embedder_requires_embed():
+    class Incomplete(Embedder):
+        dim = 2
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from nexus.synthcore.types import TokenUsage
+from nexus.synthmemory.episodic_store import EpisodicMemory, EpisodicStore
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+LONG = "The long answer repeats itself. " * 100
+
+def turn(turn_id: str, ts: datetime, text: str = "hello") -> EpisodicMemory:
+    return EpisodicMemory(
+        turn_id=turn_id,
+        timestamp=ts,
+        user_input=text,
+        assistant_response=f"reply to {text}",
+        identity_state={},
+        mood_state={},
+        token_usage=TokenUsage()
+    )
+
+def make_store(tmp_path, **kwargs) -> EpisodicStore:
+    return EpisodicStore(str(tmp_path / "episodic.db"), flush_interval=0.001, readers=1, **kwargs)
+
+def test_keyset_paging_walks_the_window_once(tmp_path):
+    store = make_store(tmp_path)
+
+    async def scenario():
+        # Turns 4-6 share a timestamp, so pages must break ties on rowid
+        for i in range(10):
+            await store.store(turn(f"t{i}", T0 + timedelta(minutes=min(i, 4) if i <= 6 else i)))
+
+        async def collect(**kwargs):
+            return [m.turn_id async for m in store.iter_range(hours=None, batch_size=3, **kwargs)]
+
+        newest = await collect()
+        oldest = await collect(newest_first=False)
+        window = await collect(since=T0 + timedelta(minutes=4), until=T0 + timedelta(minutes=8))
+        top = await store.retrieve_range(hours=None, limit=4)
+        return newest, oldest, window, [m.turn_id for m in top]
+
+    try:
+        newest, oldest, window, top = asyncio.run(scenario())
+    finally:
+        store.close()
+    assert newest == ["t9", "t8", "t7", "t6", "t5", "t4", "t3", "t2", "t1", "t0"]
+    assert oldest == list(reversed(newest))
+    assert window == ["t7", "t6", "t5", "t4"]
+    assert top == newest[:4]
+
+def test_retrieve_range_defaults_to_the_last_day(tmp_path):
+    store = make_store(tmp_path)
+    now = datetime.now(timezone.utc)
+
+    async def scenario():
+        await store.store(turn("old", now - timedelta(hours=30)))
+        await store.store(turn("recent", now - timedelta(hours=1)))
+        return [m.turn_id for m in await store.retrieve_range()]
+
+    try:
+        assert asyncio.run(scenario()) == ["recent"]
+    finally:
+        store.close()
+
+def make_v1_db(path: str):
+    """An episodic DB as written before schema v2: JSON blobs per row, ISO timestamps, no ts_us."""
+    db = sqlite3.connect(path)
+    db.execute("""
+        CREATE TABLE episodic_memory (
+            turn_id TEXT PRIMARY KEY, timestamp TEXT, user_input TEXT, response TEXT,
+            identity_json TEXT, mood_json TEXT, token_json TEXT,
+            salience REAL, valence REAL, tags TEXT, flags TEXT
+        )
+    """)
+    identity = json.dumps({"version": 3, "name": "Nexus"})
+    mood = json.dumps({"valence": 0.25, "arousal": -0.5, "dominance": 0.5, "timestamp": T0.isoformat()})
+    tokens = json.dumps({"prompt": 10, "completion": 5, "total": 15})
+    db.executemany("INSERT INTO episodic_memory VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [
+        ("a", T0.isoformat(), "first", "short", identity, mood, tokens, 0.7, 0.1, "x,y", ""),
+        ("b", (T0 + timedelta(minutes=1)).isoformat(), "second", LONG, identity, mood, tokens, 0.5, 0.0, "", "c1"),
+    ])
+    db.commit()
+    db.close()
+
+def test_v1_rows_migrate_to_v2(tmp_path):
+    path = str(tmp_path / "episodic.db")
+    make_v1_db(path)
+    store = make_store(tmp_path)
+    try:
+        db = sqlite3.connect(path)
+        assert db.execute("PRAGMA user_version").fetchone()[0] == EpisodicStore.SCHEMA_VERSION
+        assert db.execute("SELECT COUNT(*) FROM episodic_identity").fetchone()[0] == 1
+        assert db.execute("SELECT typeof(response) FROM episodic_memory WHERE turn_id = 'b'").fetchone()[0] == "blob"
+        db.close()
+
+        assert asyncio.run(store.count()) == 2
+        newest, oldest = asyncio.run(store.retrieve_range(hours=None))
+    finally:
+        store.close()
+    assert (newest.turn_id, newest.assistant_response, newest.contradiction_flags) == ("b", LONG, ["c1"])
+    assert (oldest.turn_id, oldest.assistant_response, oldest.concept_tags) == ("a", "short", ["x", "y"])
+    assert oldest.timestamp == T0
+    assert (oldest.mood_state.valence, oldest.mood_state.arousal, oldest.mood_state.timestamp) == (0.25, -0.5, T0)
+    assert (oldest.token_usage.prompt_tokens, oldest.token_usage.completion_tokens, oldest.token_usage.total_tokens) == (10, 5, 15)
+    assert newest.identity_state is oldest.identity_state
+
+def test_long_text_round_trips_through_zlib(tmp_path):
+    store = make_store(tmp_path)
+
+    async def scenario():
+        await store.store(turn("long", T0, LONG))
+        await store.store(turn("short", T0 + timedelta(seconds=1), "hi"))
+        return {m.turn_id: m for m in await store.retrieve_range(hours=None)}
+
+    try:
+        memories = asyncio.run(scenario())
+        stored = dict(store.readers.run_sync(
+            lambda conn: conn.execute("SELECT turn_id, typeof(user_input) FROM episodic_memory").fetchall()
+        ))
+    finally:
+        store.close()
+    assert stored == {"long": "blob", "short": "text"}
+    assert memories["long"].user_input == LONG
+    assert memories["short"].user_input == "hi"
+
+def test_compression_can_be_disabled(tmp_path):
+    store = make_store(tmp_path, compress_min_bytes=None)
+
+    async def scenario():
+        await store.store(turn("long", T0, LONG))
+        return await store.retrieve_range(hours=None)
+
+    try:
+        memories = asyncio.run(scenario())
+        kind = store.readers.run_sync(lambda conn: conn.execute("SELECT typeof(user_input) FROM episodic_memory").fetchone()[0])
+    finally:
+        store.close()
+    assert kind == "text"
+    assert memories[0].user_input == LONG
@@ -0,0 +1,72 @@
+import json
+import time
+
+import pytest
+
+from nexus import launch_timing
+from nexus.forkserver import ForkServer
+
+MAIN = """
+import os
+from nexus import launch_timing
+launch_timing.mark("main")
+with open(os.environ["TEST_OUT"], "w") as f:
+    f.write(os.environ["NEXUS_MODS_ENABLED"])
+"""
+
+@pytest.mark.skipif(not ForkServer.available(), reason="fork server needs os.fork")
+def test_launch_runs_main_in_a_forked_child(tmp_path):
+    main_path = tmp_path / "main.py"
+    main_path.write_text(MAIN)
+    report = str(tmp_path / "launch.jsonl")
+    out = tmp_path / "out.txt"
+
+    server = ForkServer(str(main_path), preload=("json", "nexus_missing_module"), warm_tokenizers=False)
+    try:
+        server.wait_ready()
+        assert server.failed == ["nexus_missing_module (ModuleNotFoundError)"]
+        pid = server.launch({
+            "NEXUS_MODS_ENABLED": "synthcore",
+            launch_timing.ENV_T0: str(time.time()),
+            launch_timing.ENV_REPORT: report,
+            launch_timing.ENV_LAUNCH_ID: "first",
+            "TEST_OUT": str(out),
+        })
+        marks = launch_timing.wait_for(report, "first", "main", timeout=10.0)
+    finally:
+        server.stop()
+
+    assert pid not in (0, server.pid)
+    assert set(marks) == {"forked", "main"}
+    assert marks["forked"] <= marks["main"]
+    assert out.read_text() == "synthcore"
+
+def test_mark_is_a_no_op_outside_timed_launches(tmp_path, monkeypatch):
+    report = tmp_path / "launch.jsonl"
+    monkeypatch.delenv(launch_timing.ENV_T0, raising=False)
+    monkeypatch.setenv(launch_timing.ENV_REPORT, str(report))
+    launch_timing.mark("main")
+    assert not report.exists()
+
+def test_marks_are_read_per_launch(tmp_path, monkeypatch):
+    report = tmp_path / "launch.jsonl"
+    monkeypatch.setenv(launch_timing.ENV_T0, str(time.time() - 1.0))
+    monkeypatch.setenv(launch_timing.ENV_REPORT, str(report))
+    monkeypatch.setenv(launch_timing.ENV_LAUNCH_ID, "a")
+    launch_timing.mark("main")
+    monkeypatch.setenv(launch_timing.ENV_LAUNCH_ID, "b")
+    launch_timing.mark("main")
+    launch_timing.mark("ready")
+    with open(report, "a") as f:
+        f.write("not json\n")
+        f.write(json.dumps({"launch": "a", "stage": "ready", "ms": 2500.0}) + "\n")
+
+    a = launch_timing.read_marks(str(report), "a")
+    assert set(a) == {"main", "ready"} and 1000 <= a["main"] < 2500
+    assert set(launch_timing.read_marks(str(report), "b")) == {"main", "ready"}
+    assert launch_timing.read_marks(str(tmp_path / "missing.jsonl"), "a") == {}
+    assert launch_timing.wait_for(str(report), "c", "main", timeout=0.05) == {}
+
+    assert launch_timing.format_marks({"ready": 900.0, "main": 120.4}) == "main 120ms, ready 900ms"
+    assert launch_timing.format_marks({"main": 120.4}, order=["forked", "main"]) == "main 120ms"
+    assert launch_timing.format_marks({}) == "no timings reported"
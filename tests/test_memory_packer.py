@@ -0,0 +1,71 @@
+from nexus.synthcore.memory_packer import MemoryPacker, PackItem
+
+class CharEncoder:
+    """One token per character; `join_penalty` extra tokens per blank line, like a BPE merge that per-item counts miss."""
+    def __init__(self, join_penalty: int = 0):
+        self.join_penalty = join_penalty
+
+    def encode(self, text: str):
+        ids = [ord(c) for c in text]
+        return ids + [-1] * (self.join_penalty * text.count("\n\n"))
+
+    def decode(self, ids) -> str:
+        return "".join(chr(i) for i in ids if i >= 0)
+
+SECTIONS = ["RELEVANT FACTS", "RECENT TURNS"]
+
+def test_admits_by_priority_and_renders_by_position():
+    packer = MemoryPacker(encoder=CharEncoder())
+    items = [
+        PackItem("RECENT TURNS", "turn two", priority=2, order=0, position=1),
+        PackItem("RELEVANT FACTS", "fact b", priority=1, order=1, position=1),
+        PackItem("RECENT TURNS", "turn one", priority=2, order=1, position=0),
+        PackItem("RELEVANT FACTS", "fact a", priority=1, order=0, position=0),
+    ]
+    result = packer.pack(items, budget=1000, section_order=SECTIONS)
+    assert result.text == "[RELEVANT FACTS]\nfact a\nfact b\n\n[RECENT TURNS]\nturn one\nturn two"
+    assert result.included == {"RELEVANT FACTS": 2, "RECENT TURNS": 2}
+    assert result.dropped_total == 0 and result.truncated == 0
+    assert result.tokens == len(result.text)
+
+def test_smaller_items_fill_in_and_the_first_miss_is_truncated():
+    packer = MemoryPacker(encoder=CharEncoder())
+    long_fact = "x" * 200
+    items = [
+        PackItem("RELEVANT FACTS", "short fact", priority=1, order=0),
+        PackItem("RELEVANT FACTS", long_fact, priority=1, order=1, position=1),
+        PackItem("RECENT TURNS", "a turn", priority=2, order=0),
+    ]
+    budget = 100
+    result = packer.pack(items, budget=budget, section_order=SECTIONS)
+
+    assert result.included == {"RELEVANT FACTS": 2, "RECENT TURNS": 1}
+    assert result.truncated == 1 and result.dropped_total == 0
+    cut = result.text.split("\n")[2]
+    assert cut.endswith(MemoryPacker.TRUNCATION_MARKER) and set(cut[:-len(MemoryPacker.TRUNCATION_MARKER)]) == {"x"}
+    assert result.tokens <= budget
+
+def test_too_little_room_drops_instead_of_truncating():
+    packer = MemoryPacker(encoder=CharEncoder())
+    items = [
+        PackItem("RELEVANT FACTS", "f" * 40, priority=1, order=0),
+        PackItem("RELEVANT FACTS", "g" * 40, priority=1, order=1),
+    ]
+    result = packer.pack(items, budget=70, section_order=SECTIONS)
+    assert result.included == {"RELEVANT FACTS": 1}
+    assert result.dropped == {"RELEVANT FACTS": 1}
+    assert result.truncated == 0
+
+def test_sheds_lowest_priority_when_the_joined_text_runs_over():
+    packer = MemoryPacker(encoder=CharEncoder(join_penalty=5))
+    items = [
+        PackItem("RELEVANT FACTS", "a", priority=1),
+        PackItem("RECENT TURNS", "b", priority=2),
+    ]
+    # Per-item costs: "\n[RELEVANT FACTS]\n" + "a\n" + "\n[RECENT TURNS]\n" + "b\n"
+    budget = 18 + 2 + 16 + 2
+    result = packer.pack(items, budget=budget, section_order=SECTIONS)
+    assert result.text == "[RELEVANT FACTS]\na"
+    assert result.included == {"RELEVANT FACTS": 1}
+    assert result.dropped == {"RECENT TURNS": 1}
+    assert result.tokens <= budget
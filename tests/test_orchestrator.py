@@ -0,0 +1,17 @@
+from nexus.core.orchestrator import SynthCoreOrchestrator
+from nexus.core.prompt_assembler import PromptAssembler
+from nexus.embeddings import EmbeddingService
+from nexus.memory.manager import MemoryService
+
+def test_memory_and_orchestrator_share_one_embedding_service():
+    assembler = PromptAssembler()
+    memory = MemoryService(assembler, None)
+    orchestrator = SynthCoreOrchestrator(memory, assembler, None)
+    assert memory.embeddings is orchestrator.embeddings
+
+def test_memory_embedding_service_is_reused():
+    assembler = PromptAssembler()
+    service = EmbeddingService()
+    memory = MemoryService(assembler, None, embeddings=service)
+    orchestrator = SynthCoreOrchestrator(memory, assembler, None)
+    assert orchestrator.embeddings is service
@@ -0,0 +1,62 @@
+import asyncio
+
+from nexus.pipeline import OrchestratorPipeline, build_pipeline
+
+def test_no_pipeline_without_synthcore():
+    assert build_pipeline([]) is None
+    assert build_pipeline(["synthidentity"]) is None
+
+def test_prompt_without_database(monkeypatch):
+    monkeypatch.delenv("NEXUS_DB_URL", raising=False)
+    pipeline = build_pipeline(["synthcore"])
+    assert isinstance(pipeline, OrchestratorPipeline)
+    assert not pipeline.has_memory
+
+    prompt = asyncio.run(pipeline.modulate_system_prompt("You are a helpful assistant.", "hello"))
+    assert "## SYSTEM\nYou are a helpful assistant." in prompt
+    assert "## IDENTITY SNAPSHOT" in prompt
+    assert "## MOOD STATE" in prompt
+    assert "## RELEVANT MEMORY" not in prompt
+    assert asyncio.run(pipeline.persist_turn("hi", "hello")) == {"stored": 0}
+
+def test_stored_turns_reach_the_next_prompt(tmp_path):
+    pipeline = build_pipeline(["synthcore"], db_url=f"sqlite:///{tmp_path / 'nexus.db'}")
+    assert pipeline.has_memory
+
+    async def scenario():
+        stored = await pipeline.persist_turn("I like green tea in the morning", "Noted, green tea it is.")
+        prompt = await pipeline.modulate_system_prompt("You are a helpful assistant.", "what tea do I like?")
+        return stored, prompt
+
+    stored, prompt = asyncio.run(scenario())
+    assert stored == {"stored": 2}
+    memory = prompt.split("## RELEVANT MEMORY", 1)[1]
+    assert "USER: I like green tea in the morning" in memory
+    assert "ASSISTANT: Noted, green tea it is." in memory
+
+def test_draft_prefetch_feeds_the_prompt(tmp_path):
+    pipeline = build_pipeline(["synthcore"], db_url=f"sqlite:///{tmp_path / 'nexus.db'}")
+    prefetcher = pipeline.orchestrator.prefetcher
+    prefetcher.debounce_ms = 0
+
+    async def scenario():
+        await pipeline.persist_turn("My cat is called Miso", "Miso is a lovely name.")
+        pipeline.draft_changed("what is my cat called?")
+        await asyncio.sleep(0.05)
+        return await pipeline.modulate_system_prompt("You are a helpful assistant.", "what is my cat called?")
+
+    prompt = asyncio.run(scenario())
+    assert prefetcher.stats.started == 1
+    assert prefetcher.stats.hits_exact == 1
+    assert "USER: My cat is called Miso" in prompt
+
+def test_draft_ignored_without_database(monkeypatch):
+    monkeypatch.delenv("NEXUS_DB_URL", raising=False)
+    pipeline = build_pipeline(["synthcore"])
+
+    async def scenario():
+        pipeline.draft_changed("what is my cat called?")
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert pipeline.orchestrator.prefetcher.stats.started == 0
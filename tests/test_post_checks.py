@@ -0,0 +1,89 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from nexus.synthcore.coherence.contradiction_detector import ContradictionReport
+from nexus.synthcore.coherence.post_checks import PostGenerationChecks
+from nexus.synthcore.coherence.state_tracker import DriftReport, InvariantViolationReport
+
+class Detector:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def detect_all_contradictions(self, response_text, history, semantic_store):
+        await asyncio.sleep(self.delay)
+        return ContradictionReport(severity="error")
+
+class Tracker:
+    def __init__(self, drift_delay: float = 0.0, drift_error: bool = False):
+        self.drift_delay = drift_delay
+        self.drift_error = drift_error
+
+    def history(self, user_id):
+        return []
+
+    async def check_invariants(self, response_text, identity):
+        await asyncio.sleep(0.05)
+        return InvariantViolationReport()
+
+    async def detect_drift(self, user_id):
+        await asyncio.sleep(self.drift_delay)
+        if self.drift_error:
+            raise RuntimeError("no history store")
+        return DriftReport(drift_detected=True, reason="real")
+
+def run_checks(checks: PostGenerationChecks):
+    async def scenario():
+        start = time.perf_counter()
+        report = await checks.run("u1", "text", SimpleNamespace(), None)
+        return report, time.perf_counter() - start
+    return asyncio.run(scenario())
+
+def test_checks_run_concurrently():
+    report, elapsed = run_checks(PostGenerationChecks(Detector(0.05), Tracker(drift_delay=0.05), deadline_s=1.0))
+    assert report.skipped == []
+    assert report.contradictions.severity == "error"
+    assert report.drift.drift_detected
+    assert elapsed < 0.12  # three 50ms checks, not 150ms
+
+def test_slow_check_is_skipped_at_its_deadline():
+    checks = PostGenerationChecks(Detector(1.0), Tracker(), deadline_s=1.0, deadlines={"contradictions": 0.05})
+    report, elapsed = run_checks(checks)
+    assert report.skipped == ["contradictions"]
+    assert report.results["contradictions"].reason == "deadline_exceeded"
+    assert report.contradictions.severity == "none"
+    assert elapsed < 0.5
+
+def test_failing_check_degrades_to_neutral_result():
+    report, _ = run_checks(PostGenerationChecks(Detector(0.0), Tracker(drift_error=True), deadline_s=1.0))
+    assert report.skipped == ["drift"]
+    assert report.results["drift"].status == "error"
+    assert not report.drift.drift_detected
+
+def test_turn_request_path_runs_post_checks(tmp_path):
+    from benchmarks.fake_models import LatencyProfile, make_fake_provider
+    from nexus.synthcore.prompt_assembler import PromptAssembler
+    from nexus.synthcore.synthcore import SynthCore
+    from nexus.synthcore.synthmemory import SynthMemory
+    from nexus.synthcore.types import TurnRequest
+
+    fast = LatencyProfile(ttft_ms=1.0, output_tokens=8, jitter=0.0)
+
+    async def scenario():
+        provider = make_fake_provider(fast, fast)
+        core = SynthCore(provider, None, PromptAssembler(), shards=SynthMemory.sharded(provider, str(tmp_path / "shards")))
+        calls = []
+        original = core.post_checks.run
+
+        async def recording_run(user_id, *args):
+            calls.append(user_id)
+            return await original(user_id, *args)
+
+        core.post_checks.run = recording_run
+        response = await core.orchestrate_turn(TurnRequest(user_input="hello", user_id="u1", session_id="s1"))
+        await core.shutdown()
+        return response, calls
+
+    response, calls = asyncio.run(scenario())
+    assert calls == ["u1"]
+    assert response.metadata["skipped_checks"] == []
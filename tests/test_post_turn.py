@@ -0,0 +1,71 @@
+import asyncio
+
+from nexus.synthcore.post_turn import PostTurnPipeline
+
+def test_jobs_for_one_user_run_in_order_across_lanes():
+    async def scenario():
+        pipeline = PostTurnPipeline(lanes=2, max_pending=64)
+        ran = []
+
+        def job(user_id, i):
+            async def run():
+                await asyncio.sleep(0.001 * (5 - i))
+                ran.append((user_id, i))
+            return run
+
+        for i in range(5):
+            for user_id in ("alice", "bob", "carol"):
+                await pipeline.submit(user_id, job(user_id, i))
+        await pipeline.wait_for_user("alice")
+        alice_done = [i for u, i in ran if u == "alice"]
+        await pipeline.shutdown()
+        return ran, alice_done, pipeline.report()
+
+    ran, alice_done, report = asyncio.run(scenario())
+    assert alice_done == list(range(5))
+    for user_id in ("alice", "bob", "carol"):
+        assert [i for u, i in ran if u == user_id] == list(range(5))
+    assert report["completed"] == 15 and report["pending"] == 0
+
+def test_full_lane_blocks_the_submitter():
+    async def scenario():
+        pipeline = PostTurnPipeline(lanes=1, max_pending=2)
+        release = asyncio.Event()
+
+        async def blocked():
+            await release.wait()
+
+        await pipeline.submit("u", blocked)
+        await asyncio.sleep(0)  # the worker takes it
+        await pipeline.submit("u", blocked)
+        await pipeline.submit("u", blocked)
+        fourth = asyncio.create_task(pipeline.submit("u", blocked))
+        await asyncio.sleep(0.01)
+        waiting = not fourth.done()
+        release.set()
+        await asyncio.wait_for(fourth, 1.0)
+        await pipeline.shutdown()
+        return waiting, pipeline.report()
+
+    waiting, report = asyncio.run(scenario())
+    assert waiting
+    assert report["backpressure_waits"] == 1
+    assert report["completed"] == 4
+
+def test_shutdown_timeout_releases_waiters():
+    async def scenario():
+        pipeline = PostTurnPipeline(lanes=1, max_pending=8)
+
+        async def stuck():
+            await asyncio.sleep(10)
+
+        for _ in range(3):
+            await pipeline.submit("u", stuck)
+        await asyncio.sleep(0)
+        await pipeline.shutdown(timeout=0.05)
+        await asyncio.wait_for(pipeline.wait_for_user("u"), 1.0)
+        return pipeline.report()
+
+    report = asyncio.run(scenario())
+    assert report["dropped"] == 2
+    assert report["pending"] == 0 and report["completed"] == 0
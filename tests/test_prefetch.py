@@ -0,0 +1,40 @@
+import asyncio
+
+from nexus.prefetch import SpeculativePrefetcher
+
+def test_cancelled_prefetch_is_a_miss_not_an_error():
+    async def scenario():
+        started = asyncio.Event()
+
+        async def fetch(scope, text):
+            started.set()
+            await asyncio.sleep(10)
+
+        prefetcher = SpeculativePrefetcher(fetch, debounce_ms=0, min_chars=1)
+        prefetcher.draft_changed("u", "what about coffee")
+        await started.wait()
+        next(iter(prefetcher._entries.values())).task.cancel()
+        return await prefetcher.take("u", "what about coffee", timeout=1.0)
+
+    assert asyncio.run(scenario()) == (None, "miss")
+
+def test_discarded_prefetch_runs_to_completion():
+    async def scenario():
+        finished = []
+
+        async def fetch(scope, text):
+            await asyncio.sleep(0.05)
+            finished.append(text)
+            return text
+
+        prefetcher = SpeculativePrefetcher(fetch, debounce_ms=0, min_chars=1)
+        prefetcher.draft_changed("u", "tell me about the garden")
+        await asyncio.sleep(0.01)
+        result = await prefetcher.take("u", "something completely different", timeout=0.1)
+        await asyncio.sleep(0.1)
+        return result, finished, prefetcher.report()
+
+    result, finished, report = asyncio.run(scenario())
+    assert result == (None, "miss")
+    assert finished == ["tell me about the garden"]
+    assert report["wasted"] == 1 and report["wasted_ms"] > 0
@@ -0,0 +1,40 @@
+from nexus.affect.mood import MoodPromptGenerator, MoodState
+from nexus.core.prompt_assembler import PromptAssembler
+from nexus.core.prompt_cache import PrefixCache, render_identity
+from nexus.core.token_budget import TokenBudget
+from nexus.identity.snapshot import MINIMAL_SKELETON_IDENTITY
+
+SYSTEM = "Act as the kernel defined in IDENTITY SNAPSHOT."
+
+def test_cached_prefix_matches_uncached_render_near_thresholds():
+    assembler = PromptAssembler()
+    cache = PrefixCache(assembler)
+    identity = MINIMAL_SKELETON_IDENTITY
+    for mood in (MoodState(0.0, 0.304, 0.5), MoodState(-0.3049, -0.3004, -0.004), MoodState(0.0, 0.0, 0.7049)):
+        sections = [("CURRENT REQUEST", "hello")]
+        cached = assembler.assemble(sections, TokenBudget(), prefix=cache.prefix_for(identity, mood, SYSTEM))
+        uncached = assembler.assemble([
+            ("SYSTEM", SYSTEM),
+            ("IDENTITY SNAPSHOT", render_identity(identity)),
+            ("MOOD STATE", MoodPromptGenerator.generate_injection_text(mood)),
+        ] + sections, TokenBudget())
+        assert cached == uncached
+
+def test_implication_thresholds_use_unrounded_mood():
+    concise = MoodPromptGenerator.generate_injection_text(MoodState(0.0, 0.304, 0.5))
+    assert "be concise and decisive" in concise
+    lead = MoodPromptGenerator.generate_injection_text(MoodState(0.0, 0.0, 0.7049))
+    assert "take lead on architecture" in lead
+    calm = MoodPromptGenerator.generate_injection_text(MoodState(0.0, 0.2996, 0.5))
+    assert "be concise" not in calm and "Arousal: +0.30" in calm
+
+def test_cache_entry_shared_only_by_identical_renders():
+    cache = PrefixCache(PromptAssembler())
+    identity = MINIMAL_SKELETON_IDENTITY
+    first = cache.prefix_for(identity, MoodState(0.0, 0.1001, 0.5), SYSTEM)
+    assert cache.prefix_for(identity, MoodState(0.0, 0.0999, 0.5), SYSTEM) is first
+    below = cache.prefix_for(identity, MoodState(0.0, 0.2996, 0.5), SYSTEM)
+    above = cache.prefix_for(identity, MoodState(0.0, 0.3004, 0.5), SYSTEM)
+    assert below is not above
+    assert "be concise" in above.text and "be concise" not in below.text
+    assert cache.report()["misses"] == 3
@@ -0,0 +1,132 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from nexus.synthmemory.semantic_store import DECAY_FLOOR, SemanticFact, SemanticStore
+
+def make_legacy_db(path: str):
+    """A semantic DB as written before fact_id: composite primary key, implicit rowid."""
+    db = sqlite3.connect(path)
+    db.execute("""
+        CREATE TABLE semantic_facts (
+            subject TEXT, predicate TEXT, object TEXT, confidence REAL, timestamp TEXT, decay_age REAL,
+            PRIMARY KEY (subject, predicate, object)
+        )
+    """)
+    now = datetime.now().isoformat()
+    db.executemany("INSERT INTO semantic_facts VALUES (?, ?, ?, ?, ?, ?)", [
+        ("alice", "likes", "tea", 0.9, now, 1.0),
+        ("bob", "likes", "coffee", 0.8, now, 1.0),
+        ("carol", "owns", "bicycle", 0.7, now, 1.0),
+    ])
+    db.execute("DELETE FROM semantic_facts WHERE subject = 'bob'")
+    db.commit()
+    rowids = dict(db.execute("SELECT subject, rowid FROM semantic_facts"))
+    db.close()
+    return rowids
+
+def test_legacy_table_migrates_keeping_ids(tmp_path):
+    path = str(tmp_path / "semantic.db")
+    rowids = make_legacy_db(path)
+    store = SemanticStore(path, readers=1)
+    try:
+        assert dict(store.db.execute("SELECT subject, fact_id FROM semantic_facts")) == rowids
+        assert asyncio.run(store.count()) == 2
+        facts = asyncio.run(store.retrieve_relevant_facts("bicycle"))
+        assert [f.subject for f in facts] == ["carol"]
+    finally:
+        store.close()
+
+def test_search_survives_vacuum(tmp_path):
+    path = str(tmp_path / "semantic.db")
+    store = SemanticStore(path, readers=1)
+    now = datetime.now()
+    facts = [SemanticFact(f"s{i}", "has", f"item{i}", 0.9, now, embedding=[float(i), 1.0]) for i in range(6)]
+    asyncio.run(store.store_facts(facts))
+    store.db.execute("DELETE FROM semantic_facts WHERE subject IN ('s0', 's2')")
+    store.db.commit()
+    store.db.execute("VACUUM")
+    try:
+        found = asyncio.run(store.retrieve_relevant_facts("item5"))
+        assert [(f.subject, f.object) for f in found] == [("s5", "item5")]
+        hybrid = asyncio.run(store.retrieve_relevant_facts("item4", query_embedding=[4.0, 1.0]))
+        assert hybrid[0].object == "item4"
+    finally:
+        store.close()
+
+def test_compaction_persists_the_floor_and_deletes_only_on_request(tmp_path):
+    store = SemanticStore(str(tmp_path / "semantic.db"), readers=1)
+    now = datetime.now()
+    asyncio.run(store.store_facts([
+        SemanticFact("fresh", "is", "new", 0.9, now),
+        SemanticFact("aging", "is", "recent", 0.9, now - timedelta(days=10)),
+        SemanticFact("stale", "is", "ancient", 0.9, now - timedelta(days=60)),
+        SemanticFact("floored", "is", "already compacted", 0.9, now - timedelta(days=60), decay_age=DECAY_FLOOR),
+    ]))
+
+    def rows():
+        return {
+            subject: (round(decay_age, 6), count)
+            for subject, decay_age, count in store.db.execute("SELECT subject, decay_age, reinforcement_count FROM semantic_facts")
+        }
+
+    try:
+        before = rows()
+        report = asyncio.run(store.compact_decayed(batch_size=2))
+        after = rows()
+        assert (report.floored, report.deleted) == (1, 0)
+        assert after["stale"] == (DECAY_FLOOR, 0)
+        assert {k: v for k, v in after.items() if k != "stale"} == {k: v for k, v in before.items() if k != "stale"}
+        assert asyncio.run(store.count()) == 4
+        facts = asyncio.run(store.retrieve_relevant_facts("ancient"))
+        assert [(f.subject, round(f.decay_age, 6)) for f in facts] == [("stale", DECAY_FLOOR)]
+
+        again = asyncio.run(store.compact_decayed())
+        assert (again.floored, again.deleted) == (0, 0)
+
+        pruned = asyncio.run(store.compact_decayed(delete_below=0.6))
+        assert (pruned.floored, pruned.deleted) == (0, 3)
+        assert set(rows()) == {"fresh"}
+        assert asyncio.run(store.count()) == 1
+    finally:
+        store.close()
+
+def test_bulk_upsert_batches_and_reinforces(tmp_path):
+    store = SemanticStore(str(tmp_path / "semantic.db"), readers=1)
+    now = datetime.now()
+    facts = [SemanticFact(f"s{i}", "has", f"item{i}", 0.5, now, embedding=[float(i), 1.0]) for i in range(25)]
+    try:
+        report = asyncio.run(store.store_facts(facts, batch_size=10))
+        assert report.rows == 25 and len(report.batch_ms) == 3
+        assert asyncio.run(store.count()) == 25
+        assert len(store.vectors) == 25
+
+        again = [
+            SemanticFact("s3", "has", "item3", 0.9, now),
+            SemanticFact("s4", "has", "item4", 0.1, now),
+            SemanticFact("s4", "has", "item4", 0.2, now),
+        ]
+        asyncio.run(store.store_facts(again))
+        rows = {s: (c, n, e is not None) for s, c, n, e in store.db.execute(
+            "SELECT subject, confidence, reinforcement_count, embedding FROM semantic_facts WHERE subject IN ('s3', 's4')"
+        )}
+        # Conflicts keep the higher confidence and the existing embedding, and count as reinforcement
+        assert rows == {"s3": (0.9, 1, True), "s4": (0.5, 2, True)}
+        assert asyncio.run(store.count()) == 25
+    finally:
+        store.close()
+
+def test_failed_batch_rolls_back_the_whole_upsert(tmp_path):
+    store = SemanticStore(str(tmp_path / "semantic.db"), readers=1)
+    now = datetime.now()
+    facts = [SemanticFact(f"s{i}", "has", f"item{i}", 0.5, now) for i in range(15)]
+    facts[12].timestamp = None
+    try:
+        with pytest.raises(AttributeError):
+            asyncio.run(store.store_facts(facts, batch_size=10))
+        assert store.db.execute("SELECT COUNT(*) FROM semantic_facts").fetchone()[0] == 0
+        assert asyncio.run(store.count()) == 0
+    finally:
+        store.close()
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+from nexus.synthmemory.sharding import ShardedMemory
+
+class FakeMemory:
+    def __init__(self, path, log, open_delay=0.0, close_delay=0.0):
+        time.sleep(open_delay)
+        self.path = path
+        self.log = log
+        self.close_delay = close_delay
+        log.append(("open", path))
+
+    async def close(self):
+        self.log.append(("closing", self.path))
+        await asyncio.sleep(self.close_delay)
+        self.log.append(("closed", self.path))
+
+def test_cold_open_does_not_block_other_users(tmp_path):
+    log = []
+    shards = ShardedMemory(str(tmp_path), lambda episodic_path, semantic_path: FakeMemory(
+        episodic_path, log, open_delay=0.3 if episodic_path == slow_path else 0.0
+    ))
+    slow_path = shards.layout.paths_for("slow")[0]
+
+    async def scenario():
+        slow = asyncio.ensure_future(shards.acquire("slow"))
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        await shards.acquire("fast")
+        fast_ms = (time.perf_counter() - start) * 1000
+        await slow
+        await shards.shutdown()
+        return fast_ms
+
+    assert asyncio.run(scenario()) < 200
+
+def test_concurrent_acquires_open_a_shard_once(tmp_path):
+    log = []
+    factory = lambda episodic_path, semantic_path: FakeMemory(episodic_path, log, open_delay=0.05)
+
+    async def scenario():
+        shards = ShardedMemory(str(tmp_path), factory)
+        memories = await asyncio.gather(*(shards.acquire("a") for _ in range(5)))
+        report = shards.report()
+        await shards.shutdown()
+        return memories, report
+
+    memories, report = asyncio.run(scenario())
+    assert len({id(m) for m in memories}) == 1
+    assert report["opened"] == 1
+
+def test_reopen_waits_for_eviction_close(tmp_path):
+    log = []
+    factory = lambda episodic_path, semantic_path: FakeMemory(episodic_path, log, close_delay=0.1)
+
+    async def scenario():
+        shards = ShardedMemory(str(tmp_path), factory, max_open=1)
+        await shards.acquire("a")
+        await shards.release("a")
+        opening_b = asyncio.ensure_future(shards.acquire("b"))
+        await asyncio.sleep(0.03)
+        # "a" was evicted when "b" opened and is still closing; reopening must wait for the close
+        await shards.acquire("a")
+        await opening_b
+        await shards.shutdown()
+
+    asyncio.run(scenario())
+    a_path = next(path for event, path in log if event == "open")
+    events = [event for event, path in log if path == a_path]
+    assert events[:4] == ["open", "closing", "closed", "open"]
@@ -0,0 +1,29 @@
+import sqlite3
+
+import pytest
+
+from nexus.synthmemory.sqlite_writer import SQLiteWriter
+
+def test_open_failure_raises_instead_of_hanging(tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        SQLiteWriter(str(tmp_path / "missing" / "memory.db"))
+
+def test_flush_returns_when_writer_thread_died(tmp_path, monkeypatch):
+    def crash(self, conn):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(SQLiteWriter, "_loop", crash)
+    writer = SQLiteWriter(str(tmp_path / "memory.db"))
+    writer._thread.join(1.0)
+    assert writer.flush(timeout=5.0) is False
+    with pytest.raises(RuntimeError):
+        writer.submit("SELECT 1")
+
+def test_flush_commits_queued_writes(tmp_path):
+    path = str(tmp_path / "memory.db")
+    writer = SQLiteWriter(path)
+    writer.submit("CREATE TABLE t (x INTEGER)")
+    writer.submit("INSERT INTO t VALUES (?)", (1,))
+    assert writer.flush(timeout=5.0)
+    writer.close()
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
@@ -0,0 +1,31 @@
+import base64
+import os
+
+from nexus.tokenizers import CharEncoder, TokenizerRegistry
+
+def write_byte_level_bundle(bundle_dir, name: str):
+    """A minimal valid .tiktoken file: every single byte is its own token."""
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    lines = [f"{base64.b64encode(bytes([i])).decode()} {i}" for i in range(256)]
+    (bundle_dir / f"{name}.tiktoken").write_text("\n".join(lines) + "\n")
+
+def test_offline_falls_back_when_encoding_missing(tmp_path):
+    registry = TokenizerRegistry(cache_dir=str(tmp_path / "cache"), bundle_dir=str(tmp_path / "bundle"), offline=True)
+    assert isinstance(registry.get_encoding("cl100k_base"), CharEncoder)
+
+def test_downloads_stay_enabled_unless_offline_is_requested(monkeypatch):
+    monkeypatch.delenv("NEXUS_TOKENIZER_OFFLINE", raising=False)
+    assert not TokenizerRegistry().offline
+    monkeypatch.setenv("NEXUS_TOKENIZER_OFFLINE", "1")
+    assert TokenizerRegistry().offline
+
+def test_explicit_cache_dir_is_used_without_touching_the_environment(tmp_path, monkeypatch):
+    monkeypatch.delenv("TIKTOKEN_CACHE_DIR", raising=False)
+    write_byte_level_bundle(tmp_path / "bundle", "cl100k_base")
+    cache = tmp_path / "cache"
+    registry = TokenizerRegistry(cache_dir=str(cache), bundle_dir=str(tmp_path / "bundle"), offline=True)
+    encoding = registry.get_encoding("cl100k_base")
+    assert not isinstance(encoding, CharEncoder)
+    assert len(encoding.encode("hello")) == 5
+    assert len(os.listdir(cache)) == 1
+    assert "TIKTOKEN_CACHE_DIR" not in os.environ
@@ -0,0 +1,112 @@
+import asyncio
+
+from nexus.synthcore.turn_scheduler import TurnScheduler
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_turns_for_one_user_run_in_order_without_overlap():
+    async def scenario():
+        scheduler = TurnScheduler(max_concurrent=4)
+        log, active = [], set()
+
+        async def turn(user, i):
+            assert user not in active
+            active.add(user)
+            await asyncio.sleep(0.01)
+            active.discard(user)
+            log.append((user, i))
+            return i
+
+        results = await asyncio.gather(*(
+            scheduler.run(user, lambda user=user, i=i: turn(user, i)) for i in range(5) for user in ("a", "b", "c")
+        ))
+        await scheduler.shutdown()
+        return results, log
+
+    results, log = run(scenario())
+    assert results == [i for i in range(5) for _ in range(3)]
+    for user in ("a", "b", "c"):
+        assert [i for u, i in log if u == user] == list(range(5))
+
+def test_global_cap_limits_turns_in_flight():
+    async def scenario():
+        scheduler = TurnScheduler(max_concurrent=2)
+        await asyncio.gather(*(scheduler.run(f"user-{i}", lambda: asyncio.sleep(0.02)) for i in range(8)))
+        report = scheduler.report()
+        await scheduler.shutdown()
+        return report
+
+    report = run(scenario())
+    assert report["max_running"] == 2
+    assert report["completed"] == 8
+
+def test_idle_actors_are_evicted():
+    async def scenario():
+        scheduler = TurnScheduler(idle_timeout_s=0.05)
+        await scheduler.run("a", lambda: asyncio.sleep(0))
+        await asyncio.sleep(0.15)
+        evicted = scheduler.report()
+        await scheduler.run("a", lambda: asyncio.sleep(0))
+        await scheduler.shutdown()
+        return evicted, scheduler.report()
+
+    evicted, after = run(scenario())
+    assert evicted["actors"] == 0 and evicted["actors_evicted"] == 1
+    assert after["actors_started"] == 2
+
+def test_caller_cancellation_withdraws_a_queued_turn():
+    async def scenario():
+        scheduler = TurnScheduler()
+        ran = []
+
+        async def turn(name):
+            await asyncio.sleep(0.05)
+            ran.append(name)
+
+        first = asyncio.ensure_future(scheduler.run("a", lambda: turn("first")))
+        second = asyncio.ensure_future(scheduler.run("a", lambda: turn("second")))
+        await asyncio.sleep(0.01)
+        second.cancel()
+        await first
+        third = await scheduler.run("a", lambda: turn("third"))
+        await scheduler.shutdown()
+        return ran, second.cancelled(), scheduler.report()
+
+    ran, cancelled, report = run(scenario())
+    assert ran == ["first", "third"]
+    assert cancelled and report["cancelled"] == 1
+
+def test_job_cancelled_inside_fails_only_that_turn():
+    async def scenario():
+        scheduler = TurnScheduler()
+        dead = asyncio.get_running_loop().create_future()
+        dead.cancel()
+
+        async def awaits_cancelled_future():
+            await dead
+
+        async def ok():
+            return "ok"
+
+        first = asyncio.ensure_future(scheduler.run("a", awaits_cancelled_future))
+        second = asyncio.ensure_future(scheduler.run("a", ok))
+        outcomes = await asyncio.wait_for(asyncio.gather(first, second, return_exceptions=True), 1.0)
+        await scheduler.shutdown()
+        return outcomes
+
+    first, second = run(scenario())
+    assert isinstance(first, RuntimeError)
+    assert second == "ok"
+
+def test_shutdown_resolves_queued_callers():
+    async def scenario():
+        scheduler = TurnScheduler()
+        blocker = asyncio.ensure_future(scheduler.run("a", lambda: asyncio.sleep(10)))
+        queued = asyncio.ensure_future(scheduler.run("a", lambda: asyncio.sleep(0)))
+        await asyncio.sleep(0.01)
+        await scheduler.shutdown(timeout=0.05)
+        return await asyncio.wait_for(asyncio.gather(blocker, queued, return_exceptions=True), 1.0)
+
+    outcomes = run(scenario())
+    assert all(isinstance(o, asyncio.CancelledError) for o in outcomes)
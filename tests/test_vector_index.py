@@ -0,0 +1,47 @@
+import numpy as np
+
+from nexus.synthmemory.vector_index import VectorIndex
+
+def basis(i: int, dim: int = 4) -> np.ndarray:
+    v = np.zeros(dim, dtype=np.float32)
+    v[i] = 1.0
+    return v
+
+def test_remove_moves_the_last_row_into_the_freed_slot(tmp_path):
+    index = VectorIndex(str(tmp_path / "facts"))
+    index.upsert([10, 11, 12, 13], np.vstack([basis(i) for i in range(4)]))
+
+    index.remove([11, 99])
+    assert len(index) == 3
+    assert index._pos == {10: 0, 13: 1, 12: 2}
+    assert index.search(basis(3), 1) == [(13, 1.0)]
+    assert 11 not in dict(index.search(basis(1), 3))
+
+    index.remove([12])
+    assert index._pos == {10: 0, 13: 1}
+    assert index.similarities(basis(3), [10, 12, 13]) == {10: 0.0, 13: 1.0}
+
+def test_saved_index_reloads_memory_mapped_and_stays_writable(tmp_path):
+    prefix = str(tmp_path / "facts")
+    index = VectorIndex(prefix)
+    index.upsert([1, 2, 3], np.vstack([basis(0), basis(1), basis(2)]))
+    index.save(generation=7)
+
+    assert not VectorIndex(prefix).load(expected_generation=8)
+    reloaded = VectorIndex(prefix)
+    assert reloaded.load(expected_generation=7)
+    assert isinstance(reloaded._matrix, np.memmap)
+    assert reloaded.dim == 4 and len(reloaded) == 3
+    assert reloaded.search(basis(1), 1) == [(2, 1.0)]
+
+    # Writes detach from the read-only mapping instead of failing
+    reloaded.remove([1])
+    reloaded.upsert([4], basis(3)[None, :])
+    assert not isinstance(reloaded._matrix, np.memmap)
+    assert reloaded._pos == {3: 0, 2: 1, 4: 2}
+    assert reloaded.search(basis(3), 1) == [(4, 1.0)]
+    reloaded.save(generation=8)
+
+    again = VectorIndex(prefix)
+    assert again.load(expected_generation=8)
+    assert sorted(again._pos) == [2, 3, 4]